@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+CACHE_KEY_PREFIX = 'autenticacao:usuario'
+
+
+def chave_usuario(user_id):
+    return f'{CACHE_KEY_PREFIX}:{user_id}'
+
+
+def invalidar_usuario(user_id):
+    cache.delete(chave_usuario(user_id))
+
+
+class JWTComCacheAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` que guarda o usuário no cache por ``AUTENTICACAO_CACHE_TTL``
+    segundos, evitando uma consulta à tabela de usuários a cada requisição.
+
+    Usuários inativos nunca entram no cache, e o cache é invalidado quando o
+    usuário é salvo ou excluído (``authentication.signals``). Com o cache local
+    de cada processo (LocMem), os demais workers só percebem a desativação ao fim do TTL.
+    """
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        chave = chave_usuario(user_id)
+        user = cache.get(chave)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(chave, user, settings.AUTENTICACAO_CACHE_TTL)
+            return user
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        return user
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired outstanding and blacklisted JWTs in small batches. Unlike '
+        'flushexpiredtokens, each batch is a short transaction and rows are walked by primary key.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=5000, help='Tokens deleted per transaction (default: 5000)')
+        parser.add_argument('--pausa', type=float, default=0.0, help='Seconds to sleep between batches (default: 0)')
+
+    def handle(self, *args, **options):
+        agora = timezone.now()
+        expirados = OutstandingToken.objects.filter(expires_at__lte=agora).order_by('id')
+
+        self.stdout.write(f'🧹 Removendo tokens expirados até {timezone.localtime(agora):%d/%m/%Y %H:%M}...')
+        ultimo_id = 0
+        total_tokens = total_bloqueados = 0
+        while True:
+            # Os tokens expiram na ordem em que são criados, então percorrer pela chave
+            # primária encontra os expirados no começo da tabela sem varrê-la inteira
+            ids = list(expirados.filter(id__gt=ultimo_id).values_list('id', flat=True)[:options['lote']])
+            if not ids:
+                break
+            ultimo_id = ids[-1]
+
+            with transaction.atomic():
+                bloqueados, _ = BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                tokens, _ = OutstandingToken.objects.filter(id__in=ids).delete()
+
+            total_tokens += tokens
+            total_bloqueados += bloqueados
+            self.stdout.write(f'   • {total_tokens:,} tokens removidos ({total_bloqueados:,} da blacklist)')
+            if options['pausa']:
+                time.sleep(options['pausa'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {total_tokens:,} tokens expirados removidos ({total_bloqueados:,} da blacklist)'
+        ))
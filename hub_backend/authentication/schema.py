@@ -0,0 +1,15 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    SimpleJWTScheme, TokenRefreshSerializerExtension, TokenVerifySerializerExtension
+)
+
+
+class JWTComCacheScheme(SimpleJWTScheme):
+    target_class = 'authentication.authentication.JWTComCacheAuthentication'
+
+
+class TokenRefreshComBlacklistSerializerExtension(TokenRefreshSerializerExtension):
+    target_class = 'authentication.serializers.TokenRefreshComBlacklistSerializer'
+
+
+class TokenVerifyComBlacklistSerializerExtension(TokenVerifySerializerExtension):
+    target_class = 'authentication.serializers.TokenVerifyComBlacklistSerializer'
@@ -0,0 +1,24 @@
+from drf_spectacular.utils import extend_schema_serializer
+from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer, TokenVerifySerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from .tokens import RefreshTokenComBlacklist, verificar_blacklist
+
+
+@extend_schema_serializer(component_name='TokenRefresh')
+class TokenRefreshComBlacklistSerializer(TokenRefreshSerializer):
+    token_class = RefreshTokenComBlacklist
+
+
+@extend_schema_serializer(component_name='TokenVerify')
+class TokenVerifyComBlacklistSerializer(TokenVerifySerializer):
+    def validate(self, attrs):
+        token = UntypedToken(attrs['token'])
+
+        if api_settings.BLACKLIST_AFTER_ROTATION:
+            if verificar_blacklist(token.get(api_settings.JTI_CLAIM), token['exp']):
+                raise serializers.ValidationError("Token is blacklisted")
+
+        return {}
@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidar_usuario
+
+
+def _invalidar_apos_commit(pk):
+    # Invalidado antes do commit, o cache poderia ser preenchido de novo por outra
+    # requisição com o usuário ainda sem a alteração
+    transaction.on_commit(lambda: invalidar_usuario(pk))
+
+
+@receiver(post_save, sender=User)
+def invalidar_usuario_salvo(sender, instance, update_fields=None, **kwargs):
+    """
+    Remove o usuário do cache de autenticação quando a alteração (desativação, senha,
+    permissões) é confirmada. O ``last_login`` gravado a cada login não invalida o cache.
+
+    Alterações por ``User.objects.filter(...).update(is_active=False)`` não disparam
+    o sinal: o usuário continua em cache por até ``AUTENTICACAO_CACHE_TTL`` segundos,
+    a menos que ``invalidar_usuario`` seja chamado em seguida.
+    """
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    _invalidar_apos_commit(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidar_usuario_excluido(sender, instance, **kwargs):
+    _invalidar_apos_commit(instance.pk)
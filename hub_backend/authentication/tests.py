@@ -1,3 +1,123 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from .authentication import JWTComCacheAuthentication
+from .tokens import RefreshTokenComBlacklist, jtis_bloqueados, verificar_blacklist
+
+
+class AutenticacaoTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        jtis_bloqueados.limpar()
+        self.usuario = User.objects.create_user('operador', password='senha-de-teste')
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post(
+            '/api/auth/login/', {'username': 'operador', 'password': 'senha-de-teste'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+
+class UsuarioEmCacheTests(AutenticacaoTestCase):
+    def autenticar(self, access):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        return JWTComCacheAuthentication().authenticate(request)[0]
+
+    def test_usuario_lido_do_cache(self):
+        access = self.login()['access']
+        with self.assertNumQueries(1):
+            self.assertEqual(self.autenticar(access), self.usuario)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.autenticar(access), self.usuario)
+
+    def test_usuario_desativado_recebe_401(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+        self.assertEqual(self.client.get('/api/clientes/').status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usuario.is_active = False
+            self.usuario.save()
+        self.assertEqual(self.client.get('/api/clientes/').status_code, 401)
+
+    def test_usuario_excluido_recebe_401(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+        self.assertEqual(self.client.get('/api/clientes/').status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usuario.delete()
+        self.assertEqual(self.client.get('/api/clientes/').status_code, 401)
+
+    def test_cache_invalidado_so_apos_o_commit(self):
+        access = self.login()['access']
+        self.autenticar(access)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.usuario.is_active = False
+            self.usuario.save()
+            with self.assertNumQueries(0):
+                self.assertEqual(self.autenticar(access), self.usuario)
+        self.assertEqual(len(callbacks), 1)
+
+        callbacks[0]()
+        with self.assertRaises(AuthenticationFailed):
+            self.autenticar(access)
+
+    def test_login_nao_invalida_o_cache(self):
+        access = self.login()['access']
+        self.autenticar(access)
+        self.login()
+        with self.assertNumQueries(0):
+            self.autenticar(access)
+
+
+class BlacklistTests(AutenticacaoTestCase):
+    def refresh(self, token):
+        return self.client.post('/api/auth/refresh/', {'refresh': token}, format='json')
+
+    def test_rotacao_rejeita_o_refresh_anterior(self):
+        anterior = self.login()['refresh']
+
+        response = self.refresh(anterior)
+        self.assertEqual(response.status_code, 200)
+        novo = response.data['refresh']
+        self.assertNotEqual(novo, anterior)
+
+        self.assertEqual(self.refresh(anterior).status_code, 401)
+        # Como no simplejwt, o verify responde 400 para tokens na blacklist
+        response = self.client.post('/api/auth/verify/', {'token': anterior}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.refresh(novo).status_code, 200)
+
+    def test_jti_bloqueado_fica_em_cache(self):
+        token = RefreshTokenComBlacklist.for_user(self.usuario)
+        jti, exp = token['jti'], token['exp']
+        self.assertFalse(verificar_blacklist(jti, exp))
+
+        token.blacklist()
+        jtis_bloqueados.limpar()
+        with self.assertNumQueries(1):
+            self.assertTrue(verificar_blacklist(jti, exp))
+        with self.assertNumQueries(0):
+            self.assertTrue(verificar_blacklist(jti, exp))
+
+    def test_purgar_tokens_expirados(self):
+        expirado = RefreshTokenComBlacklist.for_user(self.usuario)
+        expirado.blacklist()
+        valido = RefreshTokenComBlacklist.for_user(self.usuario)
+        OutstandingToken.objects.filter(jti=expirado['jti']).update(expires_at=timezone.now() - timedelta(days=1))
+
+        call_command('purgar_tokens', lote=1, stdout=StringIO())
 
-# Create your tests here.
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [valido['jti']])
+        self.assertFalse(BlacklistedToken.objects.exists())
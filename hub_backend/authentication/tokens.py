@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+
+class JtisBloqueados:
+    """
+    Cache em memória, por processo, dos ``jti`` que já se sabe estarem na blacklist.
+
+    Guarda apenas respostas positivas: um token bloqueado continua bloqueado até
+    expirar, então a entrada vale até o ``exp`` do token. Um ``jti`` ausente daqui
+    ainda precisa ser consultado no banco, pois pode ter sido bloqueado por outro processo.
+    """
+    def __init__(self, maximo=10000):
+        self.maximo = maximo
+        self._jtis = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __contains__(self, jti):
+        with self._trava:
+            exp = self._jtis.get(jti)
+            if exp is None:
+                return False
+            if exp <= time.time():
+                del self._jtis[jti]
+                return False
+            self._jtis.move_to_end(jti)
+            return True
+
+    def adicionar(self, jti, exp):
+        with self._trava:
+            self._jtis[jti] = exp
+            self._jtis.move_to_end(jti)
+            while len(self._jtis) > self.maximo:
+                self._jtis.popitem(last=False)
+
+    def limpar(self):
+        with self._trava:
+            self._jtis.clear()
+
+
+jtis_bloqueados = JtisBloqueados()
+
+
+def verificar_blacklist(jti, exp):
+    """
+    Diz se o ``jti`` está na blacklist, consultando antes o cache do processo.
+    """
+    if jti in jtis_bloqueados:
+        return True
+    if BlacklistedToken.objects.filter(token__jti=jti).exists():
+        jtis_bloqueados.adicionar(jti, exp)
+        return True
+    return False
+
+
+class RefreshTokenComBlacklist(RefreshToken):
+    """
+    ``RefreshToken`` com o cache de ``jtis_bloqueados`` na frente da consulta à
+    blacklist e com o bloqueio na rotação feito por um único INSERT: se dois
+    refreshes concorrentes usam o mesmo token, só o primeiro é aceito.
+    """
+    def check_blacklist(self):
+        if verificar_blacklist(self.payload[api_settings.JTI_CLAIM], self.payload['exp']):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        exp = self.payload['exp']
+
+        token, _criado = OutstandingToken.objects.get_or_create(
+            jti=jti,
+            defaults={'token': str(self), 'expires_at': datetime_from_epoch(exp)},
+        )
+        try:
+            with transaction.atomic():
+                bloqueado = BlacklistedToken.objects.create(token=token)
+        except IntegrityError:
+            jtis_bloqueados.adicionar(jti, exp)
+            raise TokenError(_("Token is blacklisted"))
+
+        transaction.on_commit(lambda: jtis_bloqueados.adicionar(jti, exp))
+        return bloqueado, True
@@ -2,7 +2,12 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
-from .models import Cliente, CaixaPostal, Correspondencia, Contrato
+from django.db import transaction
+from .anotacoes import anotar_dias_na_caixa
+from .busca import buscar_clientes
+from .contadores import caixas_afetadas, recalcular_contadores
+from .dashboard import invalidar_estatisticas
+from .models import Cliente, CaixaPostal, ContadorCaixaPostal, Correspondencia, Contrato
 
 
 @admin.register(Cliente)
@@ -29,6 +34,11 @@ class ClienteAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return buscar_clientes(queryset, search_term), False
+
     def documento_formatado(self, obj):
         return obj.documento_formatado
     documento_formatado.short_description = 'Documento'
@@ -40,7 +50,8 @@ class CaixaPostalAdmin(admin.ModelAdmin):
     list_filter = ['ativa', 'created_at']
     search_fields = ['numero', 'cliente__nome', 'cliente__documento']
     list_editable = ['ativa']
-    readonly_fields = ['id', 'created_at']
+    list_select_related = ['cliente', 'contador']
+    readonly_fields = ['id', 'created_at', 'updated_at']
     
     fieldsets = (
         ('Informações da Caixa', {
@@ -50,7 +61,7 @@ class CaixaPostalAdmin(admin.ModelAdmin):
             'fields': ('ativa',)
         }),
         ('Metadados', {
-            'fields': ('id', 'created_at'),
+            'fields': ('id', 'created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
@@ -64,8 +75,11 @@ class CaixaPostalAdmin(admin.ModelAdmin):
     cliente_documento.short_description = 'Documento'
 
     def total_correspondencias(self, obj):
-        total = obj.correspondencias.count()
-        pendentes = obj.correspondencias.filter(status='RECEBIDA').count()
+        try:
+            total, pendentes = obj.contador.total, obj.contador.pendentes
+        except ContadorCaixaPostal.DoesNotExist:
+            total = obj.correspondencias.count()
+            pendentes = obj.correspondencias.filter(status='RECEBIDA').count()
         
         if total > 0:
             url = reverse('admin:core_correspondencia_changelist') + f'?caixa_postal__id__exact={obj.id}'
@@ -111,6 +125,11 @@ class CorrespondenciaAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return anotar_dias_na_caixa(
+            super().get_queryset(request).select_related('caixa_postal__cliente')
+        )
+
     def descricao_curta(self, obj):
         return obj.descricao[:50] + '...' if len(obj.descricao) > 50 else obj.descricao
     descricao_curta.short_description = 'Descrição'
@@ -138,23 +157,32 @@ class CorrespondenciaAdmin(admin.ModelAdmin):
     status_colorido.short_description = 'Status'
 
     def dias_na_caixa_display(self, obj):
-        dias = obj.dias_na_caixa
+        dias = obj.idade_dias if hasattr(obj, 'idade_dias') else obj.dias_na_caixa
         if obj.status == 'RECEBIDA' and dias > 30:
             return format_html('<span style="color: red; font-weight: bold;">{} dias</span>', dias)
         elif obj.status == 'RECEBIDA' and dias > 15:
             return format_html('<span style="color: orange; font-weight: bold;">{} dias</span>', dias)
         return f"{dias} dias"
     dias_na_caixa_display.short_description = 'Dias na Caixa'
+    dias_na_caixa_display.admin_order_field = 'idade_dias'
 
     actions = ['marcar_como_retirada', 'marcar_como_recebida']
 
     def marcar_como_retirada(self, request, queryset):
-        updated = queryset.update(status='RETIRADA', data_retirada=timezone.now())
+        with transaction.atomic():
+            caixas = caixas_afetadas(queryset)
+            updated = queryset.update(status='RETIRADA', data_retirada=timezone.now(), updated_at=timezone.now())
+            recalcular_contadores(caixas)
+        invalidar_estatisticas()
         self.message_user(request, f'{updated} correspondências marcadas como retiradas.')
     marcar_como_retirada.short_description = "Marcar como retirada"
 
     def marcar_como_recebida(self, request, queryset):
-        updated = queryset.update(status='RECEBIDA', data_retirada=None)
+        with transaction.atomic():
+            caixas = caixas_afetadas(queryset)
+            updated = queryset.update(status='RECEBIDA', data_retirada=None, updated_at=timezone.now())
+            recalcular_contadores(caixas)
+        invalidar_estatisticas()
         self.message_user(request, f'{updated} correspondências marcadas como recebidas.')
     marcar_como_recebida.short_description = "Marcar como recebida"
 
@@ -0,0 +1,70 @@
+from django.db.models import BooleanField, Case, DateField, ExpressionWrapper, F, Func, IntegerField, Q, When
+from django.db.models.functions import Now
+from django.utils import timezone
+
+
+class DiasEntre(Func):
+    """
+    Dias completos entre ``inicio`` e ``fim``, com o mesmo arredondamento de ``timedelta.days``.
+    """
+    arity = 2
+    output_field = IntegerField()
+    template = 'CAST(FLOOR(EXTRACT(EPOCH FROM (%(expressions)s)) / 86400) AS INTEGER)'
+    arg_joiner = ' - '
+
+    def __init__(self, fim, inicio, **extra):
+        super().__init__(fim, inicio, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='CAST(FLOOR(julianday(%(expressions)s)) AS INTEGER)',
+            arg_joiner=') - julianday(',
+            **extra_context
+        )
+
+
+class SomarMeses(Func):
+    """
+    ``data + meses``, ajustando para o último dia do mês quando necessário (como ``relativedelta``).
+    """
+    arity = 2
+    output_field = DateField()
+    template = "CAST(%(expressions)s * INTERVAL '1 month' AS DATE)"
+    arg_joiner = ' + '
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        (data_sql, meses_sql), params = zip(*(
+            compiler.compile(expressao) for expressao in self.get_source_expressions()
+        ))
+        data_params, meses_params = params
+        # Soma os meses ao primeiro dia do mês e limita o dia ao último dia do mês resultante
+        sql = (
+            f"MIN("
+            f"date({data_sql}, 'start of month', '+' || {meses_sql} || ' months', "
+            f"'+' || (CAST(strftime('%%d', {data_sql}) AS INTEGER) - 1) || ' days'), "
+            f"date({data_sql}, 'start of month', '+' || ({meses_sql} + 1) || ' months', '-1 day'))"
+        )
+        return sql, (
+            *data_params, *meses_params, *data_params, *data_params, *meses_params
+        )
+
+
+def anotar_dias_na_caixa(queryset):
+    """
+    Anota ``idade_dias``: dias desde o recebimento até a retirada (ou até agora, se não retirada).
+    """
+    fim = Case(When(status='RETIRADA', then=F('data_retirada')), default=Now())
+    return queryset.annotate(idade_dias=DiasEntre(fim, F('data_recebimento')))
+
+
+def anotar_vencimento(queryset, hoje=None):
+    """
+    Anota ``vencimento`` (início + duração em meses) e ``vencido`` (vencimento anterior a ``hoje``).
+    """
+    hoje = hoje or timezone.now().date()
+    return queryset.annotate(
+        vencimento=SomarMeses(F('data_inicio'), F('duracao_meses'))
+    ).annotate(
+        vencido=ExpressionWrapper(Q(vencimento__lt=hoje), output_field=BooleanField())
+    )
@@ -0,0 +1,51 @@
+import re
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from .documentos import somente_digitos
+
+TAMANHO_MINIMO_DOCUMENTO = 3
+
+
+def parece_documento(termo):
+    return bool(re.fullmatch(r'[\d.\-/\s]+', termo)) and sum(c.isdigit() for c in termo) >= TAMANHO_MINIMO_DOCUMENTO
+
+
+def buscar_clientes(queryset, termo):
+    """
+    Filtra clientes por nome, e-mail ou CPF/CNPJ e ordena pela relevância.
+
+    Termos compostos só de dígitos e pontuação são comparados com ``documento_digitos``,
+    então ``123.456`` e ``123456`` encontram o mesmo cliente. No PostgreSQL a relevância
+    é a similaridade trigram (``pg_trgm``) e os filtros usam os índices GIN declarados
+    em ``Cliente.Meta``; nos demais bancos é uma aproximação por prefixo. A ordenação termina
+    em ``id`` para que a paginação seja estável.
+    """
+    termo = termo.strip()
+    if not termo:
+        return queryset
+
+    if connection.vendor == 'postgresql':
+        relevancia = Greatest(TrigramSimilarity('nome', termo), TrigramSimilarity('email', termo))
+    else:
+        relevancia = Case(
+            When(nome__istartswith=termo, then=Value(1.0)),
+            default=Value(0.5),
+            output_field=FloatField()
+        )
+
+    filtro = Q(nome__icontains=termo) | Q(email__icontains=termo)
+    if parece_documento(termo):
+        digitos = somente_digitos(termo)
+        filtro |= Q(documento_digitos__contains=digitos)
+        relevancia = Case(
+            When(documento_digitos=digitos, then=Value(2.0)),
+            When(documento_digitos__startswith=digitos, then=Value(1.5)),
+            default=relevancia,
+            output_field=FloatField()
+        )
+
+    return queryset.filter(filtro).annotate(relevancia=relevancia).order_by('-relevancia', 'nome', 'id')
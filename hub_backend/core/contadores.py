@@ -0,0 +1,183 @@
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import CaixaPostal, ContadorCaixaPostal, Correspondencia
+
+CAMPOS_CONTADOR = ['total', 'pendentes', 'devolvidas', 'ultimo_recebimento']
+
+
+def _agregar(caixa_ids=None):
+    caixas = CaixaPostal.objects.all()
+    if caixa_ids is not None:
+        caixas = caixas.filter(id__in=caixa_ids)
+
+    return caixas.annotate(
+        total=Count('correspondencias'),
+        pendentes=Count('correspondencias', filter=Q(correspondencias__status='RECEBIDA')),
+        devolvidas=Count('correspondencias', filter=Q(correspondencias__status='DEVOLVIDA')),
+        ultimo_recebimento=Max('correspondencias__data_recebimento'),
+    ).values('id', *CAMPOS_CONTADOR)
+
+
+def registrar_recebimento(correspondencia):
+    """
+    Incrementa os contadores da caixa para uma correspondência recém-criada.
+    """
+    data = correspondencia.data_recebimento
+    atualizados = ContadorCaixaPostal.objects.filter(
+        caixa_postal_id=correspondencia.caixa_postal_id
+    ).update(
+        total=F('total') + 1,
+        pendentes=F('pendentes') + (1 if correspondencia.status == 'RECEBIDA' else 0),
+        devolvidas=F('devolvidas') + (1 if correspondencia.status == 'DEVOLVIDA' else 0),
+        ultimo_recebimento=Case(
+            When(ultimo_recebimento__gte=data, then=F('ultimo_recebimento')),
+            default=Value(data),
+        ),
+        updated_at=timezone.now(),
+    )
+    if not atualizados:
+        recalcular_contadores([correspondencia.caixa_postal_id])
+
+
+def _ultimo_recebimento():
+    # Servido pelo índice (caixa_postal, -data_recebimento, id): lê uma única linha
+    return Subquery(Correspondencia.objects.filter(
+        caixa_postal_id=OuterRef('caixa_postal_id')
+    ).order_by('-data_recebimento').values('data_recebimento')[:1])
+
+
+def registrar_remocao(correspondencia):
+    """
+    Decrementa os contadores da caixa para uma correspondência removida.
+    """
+    ContadorCaixaPostal.objects.filter(
+        caixa_postal_id=correspondencia.caixa_postal_id,
+        total__gt=0,
+    ).update(
+        total=F('total') - 1,
+        pendentes=F('pendentes') - (1 if correspondencia.status == 'RECEBIDA' else 0),
+        devolvidas=F('devolvidas') - (1 if correspondencia.status == 'DEVOLVIDA' else 0),
+        ultimo_recebimento=_ultimo_recebimento(),
+        updated_at=timezone.now(),
+    )
+
+
+def registrar_alteracao(correspondencia, anterior):
+    """
+    Ajusta os contadores da caixa para uma correspondência alterada, a partir dos
+    valores ``anterior`` de ``caixa_postal_id``, ``status`` e ``data_recebimento``.
+
+    Trocas de status e de data viram um único UPDATE com deltas; só a troca de
+    caixa recalcula os contadores das duas caixas envolvidas.
+    """
+    if anterior['caixa_postal_id'] != correspondencia.caixa_postal_id:
+        recalcular_contadores([anterior['caixa_postal_id'], correspondencia.caixa_postal_id])
+        return
+
+    campos = {}
+    if anterior['status'] != correspondencia.status:
+        for campo, status in (('pendentes', 'RECEBIDA'), ('devolvidas', 'DEVOLVIDA')):
+            delta = (correspondencia.status == status) - (anterior['status'] == status)
+            if delta:
+                campos[campo] = F(campo) + delta
+    if anterior['data_recebimento'] != correspondencia.data_recebimento:
+        campos['ultimo_recebimento'] = _ultimo_recebimento()
+
+    if campos:
+        ContadorCaixaPostal.objects.filter(
+            caixa_postal_id=correspondencia.caixa_postal_id
+        ).update(**campos, updated_at=timezone.now())
+
+
+def aplicar_deltas(deltas, lote=500):
+    """
+    Aplica, com um UPDATE por lote de caixas, os deltas calculados pelas
+    operações em lote: ``{caixa_id: {'total': n, 'pendentes': n, 'devolvidas': n,
+    'ultimo_recebimento': data}}``, com todas as chaves opcionais.
+
+    Caixas ainda sem contador são recalculadas.
+    """
+    caixa_ids = list(deltas)
+    for inicio in range(0, len(caixa_ids), lote):
+        ids = caixa_ids[inicio:inicio + lote]
+        campos = {}
+        for campo in ('total', 'pendentes', 'devolvidas'):
+            casos = [
+                When(caixa_postal_id=caixa_id, then=Value(deltas[caixa_id][campo]))
+                for caixa_id in ids if deltas[caixa_id].get(campo)
+            ]
+            if casos:
+                campos[campo] = F(campo) + Case(*casos, default=Value(0))
+        casos = [
+            When(
+                Q(ultimo_recebimento__isnull=True) | Q(ultimo_recebimento__lt=data),
+                caixa_postal_id=caixa_id, then=Value(data),
+            )
+            for caixa_id in ids if (data := deltas[caixa_id].get('ultimo_recebimento'))
+        ]
+        if casos:
+            campos['ultimo_recebimento'] = Case(*casos, default=F('ultimo_recebimento'))
+        if not campos:
+            continue
+
+        atualizados = ContadorCaixaPostal.objects.filter(
+            caixa_postal_id__in=ids
+        ).update(**campos, updated_at=timezone.now())
+        if atualizados < len(ids):
+            recalcular_contadores(ids)
+
+
+def recalcular_contadores(caixa_ids=None):
+    """
+    Recalcula os contadores a partir das correspondências e grava o resultado.
+
+    Sem ``caixa_ids`` todas as caixas são recalculadas. Retorna a lista de
+    caixas cujos contadores gravados divergiam do valor real.
+    """
+    with transaction.atomic():
+        existentes = ContadorCaixaPostal.objects.select_for_update()
+        if caixa_ids is not None:
+            existentes = existentes.filter(caixa_postal_id__in=caixa_ids)
+        atuais = {
+            contador['caixa_postal_id']: contador
+            for contador in existentes.values('caixa_postal_id', *CAMPOS_CONTADOR)
+        }
+
+        contadores = []
+        divergencias = []
+        for agregado in _agregar(caixa_ids).iterator():
+            caixa_id = agregado.pop('id')
+            atual = atuais.get(caixa_id)
+            if atual is None or any(atual[campo] != agregado[campo] for campo in CAMPOS_CONTADOR):
+                divergencias.append({'caixa_postal_id': caixa_id, 'gravado': atual, 'real': agregado})
+            contadores.append(ContadorCaixaPostal(caixa_postal_id=caixa_id, **agregado))
+
+        ContadorCaixaPostal.objects.bulk_create(
+            contadores,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['caixa_postal'],
+            update_fields=CAMPOS_CONTADOR + ['updated_at'],
+        )
+
+    return divergencias
+
+
+def caixas_afetadas(queryset):
+    """
+    Retorna os ids das caixas referenciadas por um queryset de correspondências.
+    """
+    return list(queryset.order_by().values_list('caixa_postal_id', flat=True).distinct())
+
+
+def anotar_contadores(queryset):
+    """
+    Anota um queryset de caixas postais com os contadores materializados.
+    """
+    return queryset.annotate(
+        total_correspondencias=Coalesce(F('contador__total'), 0),
+        correspondencias_pendentes=Coalesce(F('contador__pendentes'), 0),
+    )
@@ -0,0 +1,149 @@
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .filters import inicio_do_dia, intervalo_do_dia
+from .models import Cliente, CaixaPostal, Correspondencia, Contrato
+
+CACHE_KEY_PREFIX = 'core:dashboard'
+
+
+def _cache_key(dia):
+    return f'{CACHE_KEY_PREFIX}:{dia.isoformat()}'
+
+
+def _agregar_correspondencias():
+    hoje = timezone.localdate()
+    inicio_hoje, fim_hoje = intervalo_do_dia(hoje)
+    inicio_semana = inicio_do_dia(hoje - timedelta(days=7))
+
+    agregados_tipo = {
+        f'tipo_{tipo}': Count('id', filter=Q(tipo=tipo))
+        for tipo, _ in Correspondencia.TIPO_CHOICES
+    }
+    agregados_status = {
+        f'status_{status}': Count('id', filter=Q(status=status))
+        for status, _ in Correspondencia.STATUS_CHOICES
+    }
+    return Correspondencia.objects.aggregate(
+        pendentes=Count('id', filter=Q(status='RECEBIDA')),
+        hoje=Count('id', filter=Q(data_recebimento__gte=inicio_hoje, data_recebimento__lt=fim_hoje)),
+        ultimos_7_dias=Count('id', filter=Q(data_recebimento__gte=inicio_semana)),
+        **agregados_tipo,
+        **agregados_status,
+    )
+
+
+def _agregar_clientes():
+    return Cliente.objects.aggregate(
+        total=Count('id'),
+        ativos=Count('id', filter=Q(ativo=True)),
+    )
+
+
+def _agregar_caixas():
+    return CaixaPostal.objects.aggregate(ativas=Count('id', filter=Q(ativa=True)))
+
+
+def _agregar_contratos():
+    return Contrato.objects.aggregate(ativos=Count('id', filter=Q(status='ATIVO')))
+
+
+AGREGACOES = (_agregar_correspondencias, _agregar_clientes, _agregar_caixas, _agregar_contratos)
+
+
+def _montar_estatisticas(correspondencias, clientes, caixas, contratos):
+    return {
+        'total_clientes': clientes['total'],
+        'clientes_ativos': clientes['ativos'],
+        'total_caixas_ativas': caixas['ativas'],
+        'correspondencias_pendentes': correspondencias['pendentes'],
+        'correspondencias_hoje': correspondencias['hoje'],
+        'correspondencias_ultimos_7_dias': correspondencias['ultimos_7_dias'],
+        'contratos_ativos': contratos['ativos'],
+        'correspondencias_por_tipo': {
+            tipo: correspondencias[f'tipo_{tipo}']
+            for tipo, _ in Correspondencia.TIPO_CHOICES
+            if correspondencias[f'tipo_{tipo}']
+        },
+        'correspondencias_por_status': {
+            status: correspondencias[f'status_{status}']
+            for status, _ in Correspondencia.STATUS_CHOICES
+            if correspondencias[f'status_{status}']
+        },
+    }
+
+
+def calcular_estatisticas():
+    """
+    Calcula as estatísticas do dashboard com uma agregação condicional por tabela.
+    """
+    return _montar_estatisticas(*(agregar() for agregar in AGREGACOES))
+
+
+def _em_conexao_propria(agregar):
+    # Roda em uma thread do executor, com a conexão dessa thread; como em uma
+    # requisição, conexões vencidas ou quebradas são descartadas antes e depois.
+    close_old_connections()
+    try:
+        return agregar()
+    finally:
+        close_old_connections()
+
+
+async def acalcular_estatisticas():
+    """
+    Versão assíncrona de ``calcular_estatisticas``.
+
+    Sob ASGI as quatro agregações são independentes e rodam ao mesmo tempo, cada
+    uma em sua própria thread e conexão. Sob WSGI (e no runserver) elas rodam em
+    sequência na thread da requisição, reaproveitando a conexão persistente
+    (``CONN_MAX_AGE``) em vez de abrir uma conexão por agregação.
+    """
+    if settings.SERVIDOR != 'asgi':
+        return await sync_to_async(calcular_estatisticas)()
+
+    resultados = await asyncio.gather(*(
+        sync_to_async(_em_conexao_propria, thread_sensitive=False)(agregar)
+        for agregar in AGREGACOES
+    ))
+    return _montar_estatisticas(*resultados)
+
+
+def obter_estatisticas():
+    """
+    Retorna as estatísticas do cache, recalculando-as quando expiradas ou invalidadas.
+    """
+    chave = _cache_key(timezone.localdate())
+    estatisticas = cache.get(chave)
+    if estatisticas is None:
+        estatisticas = calcular_estatisticas()
+        cache.set(chave, estatisticas, settings.DASHBOARD_CACHE_TTL)
+    return estatisticas
+
+
+async def aobter_estatisticas():
+    """
+    Versão assíncrona de ``obter_estatisticas``.
+    """
+    chave = _cache_key(timezone.localdate())
+    estatisticas = await cache.aget(chave)
+    if estatisticas is None:
+        estatisticas = await acalcular_estatisticas()
+        await cache.aset(chave, estatisticas, settings.DASHBOARD_CACHE_TTL)
+    return estatisticas
+
+
+def invalidar_estatisticas():
+    """
+    Descarta as estatísticas em cache assim que a transação corrente for confirmada.
+    """
+    transaction.on_commit(
+        lambda: cache.delete(_cache_key(timezone.localdate()))
+    )
@@ -0,0 +1,14 @@
+def somente_digitos(valor):
+    return ''.join(filter(str.isdigit, valor or ''))
+
+
+def formatar_documento(digitos, tipo):
+    """
+    Formata um CPF (PF, 11 dígitos) ou CNPJ (PJ, 14 dígitos).
+    Retorna ``None`` se a quantidade de dígitos não corresponder ao tipo.
+    """
+    if tipo == 'PF' and len(digitos) == 11:
+        return f"{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}"
+    if tipo == 'PJ' and len(digitos) == 14:
+        return f"{digitos[:2]}.{digitos[2:5]}.{digitos[5:8]}/{digitos[8:12]}-{digitos[12:]}"
+    return None
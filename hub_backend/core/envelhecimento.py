@@ -0,0 +1,170 @@
+from datetime import timedelta
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from .models import Correspondencia
+
+CACHE_KEY_PREFIX = 'core:envelhecimento'
+_data_hora = serializers.DateTimeField()
+LIMITES_PADRAO = (7, 15, 30, 60)
+
+AGRUPAMENTOS = {
+    'caixa': ['caixa_postal_id', 'caixa_postal__numero', 'caixa_postal__cliente_id', 'caixa_postal__cliente__nome'],
+    'cliente': ['caixa_postal__cliente_id', 'caixa_postal__cliente__nome'],
+}
+
+
+def ler_limites(valor):
+    """
+    Lê os limites das faixas no formato ``7,15,30`` (dias, inteiros e crescentes).
+    """
+    if not valor:
+        return LIMITES_PADRAO
+    try:
+        limites = tuple(int(parte) for parte in valor.split(','))
+    except ValueError:
+        limites = ()
+    if not limites or limites[0] < 0 or any(a >= b for a, b in zip(limites, limites[1:])):
+        raise ValidationError({'faixas': 'Informe limites inteiros e crescentes, por exemplo 7,15,30.'})
+    return limites
+
+
+def ler_id(valor, campo):
+    """
+    Lê o id (UUID) usado como filtro em ``campo``; retorna ``None`` quando ausente.
+    """
+    if not valor:
+        return None
+    try:
+        return uuid.UUID(valor)
+    except ValueError:
+        raise ValidationError({campo: 'Informe um UUID válido.'})
+
+
+def ler_dias(valor, campo):
+    """
+    Lê um número de dias (inteiro, zero ou positivo) usado como filtro em ``campo``;
+    retorna ``None`` quando ausente.
+    """
+    if valor in (None, ''):
+        return None
+    try:
+        dias = int(valor)
+    except ValueError:
+        raise ValidationError({campo: 'Informe um número inteiro de dias.'})
+    if dias < 0:
+        raise ValidationError({campo: 'O número de dias não pode ser negativo.'})
+    return dias
+
+
+def montar_faixas(limites):
+    """
+    Converte limites como ``(7, 15, 30)`` nas faixas ``0-7``, ``8-15``, ``16-30`` e ``31+``.
+    Cada faixa é uma tupla ``(rotulo, de, ate)`` em dias, com ``ate=None`` na última.
+    """
+    faixas = []
+    de = 0
+    for ate in limites:
+        faixas.append((f'{de}-{ate}', de, ate))
+        de = ate + 1
+    faixas.append((f'{de}+', de, None))
+    return faixas
+
+
+def _contagens(faixas, agora):
+    # idade (dias completos) entre de e ate  <=>  agora - (ate + 1) dias < data_recebimento <= agora - de dias
+    contagens = {}
+    for rotulo, de, ate in faixas:
+        filtro = Q(data_recebimento__lte=agora - timedelta(days=de))
+        if ate is not None:
+            filtro &= Q(data_recebimento__gt=agora - timedelta(days=ate + 1))
+        contagens[rotulo] = Count('id', filter=filtro)
+    return contagens
+
+
+def _quantidades(faixas, contagens):
+    return [
+        {'faixa': rotulo, 'de': de, 'ate': ate, 'quantidade': contagens[rotulo]}
+        for rotulo, de, ate in faixas
+    ]
+
+
+def pendentes(caixa_id=None, cliente_id=None, mais_de_dias=None, agora=None):
+    """
+    Correspondências pendentes, opcionalmente de uma caixa/cliente e há mais de ``mais_de_dias`` dias.
+    Os filtros de idade viram comparações com ``data_recebimento`` para usar o índice de pendentes.
+    """
+    queryset = Correspondencia.objects.filter(status='RECEBIDA')
+    if caixa_id:
+        queryset = queryset.filter(caixa_postal_id=caixa_id)
+    if cliente_id:
+        queryset = queryset.filter(caixa_postal__cliente_id=cliente_id)
+    if mais_de_dias is not None:
+        agora = agora or timezone.now()
+        queryset = queryset.filter(data_recebimento__lte=agora - timedelta(days=mais_de_dias + 1))
+    return queryset
+
+
+def calcular_resumo(queryset, limites=LIMITES_PADRAO, agora=None):
+    """
+    Conta as correspondências pendentes por faixa de idade com uma única agregação.
+    """
+    agora = agora or timezone.now()
+    faixas = montar_faixas(limites)
+    contagens = queryset.aggregate(total=Count('id'), **_contagens(faixas, agora))
+    return {
+        'total': contagens['total'],
+        'faixas': _quantidades(faixas, contagens),
+        'gerado_em': _data_hora.to_representation(agora),
+    }
+
+
+def obter_resumo(limites=LIMITES_PADRAO, atualizar=False):
+    """
+    Resumo global das pendências por faixa, guardado em cache por ``ENVELHECIMENTO_CACHE_TTL`` segundos.
+    """
+    chave = f"{CACHE_KEY_PREFIX}:{','.join(map(str, limites))}"
+    resumo = None if atualizar else cache.get(chave)
+    if resumo is None:
+        resumo = calcular_resumo(pendentes(), limites)
+        cache.set(chave, resumo, settings.ENVELHECIMENTO_CACHE_TTL)
+    return resumo
+
+
+def agrupar(queryset, agrupamento, limites=LIMITES_PADRAO, agora=None):
+    """
+    Contagem por faixa para cada caixa ou cliente, em uma única consulta com GROUP BY.
+    Os grupos com a pendência mais antiga vêm primeiro.
+    """
+    agora = agora or timezone.now()
+    campos = AGRUPAMENTOS[agrupamento]
+    return queryset.values(*campos).annotate(
+        total=Count('id'),
+        mais_antiga=Min('data_recebimento'),
+        **_contagens(montar_faixas(limites), agora)
+    ).order_by('mais_antiga', campos[0])
+
+
+def representar_grupo(linha, limites=LIMITES_PADRAO):
+    """
+    Converte uma linha de ``agrupar`` no formato da resposta da API.
+    """
+    grupo = {}
+    if 'caixa_postal_id' in linha:
+        grupo['caixa_postal'] = {'id': linha['caixa_postal_id'], 'numero': linha['caixa_postal__numero']}
+    grupo.update({
+        'cliente': {
+            'id': linha['caixa_postal__cliente_id'],
+            'nome': linha['caixa_postal__cliente__nome'],
+        },
+        'total': linha['total'],
+        'mais_antiga': _data_hora.to_representation(linha['mais_antiga']),
+        'faixas': _quantidades(montar_faixas(limites), linha),
+    })
+    return grupo
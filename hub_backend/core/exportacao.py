@@ -0,0 +1,65 @@
+import csv
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+CHUNK_SIZE = 2000
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class _Eco:
+    """
+    Pseudo-buffer que devolve o que é escrito, para o ``csv.writer`` gerar linhas sob demanda.
+    """
+    def write(self, valor):
+        return valor
+
+
+def _csv(serializer):
+    campos = list(serializer.fields.keys())
+    writer = csv.DictWriter(_Eco(), fieldnames=campos)
+    return writer.writerow(dict(zip(campos, campos))), writer.writerow
+
+
+def _ndjson(serializer):
+    encoder = JSONEncoder(ensure_ascii=False)
+    return None, lambda linha: encoder.encode(linha) + '\n'
+
+
+def _gerar(queryset, serializer, cabecalho, formatar):
+    if cabecalho is not None:
+        yield cabecalho
+    for obj in queryset.iterator(chunk_size=CHUNK_SIZE):
+        yield formatar(serializer.to_representation(obj))
+
+
+async def _agerar(queryset, serializer, cabecalho, formatar):
+    if cabecalho is not None:
+        yield cabecalho
+    async for obj in queryset.aiterator(chunk_size=CHUNK_SIZE):
+        yield formatar(serializer.to_representation(obj))
+
+
+def exportar(queryset, serializer_class, formato, nome_arquivo, assincrono=False):
+    """
+    Gera uma resposta em streaming (CSV ou NDJSON) percorrendo o queryset com um
+    cursor no servidor, sem carregar o resultado inteiro em memória.
+
+    Sob ASGI (``assincrono=True``) o conteúdo vem de um gerador assíncrono sobre
+    ``aiterator()``: o Django só consegue servir iteradores síncronos nesse modo
+    juntando tudo numa lista antes de enviar.
+    """
+    serializer = serializer_class()
+    cabecalho, formatar = {'csv': _csv, 'ndjson': _ndjson}[formato](serializer)
+    gerar = _agerar if assincrono else _gerar
+
+    response = StreamingHttpResponse(
+        gerar(queryset, serializer, cabecalho, formatar),
+        content_type=FORMATOS[formato]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{nome_arquivo}.{formato}"'
+    return response
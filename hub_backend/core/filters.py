@@ -0,0 +1,151 @@
+from datetime import datetime, time, timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .anotacoes import anotar_dias_na_caixa
+
+
+def filtrar_correspondencias(queryset, params):
+    """
+    Aplica os filtros simples da listagem de correspondências
+    (``cliente_id``, ``caixa_id``, ``status`` e ``tipo``).
+    """
+    cliente_id = params.get('cliente_id')
+    caixa_id = params.get('caixa_id')
+    status = params.get('status')
+    tipo = params.get('tipo')
+
+    if cliente_id:
+        queryset = queryset.filter(caixa_postal__cliente_id=cliente_id)
+    if caixa_id:
+        queryset = queryset.filter(caixa_postal_id=caixa_id)
+    if status:
+        queryset = queryset.filter(status=status)
+    if tipo:
+        queryset = queryset.filter(tipo=tipo)
+    return queryset
+
+
+def inicio_do_dia(dia):
+    """
+    Retorna o primeiro instante do dia no fuso horário do sistema (America/Sao_Paulo).
+    """
+    return timezone.make_aware(datetime.combine(dia, time.min), timezone.get_default_timezone())
+
+
+def intervalo_do_dia(dia):
+    """
+    Retorna o intervalo semiaberto [início do dia, início do dia seguinte).
+    """
+    return inicio_do_dia(dia), inicio_do_dia(dia + timedelta(days=1))
+
+
+class PeriodoRecebimentoFilter(BaseFilterBackend):
+    """
+    Filtra por ``data_inicio``/``data_fim`` (inclusivos) como um intervalo semiaberto
+    de timestamps, para que o índice em ``data_recebimento`` possa ser usado.
+    """
+    campo = 'data_recebimento'
+    inicio_param = 'data_inicio'
+    fim_param = 'data_fim'
+
+    def filter_queryset(self, request, queryset, view):
+        data_inicio = self.get_data(request, self.inicio_param)
+        data_fim = self.get_data(request, self.fim_param)
+
+        if data_inicio:
+            queryset = queryset.filter(**{f'{self.campo}__gte': inicio_do_dia(data_inicio)})
+        if data_fim:
+            queryset = queryset.filter(**{f'{self.campo}__lt': inicio_do_dia(data_fim + timedelta(days=1))})
+
+        return queryset
+
+    def get_data(self, request, param):
+        valor = request.query_params.get(param)
+        if not valor:
+            return None
+
+        try:
+            data = parse_date(valor)
+        except ValueError:
+            data = None
+        if data is None:
+            raise ValidationError({param: 'Data inválida. Use o formato AAAA-MM-DD.'})
+        return data
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': param,
+                'required': False,
+                'in': 'query',
+                'description': descricao,
+                'schema': {'type': 'string', 'format': 'date'},
+            }
+            for param, descricao in [
+                (self.inicio_param, 'Data inicial de recebimento (inclusiva).'),
+                (self.fim_param, 'Data final de recebimento (inclusiva).'),
+            ]
+        ]
+
+
+class IdadeCorrespondenciaFilter(BaseFilterBackend):
+    """
+    Filtra (``mais_de_dias``) e ordena (``ordenar=idade`` ou ``-idade``) pela
+    quantidade de dias na caixa. A ordenação usa ``anotar_dias_na_caixa``; o
+    filtro compara ``data_recebimento`` com um limite, como em ``core.envelhecimento``.
+    """
+    dias_param = 'mais_de_dias'
+    ordenar_param = 'ordenar'
+    ordenacoes = {
+        'idade': ('idade_dias', 'id'),
+        '-idade': ('-idade_dias', 'id'),
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        dias = request.query_params.get(self.dias_param)
+        ordenar = request.query_params.get(self.ordenar_param)
+
+        if dias:
+            try:
+                dias = int(dias)
+            except ValueError:
+                raise ValidationError({self.dias_param: 'Informe um número inteiro de dias.'})
+            # Mesmo critério de idade_dias > N, mas sobre data_recebimento para usar o índice:
+            # só as retiradas precisam ainda comparar a data de retirada
+            limite = timedelta(days=dias + 1)
+            queryset = queryset.filter(
+                Q(data_recebimento__lte=timezone.now() - limite),
+                ~Q(status='RETIRADA') | Q(data_retirada__gte=F('data_recebimento') + limite),
+            )
+
+        if ordenar:
+            if 'idade_dias' not in queryset.query.annotations:
+                queryset = anotar_dias_na_caixa(queryset)
+            if ordenar not in self.ordenacoes:
+                raise ValidationError({self.ordenar_param: f"Use um destes valores: {', '.join(self.ordenacoes)}."})
+            queryset = queryset.order_by(*self.ordenacoes[ordenar])
+
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.dias_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Somente correspondências há mais de N dias na caixa.',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.ordenar_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Ordenação por dias na caixa (idade ou -idade).',
+                'schema': {'type': 'string', 'enum': list(self.ordenacoes)},
+            },
+        ]
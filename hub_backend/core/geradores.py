@@ -0,0 +1,276 @@
+"""
+Geradores de dados sintéticos usados pelo ``populate_database --bulk``.
+
+As funções deste módulo não acessam o banco: recebem uma semente e devolvem
+linhas prontas para inserção, de modo que possam rodar em processos separados
+e produzir sempre o mesmo resultado para a mesma semente.
+"""
+import csv
+import io
+import random
+import uuid
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from faker import Faker
+
+from .documentos import formatar_documento
+
+NOMES_EMPRESAS = [
+    'Tech Solutions', 'Digital Systems', 'Smart Business', 'Future Corp',
+    'Global Trade', 'Prime Services', 'Elite Consultoria', 'Nova Era',
+    'Inovação Total', 'Estratégia Plus', 'Mercado Líder', 'Qualidade First',
+    'Excelência Pro', 'Vanguarda Tech', 'Pioneira Digital', 'Moderna Gestão'
+]
+SUFIXOS_EMPRESAS = ['Ltda', 'S.A.', 'EIRELI', 'ME', 'EPP', 'SS', 'Sociedade Simples']
+DOMINIOS = ['gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com.br', 'uol.com.br']
+ESTADOS = ['SP', 'RJ', 'MG', 'RS', 'PR', 'SC', 'BA', 'GO', 'PE', 'CE']
+DDDS = [11, 21, 31, 41, 51, 61, 71, 81, 85, 91]
+
+REMETENTES_ECOMMERCE = ['Amazon', 'Mercado Livre', 'Magazine Luiza', 'Casas Bahia', 'Americanas', 'Shopee']
+REMETENTES_BANCOS = ['Banco do Brasil', 'Caixa Econômica', 'Itaú', 'Bradesco', 'Santander', 'Nubank']
+REMETENTES_GOVERNO = ['Receita Federal', 'INSS', 'Prefeitura Municipal', 'Detran', 'Cartório']
+REMETENTES_SERVICOS = ['Conta de Luz', 'Conta de Água', 'Internet/TV', 'Plano de Saúde']
+
+REMETENTES = {
+    'PF': REMETENTES_ECOMMERCE + REMETENTES_SERVICOS + REMETENTES_BANCOS,
+    'PJ': REMETENTES_GOVERNO + REMETENTES_BANCOS + REMETENTES_SERVICOS,
+}
+TIPOS = {
+    'PF': ['PACOTE', 'ENCOMENDA', 'SEDEX', 'PAC', 'CARTA'],
+    'PJ': ['DOCUMENTO', 'AR', 'CARTA'],
+}
+TIPOS_RASTREAVEIS = {'SEDEX', 'PAC', 'AR', 'PACOTE', 'ENCOMENDA'}
+
+VALOR_PLANOS = {
+    'BASICO': Decimal('49.90'),
+    'PREMIUM': Decimal('129.90'),
+    'EMPRESARIAL': Decimal('299.90'),
+}
+
+COLUNAS_CORRESPONDENCIA = [
+    'id', 'caixa_postal_id', 'data_recebimento', 'descricao', 'tipo', 'status',
+    'data_retirada', 'remetente', 'codigo_rastreamento', 'retirado_por',
+    'documento_retirada', 'created_at', 'updated_at',
+]
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _digito(digitos, pesos):
+    resto = sum(int(d) * p for d, p in zip(digitos, pesos)) % 11
+    return '0' if resto < 2 else str(11 - resto)
+
+
+def gerar_cpf(numero):
+    """
+    Gera um CPF válido (somente dígitos) a partir de um número sequencial.
+    """
+    base = f'{numero % 10 ** 9:09d}'
+    base += _digito(base, range(10, 1, -1))
+    return base + _digito(base, range(11, 1, -1))
+
+
+def gerar_cnpj(numero):
+    """
+    Gera um CNPJ válido (somente dígitos) de matriz a partir de um número sequencial.
+    """
+    pesos = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    base = f'{numero % 10 ** 8:08d}0001'
+    base += _digito(base, pesos)
+    return base + _digito(base, [6] + pesos)
+
+
+def _telefone(rng):
+    ddd = rng.choice(DDDS)
+    if rng.random() < 0.7:
+        numero = f"9{rng.randint(1000, 9999)}{rng.randint(1000, 9999)}"
+        return f"({ddd:02d}) {numero[:5]}-{numero[5:]}"
+    numero = f"{rng.randint(2000, 9999)}{rng.randint(1000, 9999)}"
+    return f"({ddd:02d}) {numero[:4]}-{numero[4:]}"
+
+
+def gerar_clientes(inicio, quantidade, seed):
+    """
+    Gera ``quantidade`` clientes (70% PF) numerados a partir de ``inicio``.
+
+    Documentos e e-mails derivam do número do cliente, garantindo unicidade
+    mesmo quando lotes diferentes são gerados em processos separados.
+    """
+    rng = random.Random(seed)
+    fake = Faker('pt_BR')
+    fake.seed_instance(seed)
+
+    clientes = []
+    for numero in range(inicio, inicio + quantidade):
+        if rng.random() < 0.7:
+            tipo = 'PF'
+            nome = fake.name()
+            documento = gerar_cpf(numero)
+            ativo = rng.random() < 0.95
+        else:
+            tipo = 'PJ'
+            nome = f"{rng.choice(NOMES_EMPRESAS)} {rng.choice(SUFIXOS_EMPRESAS)}"
+            documento = gerar_cnpj(numero)
+            ativo = rng.random() < 0.90
+
+        clientes.append({
+            'id': _uuid(rng),
+            'tipo': tipo,
+            'nome': nome,
+            'documento': formatar_documento(documento, tipo),
+            'documento_digitos': documento,
+            'email': f"cliente{numero}@{rng.choice(DOMINIOS)}",
+            'telefone': _telefone(rng),
+            'endereco': f"{fake.street_address()}, {fake.city()}, {rng.choice(ESTADOS)}",
+            'ativo': ativo,
+        })
+    return clientes
+
+
+def _peso(cliente):
+    if not cliente['ativo']:
+        return 3
+    return 16 if cliente['tipo'] == 'PJ' else 9
+
+
+def distribuir_correspondencias(clientes, total, seed):
+    """
+    Define quantas correspondências cada cliente recebe.
+
+    Sem ``total``, segue as faixas do modo tradicional (PJ recebem mais que PF e
+    clientes inativos recebem poucas). Com ``total``, reparte esse número
+    proporcionalmente aos mesmos pesos.
+    """
+    rng = random.Random(seed)
+    if total is None:
+        faixas = {3: (1, 5), 9: (3, 15), 16: (8, 25)}
+        return [rng.randint(*faixas[_peso(cliente)]) for cliente in clientes]
+
+    sorteio = Counter(rng.choices(range(len(clientes)), weights=[_peso(c) for c in clientes], k=total))
+    return [sorteio[indice] for indice in range(len(clientes))]
+
+
+def _dias_atras(rng):
+    if rng.random() < 0.3:
+        return rng.randint(1, 7)
+    if rng.random() < 0.5:
+        return rng.randint(8, 30)
+    if rng.random() < 0.3:
+        return rng.randint(31, 90)
+    return rng.randint(91, 365)
+
+
+def _chance_retirada(dias_atras):
+    if dias_atras > 60:
+        return 0.85
+    if dias_atras > 30:
+        return 0.75
+    if dias_atras > 15:
+        return 0.60
+    if dias_atras > 7:
+        return 0.40
+    return 0.20
+
+
+def gerar_correspondencias(caixas, agora, seed):
+    """
+    Gera as linhas de correspondência para uma lista de caixas.
+
+    ``caixas`` é uma lista de tuplas ``(caixa_id, tipo, nome, documento, quantidade)``.
+    Cada linha segue a ordem de ``COLUNAS_CORRESPONDENCIA``.
+    """
+    rng = random.Random(seed)
+    linhas = []
+    for caixa_id, tipo_cliente, nome, documento, quantidade in caixas:
+        remetentes = REMETENTES[tipo_cliente]
+        tipos = TIPOS[tipo_cliente]
+        for _ in range(quantidade):
+            dias_atras = _dias_atras(rng)
+            data_recebimento = agora - timedelta(days=dias_atras, seconds=rng.randint(0, 86399))
+            remetente = rng.choice(remetentes)
+            tipo = rng.choice(tipos)
+
+            codigo_rastreamento = None
+            if tipo in TIPOS_RASTREAVEIS and rng.random() < 0.7:
+                codigo_rastreamento = f'BR{rng.randint(100000000, 999999999)}BR'
+
+            data_retirada = retirado_por = documento_retirada = None
+            if rng.random() < _chance_retirada(dias_atras):
+                status = 'RETIRADA'
+                data_retirada = min(
+                    data_recebimento + timedelta(days=rng.randint(1, min(10, dias_atras))),
+                    agora - timedelta(hours=rng.randint(1, 24))
+                )
+                retirado_por = nome
+                documento_retirada = documento
+            else:
+                status = 'RECEBIDA'
+
+            linhas.append((
+                _uuid(rng), caixa_id, data_recebimento, f'{tipo} de {remetente}', tipo, status,
+                data_retirada, remetente, codigo_rastreamento, retirado_por,
+                documento_retirada, agora, agora,
+            ))
+    return linhas
+
+
+def gerar_correspondencias_csv(caixas, agora, seed):
+    """
+    Igual a ``gerar_correspondencias``, mas já devolve as linhas em CSV (para ``COPY``)
+    junto com a quantidade gerada.
+    """
+    linhas = gerar_correspondencias(caixas, agora, seed)
+    agora_texto = str(agora)
+    caixas_texto = {caixa[0]: caixa[0].hex for caixa in caixas}
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        (
+            pk.hex, caixas_texto[caixa_id], str(recebimento), descricao, tipo, status,
+            retirada and str(retirada), remetente, rastreamento, retirado_por, documento,
+            agora_texto, agora_texto,
+        )
+        for (pk, caixa_id, recebimento, descricao, tipo, status, retirada, remetente,
+             rastreamento, retirado_por, documento, _, _) in linhas
+    )
+    return buffer.getvalue(), len(linhas)
+
+
+def gerar_contratos(clientes, hoje, seed):
+    """
+    Gera contratos para 60% dos clientes, com planos e durações conforme o tipo de pessoa.
+    """
+    from dateutil.relativedelta import relativedelta
+
+    rng = random.Random(seed)
+    contratos = []
+    for cliente in rng.sample(clientes, int(len(clientes) * 0.6)):
+        if cliente['tipo'] == 'PJ':
+            plano = rng.choices(['BASICO', 'PREMIUM', 'EMPRESARIAL'], weights=[20, 40, 40])[0]
+            duracao = rng.choices([12, 24, 36], weights=[30, 50, 20])[0]
+        else:
+            plano = rng.choices(['BASICO', 'PREMIUM', 'EMPRESARIAL'], weights=[60, 30, 10])[0]
+            duracao = rng.choices([6, 12, 24], weights=[40, 45, 15])[0]
+
+        data_inicio = hoje - timedelta(days=rng.randint(1, 24) * 30)
+        if data_inicio + relativedelta(months=duracao) < hoje:
+            status = 'ATIVO' if rng.random() < 0.8 else rng.choice(['VENCIDO', 'CANCELADO'])
+        else:
+            status = 'ATIVO' if cliente['ativo'] else 'CANCELADO'
+
+        variacao = Decimal(str(rng.uniform(0.9, 1.1)))
+        contratos.append({
+            'id': _uuid(rng),
+            'cliente_id': cliente['id'],
+            'plano': plano,
+            'valor_mensal': (VALOR_PLANOS[plano] * variacao).quantize(Decimal('0.01')),
+            'data_inicio': data_inicio,
+            'duracao_meses': duracao,
+            'status': status,
+            'observacoes': f"Contrato {plano} - {cliente['tipo']} - Status: {status}",
+        })
+    return contratos
@@ -0,0 +1,19 @@
+from django.contrib.postgres.indexes import GinIndex
+
+
+class GinIndexPostgres(GinIndex):
+    """
+    ``GinIndex`` que só existe no PostgreSQL.
+
+    Nos demais bancos não gera SQL, para que as migrações (e as reconstruções de
+    tabela do SQLite, que recriam todos os índices do modelo) continuem rodando.
+    """
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return ''
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return ''
+        return super().remove_sql(model, schema_editor, **kwargs)
@@ -0,0 +1,222 @@
+import hashlib
+
+from adrf.viewsets import GenericViewSet
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, serializers
+from rest_framework.response import Response
+
+from .metricas import serializando
+from .models import Contrato, Correspondencia
+from .pagination import CorrespondenciaCursorPagination
+
+_data_hora = serializers.DateTimeField().to_representation
+_data = serializers.DateField().to_representation
+_valor_mensal = serializers.DecimalField(max_digits=10, decimal_places=2).to_representation
+
+TIPOS_CORRESPONDENCIA = dict(Correspondencia.TIPO_CHOICES)
+STATUS_CORRESPONDENCIA = dict(Correspondencia.STATUS_CHOICES)
+PLANOS_CONTRATO = dict(Contrato.PLANO_CHOICES)
+STATUS_CONTRATO = dict(Contrato.STATUS_CHOICES)
+
+
+class Leitor:
+    """
+    Representação de leitura montada direto das linhas de ``.values()``.
+
+    Cada subclasse lista as colunas que busca e monta, em ``representar``, o mesmo
+    dicionário que o serializer correspondente produziria, sem instanciar models
+    nem percorrer os campos do serializer.
+    """
+    colunas = []
+    campos_versao = ['updated_at']
+
+    def valores(self, queryset):
+        return queryset.values(*self.colunas)
+
+    def ler(self, linhas):
+        with serializando():
+            return [self.representar(linha) for linha in linhas]
+
+    def representar(self, linha):
+        raise NotImplementedError
+
+    def agregados_versao(self):
+        """
+        Agregados que mudam sempre que a listagem muda: o ``Max`` de cada campo de
+        ``campos_versao`` (incluindo os de tabelas relacionadas exibidas) e a contagem.
+        """
+        agregados = {'total': Count('pk')}
+        for indice, campo in enumerate(self.campos_versao):
+            agregados[f'versao_{indice}'] = Max(campo)
+        return agregados
+
+    async def aversao(self, queryset):
+        """
+        Calcula, com uma única consulta, a versão e a data da última alteração do queryset.
+        """
+        agregados = await queryset.aaggregate(**self.agregados_versao())
+        chave = '|'.join(f'{nome}={valor}' for nome, valor in sorted(agregados.items()))
+        datas = [agregados[f'versao_{indice}'] for indice in range(len(self.campos_versao))]
+        return chave, max(filter(None, datas), default=None)
+
+
+class ClienteLeitor(Leitor):
+    colunas = [
+        'id', 'tipo', 'nome', 'documento', 'email', 'telefone', 'endereco',
+        'ativo', 'created_at', 'updated_at',
+    ]
+
+    def representar(self, linha):
+        return {
+            'id': str(linha['id']),
+            'tipo': linha['tipo'],
+            'nome': linha['nome'],
+            'documento': linha['documento'],
+            'documento_formatado': linha['documento'],
+            'email': linha['email'],
+            'telefone': linha['telefone'],
+            'endereco': linha['endereco'],
+            'ativo': linha['ativo'],
+            'created_at': _data_hora(linha['created_at']),
+            'updated_at': _data_hora(linha['updated_at']),
+        }
+
+
+class CaixaPostalLeitor(Leitor):
+    colunas = [
+        'id', 'numero', 'cliente_id', 'cliente__nome', 'cliente__documento', 'observacoes',
+        'ativa', 'total_correspondencias', 'correspondencias_pendentes', 'created_at', 'updated_at',
+    ]
+    campos_versao = ['updated_at', 'cliente__updated_at', 'contador__updated_at']
+
+    def representar(self, linha):
+        return {
+            'id': str(linha['id']),
+            'numero': linha['numero'],
+            'cliente': linha['cliente_id'],
+            'cliente_nome': linha['cliente__nome'],
+            'cliente_documento': linha['cliente__documento'],
+            'observacoes': linha['observacoes'],
+            'ativa': linha['ativa'],
+            'total_correspondencias': linha['total_correspondencias'],
+            'correspondencias_pendentes': linha['correspondencias_pendentes'],
+            'created_at': _data_hora(linha['created_at']),
+            'updated_at': _data_hora(linha['updated_at']),
+        }
+
+
+class CorrespondenciaLeitor(Leitor):
+    colunas = [
+        'id', 'caixa_postal_id', 'caixa_postal__cliente__nome', 'caixa_postal__numero',
+        'data_recebimento', 'descricao', 'tipo', 'status', 'data_retirada', 'remetente',
+        'codigo_rastreamento', 'observacoes', 'retirado_por', 'documento_retirada',
+        'idade_dias', 'created_at', 'updated_at',
+    ]
+    campos_versao = ['updated_at', 'caixa_postal__updated_at', 'caixa_postal__cliente__updated_at']
+
+    def representar(self, linha):
+        return {
+            'id': str(linha['id']),
+            'caixa_postal': linha['caixa_postal_id'],
+            'cliente_nome': linha['caixa_postal__cliente__nome'],
+            'caixa_numero': linha['caixa_postal__numero'],
+            'data_recebimento': _data_hora(linha['data_recebimento']),
+            'descricao': linha['descricao'],
+            'tipo': linha['tipo'],
+            'tipo_display': TIPOS_CORRESPONDENCIA.get(linha['tipo'], linha['tipo']),
+            'status': linha['status'],
+            'status_display': STATUS_CORRESPONDENCIA.get(linha['status'], linha['status']),
+            'data_retirada': _data_hora(linha['data_retirada']),
+            'remetente': linha['remetente'],
+            'codigo_rastreamento': linha['codigo_rastreamento'],
+            'observacoes': linha['observacoes'],
+            'retirado_por': linha['retirado_por'],
+            'documento_retirada': linha['documento_retirada'],
+            'dias_na_caixa': linha['idade_dias'],
+            'created_at': _data_hora(linha['created_at']),
+            'updated_at': _data_hora(linha['updated_at']),
+        }
+
+
+class ContratoLeitor(Leitor):
+    colunas = [
+        'id', 'cliente_id', 'cliente__nome', 'plano', 'valor_mensal', 'data_inicio',
+        'duracao_meses', 'vencimento', 'vencido', 'status', 'observacoes', 'created_at', 'updated_at',
+    ]
+    campos_versao = ['updated_at', 'cliente__updated_at']
+
+    def representar(self, linha):
+        return {
+            'id': str(linha['id']),
+            'cliente': linha['cliente_id'],
+            'cliente_nome': linha['cliente__nome'],
+            'plano': linha['plano'],
+            'plano_display': PLANOS_CONTRATO.get(linha['plano'], linha['plano']),
+            'valor_mensal': _valor_mensal(linha['valor_mensal']),
+            'data_inicio': _data(linha['data_inicio']),
+            'duracao_meses': linha['duracao_meses'],
+            'data_vencimento': linha['vencimento'],
+            'status': linha['status'],
+            'status_display': STATUS_CONTRATO.get(linha['status'], linha['status']),
+            'esta_vencido': linha['vencido'],
+            'valor_total': linha['valor_mensal'] * linha['duracao_meses'],
+            'observacoes': linha['observacoes'],
+            'created_at': _data_hora(linha['created_at']),
+            'updated_at': _data_hora(linha['updated_at']),
+        }
+
+
+class LeituraRapidaMixin:
+    """
+    Substitui o ``list`` do ViewSet pela leitura via ``.values()`` do ``leitor``.
+    O JSON é o mesmo do ``serializer_class``; escritas e detalhes continuam no serializer.
+
+    A listagem é assíncrona (ORM assíncrono do Django) e responde com ``ETag``/``Last-Modified``,
+    devolvendo ``304`` sem ler as linhas quando o ``If-None-Match`` ainda corresponde
+    à versão do queryset. A data do dia entra no ``ETag`` porque campos como
+    ``dias_na_caixa`` e ``esta_vencido`` mudam com o tempo sem alterar ``updated_at``.
+
+    As páginas por cursor não têm ``ETag``: a versão agregaria o queryset inteiro,
+    e cada página custaria de novo o mesmo que uma varredura completa.
+    """
+    leitor = None
+
+    async def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if isinstance(self.paginator, CorrespondenciaCursorPagination):
+            response = await self.alistar_rapido(queryset)
+        else:
+            versao, ultima_alteracao = await self.leitor.aversao(queryset)
+            etag = quote_etag(hashlib.md5(
+                f'{request.get_full_path()}|{timezone.localdate()}|{versao}'.encode()
+            ).hexdigest())
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await self.alistar_rapido(queryset)
+
+            # A revalidação é feita só pelo ETag: exclusões não alteram a data da última alteração.
+            response['ETag'] = etag
+            if ultima_alteracao:
+                response['Last-Modified'] = http_date(ultima_alteracao.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    async def alistar_rapido(self, queryset, paginar=True):
+        queryset = self.leitor.valores(queryset)
+        if paginar and self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+            if page is not None:
+                return self.get_paginated_response(self.leitor.ler(page))
+        return Response(self.leitor.ler([linha async for linha in queryset.aiterator()]))
+
+
+class LeituraRapidaViewSet(LeituraRapidaMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                           mixins.UpdateModelMixin, mixins.DestroyModelMixin, GenericViewSet):
+    """
+    ``ModelViewSet`` com a listagem assíncrona. Criação, detalhe, alteração, exclusão
+    e as ações síncronas continuam como antes, executadas pelo adrf via ``sync_to_async``.
+    """
@@ -0,0 +1,114 @@
+import uuid
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .contadores import aplicar_deltas
+from .dashboard import invalidar_estatisticas
+from .models import CaixaPostal, Correspondencia
+from .serializers import CorrespondenciaLoteSerializer
+
+TAMANHO_MAXIMO_LOTE = 10000
+BATCH_SIZE = 1000
+
+
+def _caixas_do_lote(itens):
+    ids = set()
+    for item in itens:
+        try:
+            ids.add(uuid.UUID(str(item.get('caixa_postal'))))
+        except (AttributeError, TypeError, ValueError):
+            continue
+    return CaixaPostal.objects.in_bulk(ids)
+
+
+def _deltas_de_criacao(correspondencias):
+    deltas = {}
+    for correspondencia in correspondencias:
+        data = correspondencia.data_recebimento
+        delta = deltas.setdefault(correspondencia.caixa_postal_id, {
+            'total': 0, 'pendentes': 0, 'devolvidas': 0, 'ultimo_recebimento': data,
+        })
+        delta['total'] += 1
+        delta['pendentes'] += correspondencia.status == 'RECEBIDA'
+        delta['devolvidas'] += correspondencia.status == 'DEVOLVIDA'
+        delta['ultimo_recebimento'] = max(delta['ultimo_recebimento'], data)
+    return deltas
+
+
+def criar_em_lote(itens):
+    """
+    Valida e insere um lote de correspondências com ``bulk_create``.
+
+    As caixas postais são buscadas com uma única consulta para o lote inteiro e
+    uma só instância do serializer valida todas as linhas.
+    Linhas inválidas não impedem a inserção das demais; o resultado traz, para
+    cada posição do lote, o id criado ou os erros de validação.
+    """
+    contexto = {'caixas': _caixas_do_lote(itens)}
+
+    serializer = CorrespondenciaLoteSerializer(context=contexto)
+
+    resultados = []
+    correspondencias = []
+    for indice, item in enumerate(itens):
+        try:
+            dados = serializer.run_validation(item)
+        except ValidationError as exc:
+            resultados.append({'indice': indice, 'erros': exc.detail})
+            continue
+
+        correspondencia = Correspondencia(**dados)
+        correspondencias.append(correspondencia)
+        resultados.append({'indice': indice, 'id': correspondencia.id})
+
+    if correspondencias:
+        with transaction.atomic():
+            Correspondencia.objects.bulk_create(correspondencias, batch_size=BATCH_SIZE)
+            aplicar_deltas(_deltas_de_criacao(correspondencias))
+        invalidar_estatisticas()
+
+    return resultados, len(correspondencias)
+
+
+def marcar_retiradas_em_lote(ids=None, caixa_postal=None, retirado_por=None,
+                             documento_retirada=None, observacoes=None):
+    """
+    Marca como retiradas, com um único UPDATE, as correspondências pendentes
+    indicadas por ``ids`` e/ou ``caixa_postal``.
+
+    Retorna as correspondências efetivamente alteradas; itens já retirados ou
+    devolvidos são ignorados.
+    """
+    pendentes = Correspondencia.objects.filter(status='RECEBIDA')
+    if ids:
+        pendentes = pendentes.filter(id__in=ids)
+    if caixa_postal:
+        pendentes = pendentes.filter(caixa_postal_id=caixa_postal)
+
+    agora = timezone.now()
+    campos = {'status': 'RETIRADA', 'data_retirada': agora, 'updated_at': agora}
+    if retirado_por:
+        campos['retirado_por'] = retirado_por
+    if documento_retirada:
+        campos['documento_retirada'] = documento_retirada
+    if observacoes:
+        campos['observacoes'] = observacoes
+
+    with transaction.atomic():
+        travadas = list(pendentes.select_for_update().values_list('id', 'caixa_postal_id'))
+        if not travadas:
+            return []
+
+        afetadas = [pk for pk, _ in travadas]
+        Correspondencia.objects.filter(id__in=afetadas).update(**campos)
+        # Todas as travadas estavam pendentes: cada caixa perde uma pendente por linha
+        retiradas = Counter(caixa_id for _, caixa_id in travadas)
+        aplicar_deltas({caixa_id: {'pendentes': -n} for caixa_id, n in retiradas.items()})
+
+    invalidar_estatisticas()
+    return list(
+        Correspondencia.objects.select_related('caixa_postal__cliente').filter(id__in=afetadas)
+    )
@@ -0,0 +1,273 @@
+import io
+import json
+import secrets
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.metricas import medir
+from core.models import CaixaPostal, Cliente, Contrato, Correspondencia
+
+TAMANHOS = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+USUARIO_BENCHMARK = 'benchmark'
+CORRESPONDENCIAS_POR_CLIENTE = 20
+
+ROTAS = {
+    'clientes': '/api/clientes/',
+    'clientes ativos': '/api/clientes/?ativo=true',
+    'clientes PJ': '/api/clientes/?tipo=PJ',
+    'clientes busca': '/api/clientes/?search=silva',
+    'cliente': '/api/clientes/{cliente}/',
+    'cliente por documento': '/api/clientes/por-documento/?documento={documento}',
+    'cliente correspondencias': '/api/clientes/{cliente}/correspondencias/',
+    'clientes alteracoes': '/api/clientes/alteracoes/',
+    'caixas postais': '/api/caixas-postais/',
+    'caixas postais ativas': '/api/caixas-postais/?ativa=true',
+    'caixas postais do cliente': '/api/caixas-postais/?cliente_id={cliente}',
+    'caixa postal': '/api/caixas-postais/{caixa}/',
+    'correspondencias': '/api/correspondencias/',
+    'correspondencias cursor': '/api/correspondencias/?paginacao=cursor',
+    'correspondencias status': '/api/correspondencias/?status=RECEBIDA',
+    'correspondencias tipo': '/api/correspondencias/?tipo=SEDEX',
+    'correspondencias do cliente': '/api/correspondencias/?cliente_id={cliente}',
+    'correspondencias da caixa': '/api/correspondencias/?caixa_id={caixa}',
+    'correspondencias periodo': '/api/correspondencias/?data_inicio={semana}&data_fim={ontem}',
+    'correspondencias mais de 30 dias': '/api/correspondencias/?mais_de_dias=30',
+    'correspondencias por idade': '/api/correspondencias/?ordenar=-idade',
+    'correspondencia': '/api/correspondencias/{correspondencia}/',
+    'pendentes': '/api/correspondencias/pendentes/',
+    'hoje': '/api/correspondencias/hoje/',
+    'envelhecimento': '/api/correspondencias/envelhecimento/',
+    'envelhecimento por caixa': '/api/correspondencias/envelhecimento/?agrupar=caixa',
+    'correspondencias alteracoes': '/api/correspondencias/alteracoes/',
+    'contratos': '/api/contratos/',
+    'contratos ativos': '/api/contratos/?status=ATIVO',
+    'contratos plano': '/api/contratos/?plano=PREMIUM',
+    'contratos do cliente': '/api/contratos/?cliente_id={cliente}',
+    'contrato': '/api/contratos/{contrato}/',
+    'vencidos': '/api/contratos/vencidos/',
+    'dashboard': '/api/dashboard/',
+    'relatorio': '/api/relatorios/correspondencias/?data_inicio={ontem}&data_fim={ontem}',
+    'relatorio ndjson': '/api/relatorios/correspondencias/?data_inicio={ontem}&data_fim={ontem}&formato=ndjson',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every API route in-process against seeded datasets of 10k, 100k and 1M '
+        'correspondencias and write p50/p95 latency, queries and peak memory to JSON. '
+        'The cache is cleared before each request so cached routes are measured cold. Requests '
+        'authenticate with a JWT for a dedicated "benchmark" user. Seeding deletes all existing '
+        'data and asks for confirmation unless --limpar is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanho', action='append', choices=list(TAMANHOS),
+                            help='Dataset size to seed and measure (repeatable: 10k, 100k, 1m)')
+        parser.add_argument('--seed', type=int, default=42, help='Seed passed to populate_database (default: 42)')
+        parser.add_argument('--workers', type=int, default=1, help='Processes used by populate_database (default: 1)')
+        parser.add_argument('--sem-popular', action='store_true',
+                            help='Measure the data already in the database instead of seeding it')
+        parser.add_argument('--limpar', action='store_true',
+                            help='Allow seeding to delete all existing data without asking for confirmation')
+        parser.add_argument('--repeticoes', type=int, default=10, help='Timed requests per route (default: 10)')
+        parser.add_argument('--rota', action='append', help='Only measure routes whose name contains this text')
+        parser.add_argument('--saida', default='benchmark_api.json', help='JSON output file (default: benchmark_api.json)')
+        parser.add_argument('--comparar', help='JSON file from a previous run to compare against')
+
+    def handle(self, *args, **options):
+        rotas = {
+            nome: rota for nome, rota in ROTAS.items()
+            if not options['rota'] or any(trecho in nome for trecho in options['rota'])
+        }
+        if not rotas:
+            raise CommandError('Nenhuma rota corresponde a --rota.')
+
+        resultado = {
+            'commit': self.commit_atual(),
+            'banco': connection.vendor,
+            'seed': options['seed'],
+            'repeticoes': options['repeticoes'],
+            'conjuntos': {},
+        }
+
+        if options['sem_popular']:
+            conjuntos = ['atual']
+        else:
+            conjuntos = options['tamanho'] or ['10k']
+            if not options['limpar']:
+                self.confirmar_limpeza()
+
+        for conjunto in conjuntos:
+            if conjunto != 'atual':
+                self.popular(TAMANHOS[conjunto], options['seed'], options['workers'])
+            self.stdout.write(f'\n📊 Conjunto {conjunto}')
+            resultado['conjuntos'][conjunto] = self.medir_conjunto(rotas, options['repeticoes'])
+
+        with open(options['saida'], 'w') as arquivo:
+            json.dump(resultado, arquivo, indent=2)
+        self.stdout.write(f"\n💾 Resultado salvo em {options['saida']}")
+
+        if options['comparar']:
+            with open(options['comparar']) as arquivo:
+                self.comparar(json.load(arquivo), resultado)
+
+    def confirmar_limpeza(self):
+        banco = settings.DATABASES['default']['NAME']
+        try:
+            resposta = input(
+                f'⚠️  Popular os conjuntos apaga todos os dados do banco {banco}. Digite "sim" para continuar: '
+            )
+        except EOFError:
+            resposta = ''
+        if resposta.strip().lower() != 'sim':
+            raise CommandError('Cancelado. Use --limpar para confirmar ou --sem-popular para medir os dados atuais.')
+
+    def popular(self, correspondencias, seed, workers):
+        clientes = max(500, correspondencias // CORRESPONDENCIAS_POR_CLIENTE)
+        self.stdout.write(f'\n🌱 Populando {correspondencias:,} correspondências ({clientes:,} clientes, seed {seed})...')
+        call_command(
+            'populate_database', clear=True, bulk=True, clientes=clientes,
+            correspondencias=correspondencias, seed=seed, workers=workers, stdout=io.StringIO(),
+        )
+
+    def medir_conjunto(self, rotas, repeticoes):
+        correspondencia = Correspondencia.objects.select_related('caixa_postal__cliente').order_by('id').first()
+        contrato = Contrato.objects.order_by('id').first()
+        if correspondencia is None or contrato is None:
+            raise CommandError('Sem dados para medir. Rode sem --sem-popular ou use populate_database antes.')
+
+        hoje = timezone.localdate()
+        ids = {
+            'cliente': correspondencia.caixa_postal.cliente_id,
+            'documento': correspondencia.caixa_postal.cliente.documento_digitos,
+            'caixa': correspondencia.caixa_postal_id,
+            'correspondencia': correspondencia.id,
+            'contrato': contrato.id,
+            'ontem': hoje - timedelta(days=1),
+            'semana': hoje - timedelta(days=7),
+        }
+
+        host = next((h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')), 'localhost')
+        client = APIClient(SERVER_NAME=host, raise_request_exception=False)
+        senha = self.preparar_usuario()
+
+        medicoes = {}
+        self.stdout.write('   Rota                                  p50 (ms)  p95 (ms)  consultas  memória (KiB)')
+        for nome, rota in rotas.items():
+            url = rota.format(**ids)
+            # Token novo a cada rota para não expirar no meio dos conjuntos grandes
+            self.autenticar(client, senha)
+            tempos, consultas, status = [], [], None
+            for indice in range(repeticoes + 1):
+                cache.clear()
+                inicio = time.perf_counter()
+                with medir() as medicao:
+                    response = client.get(url)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                tempo = (time.perf_counter() - inicio) * 1000
+                status = response.status_code
+                if indice:
+                    tempos.append(tempo)
+                    # Com o middleware ativo, a requisição tem a própria medição; a externa
+                    # só recebe as consultas feitas depois dela (respostas em streaming)
+                    interna = getattr(response.wsgi_request, 'medicao', None)
+                    consultas.append(medicao.consultas + (interna.consultas if interna else 0))
+
+            medicoes[nome] = {
+                'rota': url,
+                'status': status,
+                'p50_ms': self.percentil(tempos, 50),
+                'p95_ms': self.percentil(tempos, 95),
+                'consultas': max(consultas),
+                'pico_memoria_kib': self.pico_memoria(client, url),
+            }
+            dados = medicoes[nome]
+            linha = (f"   {nome:<36} {dados['p50_ms']:>9} {dados['p95_ms']:>9} {dados['consultas']:>10} "
+                     f"{dados['pico_memoria_kib']:>14,}")
+            self.stdout.write(linha if status < 400 else self.style.ERROR(f'{linha}  (HTTP {status})'))
+
+        return {
+            'linhas': {
+                'clientes': Cliente.objects.count(),
+                'caixas_postais': CaixaPostal.objects.count(),
+                'correspondencias': Correspondencia.objects.count(),
+                'contratos': Contrato.objects.count(),
+            },
+            'rotas': medicoes,
+        }
+
+    def preparar_usuario(self):
+        senha = secrets.token_urlsafe(16)
+        usuario, _ = User.objects.get_or_create(username=USUARIO_BENCHMARK)
+        usuario.is_active = True
+        usuario.set_password(senha)
+        usuario.save()
+        return senha
+
+    def autenticar(self, client, senha):
+        # Login de verdade: as rotas passam pela autenticação JWT, como em produção
+        client.credentials()
+        response = client.post(
+            '/api/auth/login/', {'username': USUARIO_BENCHMARK, 'password': senha}, format='json'
+        )
+        if response.status_code != 200:
+            raise CommandError(f'Falha no login do usuário {USUARIO_BENCHMARK} (HTTP {response.status_code}).')
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def pico_memoria(self, client, url):
+        # Medido em uma requisição à parte: o tracemalloc distorceria as latências
+        cache.clear()
+        tracemalloc.start()
+        try:
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            return tracemalloc.get_traced_memory()[1] // 1024
+        finally:
+            tracemalloc.stop()
+
+    def percentil(self, tempos, percentil):
+        if len(tempos) < 2:
+            return round(tempos[0], 1) if tempos else None
+        return round(statistics.quantiles(tempos, n=100)[percentil - 1], 1)
+
+    def commit_atual(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def comparar(self, anterior, atual):
+        self.stdout.write(f"\n📈 Comparação com {anterior.get('commit') or 'execução anterior'}")
+        for conjunto, dados in atual['conjuntos'].items():
+            antes = anterior['conjuntos'].get(conjunto)
+            if antes is None:
+                self.stdout.write(self.style.WARNING(f'   ⚠️  Conjunto {conjunto} ausente na execução anterior'))
+                continue
+            self.stdout.write(f'\n   Conjunto {conjunto}            p50 antes → depois        consultas')
+            for nome, depois in dados['rotas'].items():
+                if nome not in antes['rotas'] or not depois['p50_ms']:
+                    continue
+                base = antes['rotas'][nome]
+                variacao = depois['p50_ms'] / base['p50_ms'] if base['p50_ms'] else 1
+                linha = (f"   {nome:<28} {base['p50_ms']:>8} → {depois['p50_ms']:<8} ({variacao:.2f}x)  "
+                         f"{base['consultas']:>3} → {depois['consultas']}")
+                if variacao > 1.2 or depois['consultas'] > base['consultas']:
+                    self.stdout.write(self.style.WARNING(linha))
+                else:
+                    self.stdout.write(linha)
@@ -0,0 +1,64 @@
+import statistics
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from core.busca import buscar_clientes
+from core.models import Cliente
+
+
+class Command(BaseCommand):
+    help = 'Compare the client search against the previous icontains search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clientes', type=int, default=1_000_000, help='Target number of clients (default: 1000000)')
+        parser.add_argument('--popular', action='store_true', help='Create clients with populate_database --bulk until --clientes is reached')
+        parser.add_argument('--repeticoes', type=int, default=5, help='Runs per query (default: 5)')
+        parser.add_argument('--explain', action='store_true', help='Print the EXPLAIN plan of each query')
+
+    def handle(self, *args, **options):
+        if options['popular']:
+            faltantes = options['clientes'] - Cliente.objects.count()
+            if faltantes > 0:
+                call_command(
+                    'populate_database', bulk=True, clientes=faltantes, correspondencias=0,
+                    seed=options['clientes'], stdout=self.stdout
+                )
+
+        cliente = Cliente.objects.order_by('id').first()
+        if cliente is None:
+            raise CommandError('Nenhum cliente encontrado. Rode com --popular ou populate_database antes.')
+
+        total = Cliente.objects.count()
+        self.stdout.write(f'📊 {total} clientes em {connection.vendor}')
+        if total < options['clientes']:
+            self.stdout.write(self.style.WARNING(f'⚠️  Menos clientes que o alvo de {options["clientes"]}.'))
+
+        termos = [
+            ('Parte do nome', cliente.nome.split()[-1][:5]),
+            ('Parte do e-mail', cliente.email.split('@')[0]),
+            ('Documento formatado', cliente.documento_formatado),
+            ('Documento só dígitos', ''.join(filter(str.isdigit, cliente.documento))),
+            ('Início do documento', cliente.documento_formatado[:7]),
+        ]
+
+        for titulo, termo in termos:
+            anterior = Cliente.objects.filter(
+                Q(nome__icontains=termo) | Q(documento__icontains=termo) | Q(email__icontains=termo)
+            ).order_by('nome')[:20]
+            atual = buscar_clientes(Cliente.objects.all(), termo)[:20]
+
+            self.stdout.write(f'\n▶ {titulo}: {termo!r}')
+            for rotulo, queryset in (('icontains', anterior), ('busca', atual)):
+                tempos = []
+                for _ in range(options['repeticoes']):
+                    inicio = time.perf_counter()
+                    encontrados = len(list(queryset.all()))
+                    tempos.append((time.perf_counter() - inicio) * 1000)
+                self.stdout.write(
+                    f'   • {rotulo:<10} {statistics.median(tempos):8.1f} ms (mediana) - {encontrados} resultado(s)'
+                )
+                if options['explain']:
+                    self.stdout.write(queryset.explain())
@@ -0,0 +1,148 @@
+import json
+import statistics
+import threading
+import time
+from http.client import HTTPConnection, HTTPSConnection
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+ROTAS = [
+    '/api/dashboard/',
+    '/api/clientes/',
+    '/api/caixas-postais/',
+    '/api/correspondencias/',
+    '/api/correspondencias/pendentes/',
+    '/api/contratos/',
+]
+
+
+class Command(BaseCommand):
+    help = 'Load test a running backend (runserver or gunicorn) and report requests per second'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://localhost:8000', help='Base URL of the running server')
+        parser.add_argument('--usuario', help='Username used to obtain a JWT')
+        parser.add_argument('--senha', help='Password used to obtain a JWT')
+        parser.add_argument('--token', help='Existing JWT access token (instead of --usuario/--senha)')
+        parser.add_argument('--concorrencia', type=int, default=16, help='Concurrent clients (default: 16)')
+        parser.add_argument('--duracao', type=float, default=15, help='Seconds per run (default: 15)')
+        parser.add_argument('--rota', action='append', dest='rotas', help='Route to hit (repeatable)')
+        parser.add_argument('--saida', help='Write the results to this JSON file')
+        parser.add_argument('--comparar', help='JSON file from a previous run to compare against')
+
+    def handle(self, *args, **options):
+        self.base = urlsplit(options['url'])
+        token = options['token'] or self.obter_token(options['usuario'], options['senha'])
+        rotas = options['rotas'] or ROTAS
+
+        self.stdout.write(
+            f"🚀 {options['concorrencia']} clientes por {options['duracao']:.0f}s contra {options['url']}..."
+        )
+        latencias, erros, total = self.executar(rotas, token, options['concorrencia'], options['duracao'])
+
+        resultado = {
+            'url': options['url'],
+            'concorrencia': options['concorrencia'],
+            'requisicoes_por_segundo': sum(len(tempos) for tempos in latencias.values()) / total,
+            'erros': erros,
+            'rotas': {
+                rota: {
+                    'requisicoes': len(tempos),
+                    'p50_ms': self.percentil(tempos, 50),
+                    'p95_ms': self.percentil(tempos, 95),
+                }
+                for rota, tempos in latencias.items()
+            },
+        }
+        self.relatorio(resultado)
+
+        if options['comparar']:
+            with open(options['comparar']) as arquivo:
+                anterior = json.load(arquivo)
+            ganho = resultado['requisicoes_por_segundo'] / anterior['requisicoes_por_segundo']
+            self.stdout.write(self.style.SUCCESS(
+                f"\n📈 Antes: {anterior['requisicoes_por_segundo']:,.1f} req/s ({anterior['url']}) | "
+                f"depois: {resultado['requisicoes_por_segundo']:,.1f} req/s ({ganho:.1f}x)"
+            ))
+        if options['saida']:
+            with open(options['saida'], 'w') as arquivo:
+                json.dump(resultado, arquivo, indent=2)
+            self.stdout.write(f"💾 Resultado salvo em {options['saida']}")
+
+    def conectar(self):
+        classe = HTTPSConnection if self.base.scheme == 'https' else HTTPConnection
+        return classe(self.base.netloc, timeout=30)
+
+    def obter_token(self, usuario, senha):
+        if not usuario or not senha:
+            raise CommandError('Informe --token ou --usuario e --senha.')
+        conexao = self.conectar()
+        conexao.request(
+            'POST', f'{self.base.path.rstrip("/")}/api/auth/login/',
+            body=json.dumps({'username': usuario, 'password': senha}),
+            headers={'Content-Type': 'application/json'},
+        )
+        resposta = conexao.getresponse()
+        corpo = resposta.read()
+        if resposta.status != 200:
+            raise CommandError(f'Falha no login ({resposta.status}): {corpo[:200]!r}')
+        return json.loads(corpo)['access']
+
+    def executar(self, rotas, token, concorrencia, duracao):
+        latencias = {rota: [] for rota in rotas}
+        erros = {}
+        trava = threading.Lock()
+        cabecalhos = {'Authorization': f'Bearer {token}', 'Accept-Encoding': 'gzip'}
+        prefixo = self.base.path.rstrip('/')
+        fim = time.perf_counter() + duracao
+
+        def cliente(deslocamento):
+            # Cada cliente mantém sua conexão aberta (keep-alive), como um navegador
+            conexao = self.conectar()
+            indice = deslocamento
+            while time.perf_counter() < fim:
+                rota = rotas[indice % len(rotas)]
+                indice += 1
+                inicio = time.perf_counter()
+                try:
+                    conexao.request('GET', prefixo + rota, headers=cabecalhos)
+                    resposta = conexao.getresponse()
+                    resposta.read()
+                    status = resposta.status
+                except OSError as exc:
+                    conexao.close()
+                    conexao = self.conectar()
+                    status = type(exc).__name__
+                tempo = (time.perf_counter() - inicio) * 1000
+                with trava:
+                    if status == 200:
+                        latencias[rota].append(tempo)
+                    else:
+                        erros[str(status)] = erros.get(str(status), 0) + 1
+            conexao.close()
+
+        inicio = time.perf_counter()
+        threads = [threading.Thread(target=cliente, args=(numero,)) for numero in range(concorrencia)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencias, erros, time.perf_counter() - inicio
+
+    def percentil(self, tempos, percentil):
+        if len(tempos) < 2:
+            return round(tempos[0], 1) if tempos else None
+        return round(statistics.quantiles(tempos, n=100)[percentil - 1], 1)
+
+    def relatorio(self, resultado):
+        self.stdout.write('\n📊 Rota                                   req      p50 (ms)   p95 (ms)')
+        for rota, dados in resultado['rotas'].items():
+            self.stdout.write(
+                f"   {rota:<36} {dados['requisicoes']:>6}   {dados['p50_ms'] or 0:>9}   {dados['p95_ms'] or 0:>8}"
+            )
+        if resultado['erros']:
+            self.stdout.write(self.style.WARNING(f"⚠️  Erros: {resultado['erros']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ {resultado['requisicoes_por_segundo']:,.1f} requisições/s"
+        ))
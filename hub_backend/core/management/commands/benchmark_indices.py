@@ -0,0 +1,122 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from core.contadores import recalcular_contadores
+from core.models import CaixaPostal, Correspondencia
+from core.views import CorrespondenciaViewSet
+
+INDICES = [index.name for index in Correspondencia._meta.indexes]
+
+CONSULTAS = [
+    ('Lista padrão', {}),
+    ('Filtro por status', {'status': 'RETIRADA'}),
+    ('Filtro por tipo', {'tipo': 'SEDEX'}),
+    ('Filtro por caixa e status', {'caixa_id': None, 'status': 'RECEBIDA'}),
+    ('Filtro por período', {'data_inicio': None, 'data_fim': None}),
+    ('Pendentes', {'status': 'RECEBIDA'}),
+]
+
+GERAR_CORRESPONDENCIAS_SQL = """
+    INSERT INTO core_correspondencia (
+        id, caixa_postal_id, data_recebimento, descricao, tipo, status, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        caixas.ids[1 + floor(random() * array_length(caixas.ids, 1))::int],
+        now() - random() * interval '365 days',
+        'Correspondência de benchmark',
+        (ARRAY['CARTA', 'PACOTE', 'AR', 'SEDEX', 'PAC', 'ENCOMENDA', 'DOCUMENTO', 'OUTRO'])[1 + floor(random() * 8)::int],
+        (ARRAY['RECEBIDA', 'RETIRADA', 'RETIRADA', 'RETIRADA', 'DEVOLVIDA'])[1 + floor(random() * 5)::int],
+        now(),
+        now()
+    FROM generate_series(1, %s), (SELECT array_agg(id) AS ids FROM core_caixapostal) caixas
+"""
+
+
+class Command(BaseCommand):
+    help = 'Show the EXPLAIN plans of the correspondencias list queries with and without the composite indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=5_000_000, help='Target number of correspondencias (default: 5000000)')
+        parser.add_argument('--popular', action='store_true', help='Insert synthetic correspondencias until --linhas is reached (PostgreSQL only)')
+        parser.add_argument('--analyze', action='store_true', help='Use EXPLAIN ANALYZE (PostgreSQL only)')
+
+    def handle(self, *args, **options):
+        postgres = connection.vendor == 'postgresql'
+
+        if (options['popular'] or options['analyze']) and not postgres:
+            raise CommandError('--popular e --analyze requerem PostgreSQL.')
+        if options['popular']:
+            self.popular(options['linhas'])
+
+        caixa = CaixaPostal.objects.order_by('numero').first()
+        if caixa is None:
+            raise CommandError('Nenhuma caixa postal encontrada. Rode populate_database antes.')
+
+        hoje = timezone.localdate()
+        valores = {
+            'caixa_id': str(caixa.id),
+            'data_inicio': hoje.replace(day=1).isoformat(),
+            'data_fim': hoje.isoformat(),
+        }
+
+        total = Correspondencia.objects.count()
+        self.stdout.write(f'📊 {total} correspondências em {connection.vendor}')
+
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(self.style.SUCCESS('COM ÍNDICES'))
+        self.stdout.write('=' * 60)
+        self.explicar(valores, options['analyze'])
+
+        if not postgres:
+            self.stdout.write(self.style.WARNING('\n⚠️  Comparação sem índices disponível apenas no PostgreSQL.'))
+            return
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for nome in INDICES:
+                    cursor.execute(f'DROP INDEX {connection.ops.quote_name(nome)}')
+
+            self.stdout.write('\n' + '=' * 60)
+            self.stdout.write(self.style.WARNING('SEM ÍNDICES'))
+            self.stdout.write('=' * 60)
+            self.explicar(valores, options['analyze'])
+
+            transaction.set_rollback(True)
+
+    def popular(self, linhas):
+        faltantes = linhas - Correspondencia.objects.count()
+        if faltantes <= 0:
+            return
+
+        self.stdout.write(f'🚀 Inserindo {faltantes} correspondências sintéticas...')
+        lote = 500_000
+        with connection.cursor() as cursor:
+            while faltantes > 0:
+                quantidade = min(lote, faltantes)
+                cursor.execute(GERAR_CORRESPONDENCIAS_SQL, [quantidade])
+                faltantes -= quantidade
+                self.stdout.write(f'   • faltam {faltantes}')
+            cursor.execute('ANALYZE core_correspondencia')
+
+        recalcular_contadores()
+        self.stdout.write(self.style.SUCCESS('✅ Carga concluída!'))
+
+    def explicar(self, valores, analyze):
+        factory = APIRequestFactory()
+        for titulo, parametros in CONSULTAS:
+            parametros = {chave: valor or valores[chave] for chave, valor in parametros.items()}
+            view = CorrespondenciaViewSet(
+                request=Request(factory.get('/', parametros)),
+                action='list',
+                format_kwarg=None,
+            )
+            queryset = view.filter_queryset(view.get_queryset())[:20]
+
+            self.stdout.write(f'\n▶ {titulo} {parametros}')
+            if analyze:
+                self.stdout.write(queryset.explain(analyze=True, buffers=True))
+            else:
+                self.stdout.write(queryset.explain())
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from core.views import CaixaPostalViewSet, ClienteViewSet, ContratoViewSet, CorrespondenciaViewSet
+
+VIEWSETS = [
+    ('Clientes', ClienteViewSet),
+    ('Caixas postais', CaixaPostalViewSet),
+    ('Correspondências', CorrespondenciaViewSet),
+    ('Contratos', ContratoViewSet),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare rows per second of the list serializers against the .values() fast path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=1000, help='Rows per page (default: 1000)')
+        parser.add_argument('--repeticoes', type=int, default=5, help='Runs per measurement (default: 5)')
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        factory = APIRequestFactory()
+
+        for titulo, viewset in VIEWSETS:
+            view = viewset(request=Request(factory.get('/')), action='list', format_kwarg=None)
+            queryset = view.filter_queryset(view.get_queryset())[:options['linhas']]
+            serializer_class = view.get_serializer_class()
+
+            def com_serializer():
+                return renderer.render(serializer_class(list(queryset.all()), many=True).data)
+
+            def com_leitor():
+                return renderer.render(view.leitor.ler(view.leitor.valores(queryset.all())))
+
+            esperado, obtido = com_serializer(), com_leitor()
+            if not esperado:
+                raise CommandError('Sem dados para medir. Rode populate_database antes.')
+            if esperado != obtido:
+                raise CommandError(f'{titulo}: o JSON da leitura rápida difere do serializer.')
+
+            linhas = len(queryset)
+            self.stdout.write(f'\n▶ {titulo} ({linhas} linhas, JSON idêntico)')
+            resultados = {}
+            for rotulo, funcao in (('serializer', com_serializer), ('values()', com_leitor)):
+                melhor = min(self.medir(funcao) for _ in range(options['repeticoes']))
+                resultados[rotulo] = linhas / melhor
+                self.stdout.write(f'   • {rotulo:<11} {resultados[rotulo]:>12,.0f} linhas/s')
+            self.stdout.write(self.style.SUCCESS(
+                f"   ✅ {resultados['values()'] / resultados['serializer']:.1f}x mais rápido"
+            ))
+
+    def medir(self, funcao):
+        inicio = time.perf_counter()
+        funcao()
+        return time.perf_counter() - inicio
@@ -1,31 +1,63 @@
 from django.core.management.base import BaseCommand
-from core.models import Cliente, CaixaPostal, Correspondencia, Contrato
+from django.db import connection, transaction
+from core import geradores
+from core.contadores import recalcular_contadores
+from core.dashboard import invalidar_estatisticas
+from core.filters import intervalo_do_dia
+from core.models import Cliente, CaixaPostal, ContadorCaixaPostal, Correspondencia, Contrato, Exclusao
+from core.numeracao import formatar_numero_caixa, reservar_numeros_caixa
 from django.utils import timezone
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta, date
+import io
+import multiprocessing
 import random
+import time
+import uuid
 from decimal import Decimal
 from faker import Faker
 import pytz
 
+PARTE_CLIENTES = 5000
+PARTE_CAIXAS = 500
+
+
 class Command(BaseCommand):
     help = 'Create comprehensive sample data for testing'
 
     def add_arguments(self, parser):
         parser.add_argument('--clear', action='store_true', help='Clear all existing data before creating new data')
         parser.add_argument('--clientes', type=int, default=500, help='Number of clients to create (default: 500)')
+        parser.add_argument('--bulk', action='store_true', help='Generate rows in memory and insert them in batches (bypasses signals)')
+        parser.add_argument('--correspondencias', type=int, default=None, help='Total correspondencias to create in bulk mode (default: 1-25 per client)')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible bulk datasets')
+        parser.add_argument('--workers', type=int, default=1, help='Processes used to generate rows in bulk mode (default: 1)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT batch in bulk mode (default: 5000)')
+        parser.add_argument('--recriar-indices', action='store_true', help='Drop the correspondencia secondary indexes and foreign key during a bulk load and rebuild them at the end (PostgreSQL only)')
 
     def handle(self, *args, **options):
         fake = Faker('pt_BR')
         
-        if options['clear']:
+        if options['clear'] and options['bulk']:
+            self.stdout.write('🗑️  Limpando dados existentes...')
+            self.limpar_em_lote()
+            self.stdout.write(self.style.SUCCESS('✅ Dados limpos!'))
+        elif options['clear']:
             self.stdout.write('🗑️  Limpando dados existentes...')
             Correspondencia.objects.all().delete()
             Contrato.objects.all().delete()
             CaixaPostal.objects.all().delete()
             Cliente.objects.all().delete()
+            Exclusao.objects.all().delete()
             self.stdout.write(self.style.SUCCESS('✅ Dados limpos!'))
 
         num_clientes = options['clientes']
+
+        if options['bulk']:
+            self.popular_em_lote(options)
+            self.relatorio()
+            return
+
         self.stdout.write(f'🚀 Criando {num_clientes} clientes com dados completos...')
 
         TIPOS_CORRESPONDENCIA = ['CARTA', 'PACOTE', 'AR', 'SEDEX', 'PAC', 'ENCOMENDA', 'DOCUMENTO', 'OUTRO']
@@ -287,7 +319,181 @@ class Command(BaseCommand):
                 data_recebimento=agora_brasilia - timedelta(days=1)
             )
 
-        # Relatório final
+        self.relatorio()
+
+    def popular_em_lote(self, options):
+        seed = options['seed'] if options['seed'] is not None else random.randrange(2 ** 32)
+        workers = max(1, options['workers'])
+        batch_size = options['batch_size']
+        num_clientes = options['clientes']
+
+        agora = timezone.now()
+        hoje = timezone.localdate()
+        inicio = Cliente.objects.count() + 1
+
+        self.stdout.write(f'🚀 Modo bulk: {num_clientes} clientes, semente {seed}, {workers} processo(s)...')
+
+        partes = range(0, num_clientes, PARTE_CLIENTES)
+        tarefas_clientes = [
+            (inicio + offset, min(PARTE_CLIENTES, num_clientes - offset), seed + indice)
+            for indice, offset in enumerate(partes)
+        ]
+        clientes = [
+            cliente
+            for parte in self.executar(geradores.gerar_clientes, tarefas_clientes, workers)
+            for cliente in parte
+        ]
+
+        quantidades = geradores.distribuir_correspondencias(clientes, options['correspondencias'], seed)
+        caixas = [
+            {'id': uuid.uuid5(cliente['id'], 'caixa_postal'), 'cliente': cliente, 'quantidade': quantidade}
+            for cliente, quantidade in zip(clientes, quantidades)
+        ]
+        contratos = geradores.gerar_contratos(clientes, hoje, seed)
+
+        with transaction.atomic():
+            t0 = time.perf_counter()
+            Cliente.objects.bulk_create(
+                [Cliente(**cliente) for cliente in clientes], batch_size=batch_size
+            )
+
+            numeros = reservar_numeros_caixa(len(caixas))
+            CaixaPostal.objects.bulk_create(
+                [
+                    CaixaPostal(
+                        id=caixa['id'],
+                        numero=formatar_numero_caixa(numeros[indice]),
+                        cliente_id=caixa['cliente']['id'],
+                        ativa=caixa['cliente']['ativo'],
+                        observacoes=f"Caixa postal - {caixa['cliente']['tipo']} - {caixa['cliente']['nome'][:30]}",
+                    )
+                    for indice, caixa in enumerate(caixas)
+                ],
+                batch_size=batch_size
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {len(clientes)} clientes e caixas postais criados em {time.perf_counter() - t0:.1f}s!'
+            ))
+
+            t0 = time.perf_counter()
+            tarefas = []
+            for offset in range(0, len(caixas), PARTE_CAIXAS):
+                parte = [
+                    (caixa['id'], caixa['cliente']['tipo'], caixa['cliente']['nome'],
+                     caixa['cliente']['documento'], caixa['quantidade'])
+                    for caixa in caixas[offset:offset + PARTE_CAIXAS]
+                ]
+                tarefas.append((parte, agora, seed + offset))
+
+            postgres = connection.vendor == 'postgresql'
+            comandos_indices = []
+            if postgres and options['recriar_indices']:
+                comandos_indices = self.suspender_indices()
+
+            total = 0
+            if postgres:
+                for texto, quantidade in self.executar(geradores.gerar_correspondencias_csv, tarefas, workers):
+                    self.copiar_correspondencias(texto)
+                    total += quantidade
+            else:
+                for linhas in self.executar(geradores.gerar_correspondencias, tarefas, workers):
+                    for offset in range(0, len(linhas), batch_size):
+                        self.inserir_correspondencias(linhas[offset:offset + batch_size])
+                    total += len(linhas)
+
+            if comandos_indices:
+                self.restaurar_indices(comandos_indices)
+            duracao = time.perf_counter() - t0
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {total} correspondências criadas em {duracao:.1f}s ({total / max(duracao, 1e-9):,.0f}/s)!'
+            ))
+
+            Contrato.objects.bulk_create(
+                [Contrato(**contrato) for contrato in contratos], batch_size=batch_size
+            )
+            self.stdout.write(self.style.SUCCESS(f'✅ {len(contratos)} contratos criados!'))
+
+            recalcular_contadores()
+        invalidar_estatisticas()
+
+    def executar(self, funcao, tarefas, workers):
+        if workers == 1 or len(tarefas) == 1:
+            for tarefa in tarefas:
+                yield funcao(*tarefa)
+            return
+
+        contexto = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=contexto) as executor:
+            yield from executor.map(funcao, *zip(*tarefas))
+
+    def limpar_em_lote(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            for model in (Correspondencia, Contrato, ContadorCaixaPostal, CaixaPostal, Cliente, Exclusao):
+                cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+        invalidar_estatisticas()
+
+    def suspender_indices(self):
+        """
+        Remove os índices secundários e a FK de core_correspondencia (PostgreSQL),
+        devolvendo os comandos para recriá-los depois da carga.
+        """
+        with connection.cursor() as cursor:
+            # As FKs do Django são DEFERRABLE; o ALTER TABLE exige que não haja checagens pendentes
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute("""
+                SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid)
+                FROM pg_index
+                WHERE indrelid = 'core_correspondencia'::regclass AND NOT indisprimary AND NOT indisunique
+            """)
+            indices = cursor.fetchall()
+            cursor.execute("""
+                SELECT conname, pg_get_constraintdef(oid)
+                FROM pg_constraint
+                WHERE conrelid = 'core_correspondencia'::regclass AND contype = 'f'
+            """)
+            restricoes = cursor.fetchall()
+
+            for nome, _ in restricoes:
+                cursor.execute(f'ALTER TABLE core_correspondencia DROP CONSTRAINT {connection.ops.quote_name(nome)}')
+            for nome, _ in indices:
+                cursor.execute(f'DROP INDEX {nome}')
+
+        return [definicao for _, definicao in indices] + [
+            f'ALTER TABLE core_correspondencia ADD CONSTRAINT {connection.ops.quote_name(nome)} {definicao}'
+            for nome, definicao in restricoes
+        ]
+
+    def restaurar_indices(self, comandos):
+        self.stdout.write('🔧 Recriando índices de correspondências...')
+        with connection.cursor() as cursor:
+            for comando in comandos:
+                cursor.execute(comando)
+            cursor.execute('ANALYZE core_correspondencia')
+
+    def inserir_correspondencias(self, linhas):
+        campos = [Correspondencia._meta.get_field(coluna) for coluna in geradores.COLUNAS_CORRESPONDENCIA]
+        colunas = ', '.join(connection.ops.quote_name(campo.column) for campo in campos)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO core_correspondencia ({colunas}) VALUES ({', '.join(['%s'] * len(campos))})",
+                [
+                    [campo.get_db_prep_save(valor, connection) for campo, valor in zip(campos, linha)]
+                    for linha in linhas
+                ]
+            )
+
+    def copiar_correspondencias(self, texto):
+        colunas = ', '.join(geradores.COLUNAS_CORRESPONDENCIA)
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(
+                f"COPY core_correspondencia ({colunas}) FROM STDIN WITH (FORMAT csv)",
+                io.StringIO(texto)
+            )
+
+    def relatorio(self):
+        agora_brasilia = timezone.now().astimezone(pytz.timezone('America/Sao_Paulo'))
+        inicio_hoje, fim_hoje = intervalo_do_dia(agora_brasilia.date())
+
         total_clientes = Cliente.objects.count()
         clientes_pf = Cliente.objects.filter(tipo='PF').count()
         clientes_pj = Cliente.objects.filter(tipo='PJ').count()
@@ -298,7 +504,7 @@ class Command(BaseCommand):
         
         total_correspondencias = Correspondencia.objects.count()
         correspondencias_pendentes = Correspondencia.objects.filter(status='RECEBIDA').count()
-        correspondencias_hoje = Correspondencia.objects.filter(data_recebimento__date=data_atual).count()
+        correspondencias_hoje = Correspondencia.objects.filter(data_recebimento__gte=inicio_hoje, data_recebimento__lt=fim_hoje).count()
         correspondencias_semana = Correspondencia.objects.filter(data_recebimento__gte=agora_brasilia - timedelta(days=7)).count()
         
         total_contratos = Contrato.objects.count()
@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import Exclusao
+from core.sincronizacao import inicio_retencao
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete sync tombstones (core.Exclusao) older than SINCRONIZACAO_RETENCAO_DIAS in small batches. '
+        'Clients whose watermark is older than that get 410 and must run a full resync.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=5000, help='Rows deleted per batch (default: 5000)')
+        parser.add_argument('--pausa', type=float, default=0.0, help='Seconds to sleep between batches (default: 0)')
+
+    def handle(self, *args, **options):
+        limite = inicio_retencao()
+        antigas = Exclusao.objects.filter(excluido_em__lt=limite).order_by('id')
+
+        self.stdout.write(
+            f'🧹 Removendo exclusões anteriores a {timezone.localtime(limite):%d/%m/%Y %H:%M} '
+            f'({settings.SINCRONIZACAO_RETENCAO_DIAS} dias de retenção)...'
+        )
+        ultimo_id = 0
+        total = 0
+        while True:
+            # As exclusões são gravadas em ordem de data, então as antigas ficam no começo da chave primária
+            ids = list(antigas.filter(id__gt=ultimo_id).values_list('id', flat=True)[:options['lote']])
+            if not ids:
+                break
+            ultimo_id = ids[-1]
+
+            removidas, _ = Exclusao.objects.filter(id__in=ids).delete()
+            total += removidas
+            self.stdout.write(f'   • {total:,} exclusões removidas')
+            if options['pausa']:
+                time.sleep(options['pausa'])
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {total:,} exclusões antigas removidas'))
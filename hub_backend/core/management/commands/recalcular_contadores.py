@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from core.contadores import recalcular_contadores
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized per-caixa counters and report drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--caixa', action='append', dest='caixas', help='Caixa postal id to rebuild (repeatable; default: all)')
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔄 Recalculando contadores das caixas postais...')
+
+        divergencias = recalcular_contadores(options['caixas'])
+
+        if not divergencias:
+            self.stdout.write(self.style.SUCCESS('✅ Nenhuma divergência encontrada!'))
+            return
+
+        self.stdout.write(self.style.WARNING(f'⚠️  {len(divergencias)} caixas com contadores divergentes corrigidas:'))
+        for divergencia in divergencias:
+            gravado = divergencia['gravado']
+            real = divergencia['real']
+            if gravado is None:
+                self.stdout.write(f'   • {divergencia["caixa_postal_id"]}: contador ausente')
+                continue
+            campos = ', '.join(
+                f'{campo} {gravado[campo]} → {valor}'
+                for campo, valor in real.items()
+                if gravado[campo] != valor
+            )
+            self.stdout.write(f'   • {divergencia["caixa_postal_id"]}: {campos}')
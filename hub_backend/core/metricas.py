@@ -0,0 +1,237 @@
+"""
+Métricas de desempenho por endpoint, expostas no formato texto do Prometheus.
+
+Cada requisição ganha uma ``Medicao`` guardada em uma ``ContextVar``. Um
+``execute_wrapper`` instalado em todas as conexões soma nela as consultas e o
+tempo de banco, inclusive das consultas feitas em threads do ``sync_to_async``,
+que herdam o contexto da requisição.
+
+Os valores ficam em memória no processo; com vários workers do gunicorn, cada
+worker expõe apenas as suas próprias requisições.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+FAIXAS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+FAIXAS_CONSULTAS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+_medicao_atual = ContextVar('medicao_atual', default=None)
+
+
+class Medicao:
+    """
+    Consultas, tempo de banco e tempo de serialização de uma requisição.
+    """
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.tempo_banco = 0.0
+        self.tempo_serializacao = 0.0
+        self._trava = threading.Lock()
+
+    def registrar_consulta(self, duracao):
+        with self._trava:
+            self.consultas += 1
+            self.tempo_banco += duracao
+
+    def registrar_serializacao(self, duracao):
+        with self._trava:
+            self.tempo_serializacao += duracao
+
+    @property
+    def duracao(self):
+        return time.perf_counter() - self.inicio
+
+
+def _registrar_consulta(execute, sql, params, many, context):
+    medicao = _medicao_atual.get()
+    if medicao is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicao.registrar_consulta(time.perf_counter() - inicio)
+
+
+def instalar(conexao):
+    if _registrar_consulta not in conexao.execute_wrappers:
+        conexao.execute_wrappers.append(_registrar_consulta)
+
+
+@receiver(connection_created)
+def instalar_na_conexao(sender, connection, **kwargs):
+    instalar(connection)
+
+
+@contextmanager
+def medir():
+    """
+    Mede as consultas do bloco, inclusive as feitas em outras threads do mesmo contexto.
+    """
+    for conexao in connections.all(initialized_only=True):
+        instalar(conexao)
+    medicao = Medicao()
+    token = _medicao_atual.set(medicao)
+    try:
+        yield medicao
+    finally:
+        _medicao_atual.reset(token)
+
+
+@contextmanager
+def serializando():
+    """
+    Soma o tempo do bloco ao tempo de serialização da requisição em andamento.
+    """
+    medicao = _medicao_atual.get()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        if medicao is not None:
+            medicao.registrar_serializacao(time.perf_counter() - inicio)
+
+
+def nome_endpoint(request):
+    """
+    Identifica a view resolvida: ``ClienteViewSet.list``, ``DashboardView``, ``admin:index``...
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'nao_resolvido'
+    view = getattr(match.func, 'cls', None) or getattr(match.func, 'view_class', None)
+    if view is None:
+        return match.view_name or match._func_path
+    acoes = getattr(match.func, 'actions', None)
+    if acoes:
+        return f'{view.__name__}.{acoes.get(request.method.lower(), request.method.lower())}'
+    return view.__name__
+
+
+def orcamento(endpoint):
+    return settings.ORCAMENTO_CONSULTAS.get(endpoint, settings.ORCAMENTO_CONSULTAS_PADRAO)
+
+
+class _Histograma:
+    def __init__(self, faixas):
+        self.faixas = faixas
+        self.contagens = [0] * len(faixas)
+        self.soma = 0
+        self.total = 0
+
+    def observar(self, valor):
+        for indice, limite in enumerate(self.faixas):
+            if valor <= limite:
+                self.contagens[indice] += 1
+        self.soma += valor
+        self.total += 1
+
+
+class Registro:
+    """
+    Acumula as medições por endpoint e as formata para o Prometheus.
+    """
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.limpar()
+
+    def limpar(self):
+        with self._trava:
+            self.requisicoes = defaultdict(int)
+            self.latencia = defaultdict(lambda: _Histograma(FAIXAS_LATENCIA))
+            self.consultas = defaultdict(lambda: _Histograma(FAIXAS_CONSULTAS))
+            self.tempo_banco = defaultdict(float)
+            self.tempo_serializacao = defaultdict(float)
+            self.excessos = defaultdict(int)
+
+    def registrar(self, endpoint, metodo, status, medicao, duracao):
+        with self._trava:
+            self.requisicoes[(endpoint, metodo, str(status))] += 1
+            self.latencia[endpoint].observar(duracao)
+            self.consultas[endpoint].observar(medicao.consultas)
+            self.tempo_banco[endpoint] += medicao.tempo_banco
+            self.tempo_serializacao[endpoint] += medicao.tempo_serializacao
+
+            limite = orcamento(endpoint)
+            excedeu = medicao.consultas > limite
+            if excedeu:
+                self.excessos[endpoint] += 1
+
+        if excedeu:
+            logger.warning(
+                '%s excedeu o orçamento de consultas: %d de %d (%.1f ms no banco)',
+                endpoint, medicao.consultas, limite, medicao.tempo_banco * 1000
+            )
+
+    def exportar(self):
+        linhas = []
+
+        def metrica(nome, tipo, ajuda, amostras):
+            linhas.append(f'# HELP {nome} {ajuda}')
+            linhas.append(f'# TYPE {nome} {tipo}')
+            for sufixo, rotulos, valor in amostras:
+                texto = ','.join(f'{chave}="{_escapar(v)}"' for chave, v in rotulos.items())
+                linhas.append(f'{nome}{sufixo}{{{texto}}} {_numero(valor)}')
+
+        def histograma(histogramas):
+            for endpoint, h in sorted(histogramas.items()):
+                for limite, quantidade in zip(h.faixas, h.contagens):
+                    yield '_bucket', {'endpoint': endpoint, 'le': _numero(limite)}, quantidade
+                yield '_bucket', {'endpoint': endpoint, 'le': '+Inf'}, h.total
+                yield '_sum', {'endpoint': endpoint}, h.soma
+                yield '_count', {'endpoint': endpoint}, h.total
+
+        with self._trava:
+            metrica('hub_requisicoes_total', 'counter', 'Requisições atendidas.', [
+                ('', {'endpoint': e, 'metodo': m, 'status': s}, valor)
+                for (e, m, s), valor in sorted(self.requisicoes.items())
+            ])
+            metrica('hub_latencia_segundos', 'histogram', 'Latência total da requisição.',
+                    histograma(self.latencia))
+            metrica('hub_consultas_por_requisicao', 'histogram', 'Consultas SQL por requisição.',
+                    histograma(self.consultas))
+            metrica('hub_banco_segundos_total', 'counter', 'Tempo gasto em consultas SQL.', [
+                ('', {'endpoint': e}, valor) for e, valor in sorted(self.tempo_banco.items())
+            ])
+            metrica('hub_serializacao_segundos_total', 'counter',
+                    'Tempo gasto montando e renderizando a resposta.', [
+                ('', {'endpoint': e}, valor) for e, valor in sorted(self.tempo_serializacao.items())
+            ])
+            metrica('hub_orcamento_consultas_excedido_total', 'counter',
+                    'Requisições acima do orçamento de consultas.', [
+                        ('', {'endpoint': e}, valor) for e, valor in sorted(self.excessos.items())
+                    ])
+        return '\n'.join(linhas) + '\n'
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+registro = Registro()
+
+
+def metricas(request):
+    """
+    Endpoint de coleta do Prometheus, acessível apenas pelos IPs de ``METRICAS_IPS_PERMITIDOS``.
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.METRICAS_IPS_PERMITIDOS:
+        raise Http404
+    return HttpResponse(registro.exportar(), content_type='text/plain; version=0.0.4; charset=utf-8')
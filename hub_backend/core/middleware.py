@@ -0,0 +1,100 @@
+import re
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+from .metricas import medir, nome_endpoint, registro
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+re_aceita_brotli = re.compile(r'\bbr\b')
+
+
+class CompressaoMiddleware(GZipMiddleware):
+    """
+    Comprime as respostas com brotli quando o cliente aceita e o pacote ``brotli``
+    está instalado; caso contrário, usa o gzip do Django.
+    Respostas em streaming (exportações) continuam em gzip.
+    """
+    qualidade_brotli = 5
+
+    def process_response(self, request, response):
+        aceita = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if (
+            brotli is None
+            or response.streaming
+            or response.has_header('Content-Encoding')
+            or len(response.content) < 200
+            or not re_aceita_brotli.search(aceita)
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        comprimido = brotli.compress(response.content, quality=self.qualidade_brotli)
+        if len(comprimido) >= len(response.content):
+            return response
+
+        response.content = comprimido
+        response.headers['Content-Length'] = str(len(comprimido))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+class MetricasMiddleware:
+    """
+    Mede latência, consultas SQL, tempo de banco e tempo de serialização de cada
+    requisição e registra por view/ação resolvida (ver ``core.metricas``).
+    Deve ficar no topo de ``MIDDLEWARE`` para que a latência inclua os demais middlewares.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.METRICAS_ATIVAS:
+            return self.get_response(request)
+        with medir() as medicao:
+            request.medicao = medicao
+            response = self.get_response(request)
+        self.registrar(request, response, medicao)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICAS_ATIVAS:
+            return await self.get_response(request)
+        with medir() as medicao:
+            request.medicao = medicao
+            response = await self.get_response(request)
+        self.registrar(request, response, medicao)
+        return response
+
+    def process_template_response(self, request, response):
+        medicao = getattr(request, 'medicao', None)
+        if medicao is not None:
+            inicio = time.perf_counter()
+
+            def fim_da_renderizacao(response):
+                medicao.registrar_serializacao(time.perf_counter() - inicio)
+
+            response.add_post_render_callback(fim_da_renderizacao)
+        return response
+
+    def registrar(self, request, response, medicao):
+        registro.registrar(nome_endpoint(request), request.method, response.status_code,
+                           medicao, medicao.duracao)
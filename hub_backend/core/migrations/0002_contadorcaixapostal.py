@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:14
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+import django.db.models.deletion
+
+
+def preencher_contadores(apps, schema_editor):
+    CaixaPostal = apps.get_model('core', 'CaixaPostal')
+    ContadorCaixaPostal = apps.get_model('core', 'ContadorCaixaPostal')
+
+    caixas = CaixaPostal.objects.annotate(
+        total=Count('correspondencias'),
+        pendentes=Count('correspondencias', filter=Q(correspondencias__status='RECEBIDA')),
+        devolvidas=Count('correspondencias', filter=Q(correspondencias__status='DEVOLVIDA')),
+        ultimo_recebimento=Max('correspondencias__data_recebimento'),
+    ).values('id', 'total', 'pendentes', 'devolvidas', 'ultimo_recebimento')
+
+    ContadorCaixaPostal.objects.bulk_create(
+        [
+            ContadorCaixaPostal(
+                caixa_postal_id=caixa['id'],
+                total=caixa['total'],
+                pendentes=caixa['pendentes'],
+                devolvidas=caixa['devolvidas'],
+                ultimo_recebimento=caixa['ultimo_recebimento'],
+            )
+            for caixa in caixas.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorCaixaPostal',
+            fields=[
+                ('caixa_postal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='contador', serialize=False, to='core.caixapostal', verbose_name='Caixa Postal')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total de Correspondências')),
+                ('pendentes', models.PositiveIntegerField(default=0, verbose_name='Correspondências Pendentes')),
+                ('devolvidas', models.PositiveIntegerField(default=0, verbose_name='Correspondências Devolvidas')),
+                ('ultimo_recebimento', models.DateTimeField(blank=True, null=True, verbose_name='Último Recebimento')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Contador da Caixa Postal',
+                'verbose_name_plural': 'Contadores das Caixas Postais',
+            },
+        ),
+        migrations.RunPython(preencher_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_contadorcaixapostal'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='correspondencia',
+            index=models.Index(fields=['-data_recebimento', 'id'], name='corresp_data_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='correspondencia',
+            index=models.Index(fields=['status', 'data_recebimento'], name='corresp_status_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='correspondencia',
+            index=models.Index(fields=['caixa_postal', 'status', 'data_recebimento'], name='corresp_caixa_status_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='correspondencia',
+            index=models.Index(fields=['tipo', 'data_recebimento'], name='corresp_tipo_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='correspondencia',
+            index=models.Index(condition=models.Q(('status', 'RECEBIDA')), fields=['-data_recebimento'], name='corresp_pendentes_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:50
+
+from django.db import migrations, models
+
+SEQUENCIA_CAIXA_POSTAL = 'core_caixapostal_numero_seq'
+
+
+def maior_numero_caixa(CaixaPostal):
+    numeros = CaixaPostal.objects.filter(numero__regex=r'^\d+$').values_list('numero', flat=True)
+    return max((int(numero) for numero in numeros.iterator()), default=0)
+
+
+def criar_sequencia(apps, schema_editor):
+    CaixaPostal = apps.get_model('core', 'CaixaPostal')
+    SequenciaNumeracao = apps.get_model('core', 'SequenciaNumeracao')
+    ultimo = maior_numero_caixa(CaixaPostal)
+
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'CREATE SEQUENCE IF NOT EXISTS {SEQUENCIA_CAIXA_POSTAL} MINVALUE 1')
+        if ultimo:
+            schema_editor.execute('SELECT setval(%s, %s)', [SEQUENCIA_CAIXA_POSTAL, ultimo])
+        return
+
+    SequenciaNumeracao.objects.update_or_create(nome='caixa_postal', defaults={'ultimo_valor': ultimo})
+
+
+def remover_sequencia(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP SEQUENCE IF EXISTS {SEQUENCIA_CAIXA_POSTAL}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_correspondencia_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SequenciaNumeracao',
+            fields=[
+                ('nome', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Nome')),
+                ('ultimo_valor', models.BigIntegerField(default=0, verbose_name='Último Valor')),
+            ],
+            options={
+                'verbose_name': 'Sequência de Numeração',
+                'verbose_name_plural': 'Sequências de Numeração',
+            },
+        ),
+        migrations.RunPython(criar_sequencia, remover_sequencia),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:10
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+import django.db.models.functions.text
+
+import core.indices
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_sequencianumeracao'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=core.indices.GinIndexPostgres(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('nome'), name='gin_trgm_ops'
+                ),
+                name='cliente_nome_trgm_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=core.indices.GinIndexPostgres(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'
+                ),
+                name='cliente_email_trgm_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=core.indices.GinIndexPostgres(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Replace(
+                        django.db.models.functions.text.Replace(
+                            django.db.models.functions.text.Replace(
+                                'documento', django.db.models.Value('.'), django.db.models.Value('')
+                            ),
+                            django.db.models.Value('-'), django.db.models.Value('')
+                        ),
+                        django.db.models.Value('/'), django.db.models.Value('')
+                    ),
+                    name='gin_trgm_ops',
+                ),
+                name='cliente_documento_trgm_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:40
+
+from collections import Counter
+
+from django.db import migrations, models
+
+import core.indices
+from core.documentos import formatar_documento, somente_digitos
+
+
+def preencher_documento_digitos(apps, schema_editor):
+    Cliente = apps.get_model('core', 'Cliente')
+
+    repetidos = [
+        digitos for digitos, quantidade in Counter(
+            somente_digitos(documento)
+            for documento in Cliente.objects.values_list('documento', flat=True).iterator(chunk_size=5000)
+        ).items()
+        if quantidade > 1
+    ]
+    if repetidos:
+        raise ValueError(
+            'Clientes com o mesmo CPF/CNPJ escrito de formas diferentes: '
+            f"{', '.join(repetidos[:10])}. Unifique esses cadastros antes de aplicar a migração."
+        )
+
+    lote = []
+    for cliente in Cliente.objects.only('id', 'tipo', 'documento').iterator(chunk_size=5000):
+        cliente.documento_digitos = somente_digitos(cliente.documento)
+        cliente.documento = formatar_documento(cliente.documento_digitos, cliente.tipo) or cliente.documento
+        lote.append(cliente)
+        if len(lote) == 5000:
+            Cliente.objects.bulk_update(lote, ['documento', 'documento_digitos'])
+            lote = []
+    Cliente.objects.bulk_update(lote, ['documento', 'documento_digitos'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_cliente_busca_trigram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='documento_digitos',
+            field=models.CharField(editable=False, max_length=14, null=True, verbose_name='CPF/CNPJ (somente dígitos)'),
+        ),
+        migrations.RunPython(preencher_documento_digitos, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='cliente',
+            name='documento_digitos',
+            field=models.CharField(editable=False, max_length=14, unique=True, verbose_name='CPF/CNPJ (somente dígitos)'),
+        ),
+        migrations.RemoveIndex(
+            model_name='cliente',
+            name='cliente_documento_trgm_idx',
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=core.indices.GinIndexPostgres(
+                fields=['documento_digitos'], name='cliente_doc_digitos_trgm_idx', opclasses=['gin_trgm_ops']
+            ),
+        ),
+    ]
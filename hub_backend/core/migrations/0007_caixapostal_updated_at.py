@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:59
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def preencher_updated_at(apps, schema_editor):
+    CaixaPostal = apps.get_model('core', 'CaixaPostal')
+    CaixaPostal.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_cliente_documento_digitos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='caixapostal',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Atualizada em'),
+        ),
+        migrations.RunPython(preencher_updated_at, migrations.RunPython.noop),
+    ]
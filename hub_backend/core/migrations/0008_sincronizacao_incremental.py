@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:01
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_caixapostal_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Exclusao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(choices=[('cliente', 'Cliente'), ('correspondencia', 'Correspondência')], max_length=20, verbose_name='Modelo')),
+                ('objeto_id', models.UUIDField(verbose_name='ID do Registro')),
+                ('excluido_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Excluído em')),
+            ],
+            options={
+                'verbose_name': 'Exclusão',
+                'verbose_name_plural': 'Exclusões',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['updated_at', 'id'], name='cliente_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='correspondencia',
+            index=models.Index(fields=['updated_at', 'id'], name='corresp_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exclusao',
+            index=models.Index(fields=['modelo', 'excluido_em', 'objeto_id'], name='exclusao_modelo_data_idx'),
+        ),
+    ]
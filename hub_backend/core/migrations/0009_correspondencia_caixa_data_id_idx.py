@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_sincronizacao_incremental'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='correspondencia',
+            index=models.Index(fields=['caixa_postal', '-data_recebimento', 'id'], name='corresp_caixa_data_id_idx'),
+        ),
+    ]
@@ -1,9 +1,16 @@
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.core.validators import RegexValidator
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from dateutil.relativedelta import relativedelta
 import uuid
 
+from .documentos import formatar_documento, somente_digitos
+from .indices import GinIndexPostgres
+from .numeracao import formatar_numero_caixa, registrar_numero_caixa, reservar_numeros_caixa
+
 
 class Cliente(models.Model):
     TIPO_CHOICES = [
@@ -25,6 +32,12 @@ class Cliente(models.Model):
             )
         ]
     )
+    documento_digitos = models.CharField(
+        max_length=14,
+        unique=True,
+        editable=False,
+        verbose_name='CPF/CNPJ (somente dígitos)'
+    )
     email = models.EmailField(verbose_name='E-mail')
     telefone = models.CharField(
         max_length=20, 
@@ -47,12 +60,21 @@ class Cliente(models.Model):
         verbose_name = 'Cliente'
         verbose_name_plural = 'Clientes'
         ordering = ['nome']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='cliente_updated_id_idx'),
+            # Busca por trigram (core.busca), só no PostgreSQL
+            GinIndexPostgres(OpClass(Upper('nome'), name='gin_trgm_ops'), name='cliente_nome_trgm_idx'),
+            GinIndexPostgres(OpClass(Upper('email'), name='gin_trgm_ops'), name='cliente_email_trgm_idx'),
+            GinIndexPostgres(
+                fields=['documento_digitos'], name='cliente_doc_digitos_trgm_idx', opclasses=['gin_trgm_ops']
+            ),
+        ]
 
     def __str__(self):
         return f"{self.nome} - {self.documento}"
 
     def clean(self):
-        documento_limpo = ''.join(filter(str.isdigit, self.documento))
+        documento_limpo = somente_digitos(self.documento)
         
         if self.tipo == 'PF':
             if len(documento_limpo) != 11:
@@ -61,15 +83,22 @@ class Cliente(models.Model):
             if len(documento_limpo) != 14:
                 raise ValidationError({'documento': 'CNPJ deve ter 14 dígitos.'})
 
+        if Cliente.objects.filter(documento_digitos=documento_limpo).exclude(pk=self.pk).exists():
+            raise ValidationError({'documento': 'Já existe um cliente com este CPF/CNPJ.'})
+
+    def save(self, *args, **kwargs):
+        # O documento é gravado já formatado e sua versão só com dígitos alimenta o índice único
+        self.documento_digitos = somente_digitos(self.documento)
+        self.documento = formatar_documento(self.documento_digitos, self.tipo) or self.documento
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'documento' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'documento_digitos'}
+
+        super().save(*args, **kwargs)
+
     @property
     def documento_formatado(self):
-        documento_limpo = ''.join(filter(str.isdigit, self.documento))
-        
-        if self.tipo == 'PF' and len(documento_limpo) == 11:
-            return f"{documento_limpo[:3]}.{documento_limpo[3:6]}.{documento_limpo[6:9]}-{documento_limpo[9:]}"
-        elif self.tipo == 'PJ' and len(documento_limpo) == 14:
-            return f"{documento_limpo[:2]}.{documento_limpo[2:5]}.{documento_limpo[5:8]}/{documento_limpo[8:12]}-{documento_limpo[12:]}"
-        
         return self.documento
 
 
@@ -85,6 +114,7 @@ class CaixaPostal(models.Model):
     observacoes = models.TextField(blank=True, null=True, verbose_name='Observações')
     ativa = models.BooleanField(default=True, verbose_name='Caixa Ativa')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Criada em')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Atualizada em')
 
     class Meta:
         verbose_name = 'Caixa Postal'
@@ -96,23 +126,52 @@ class CaixaPostal(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.numero:
-            ultimo_numero = CaixaPostal.objects.filter(
-                numero__regex=r'^\d+$'
-            ).order_by('-numero').first()
-            
-            if ultimo_numero:
-                try:
-                    proximo_numero = int(ultimo_numero.numero) + 1
-                except ValueError:
-                    proximo_numero = 1
-            else:
-                proximo_numero = 1
-                
-            self.numero = str(proximo_numero).zfill(4)
-        
+            self.numero = formatar_numero_caixa(reservar_numeros_caixa()[0])
+        elif self._state.adding and self.numero.isdigit():
+            registrar_numero_caixa(int(self.numero))
+
         super().save(*args, **kwargs)
 
 
+
+class ContadorCaixaPostal(models.Model):
+    caixa_postal = models.OneToOneField(
+        CaixaPostal,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='contador',
+        verbose_name='Caixa Postal'
+    )
+    total = models.PositiveIntegerField(default=0, verbose_name='Total de Correspondências')
+    pendentes = models.PositiveIntegerField(default=0, verbose_name='Correspondências Pendentes')
+    devolvidas = models.PositiveIntegerField(default=0, verbose_name='Correspondências Devolvidas')
+    ultimo_recebimento = models.DateTimeField(null=True, blank=True, verbose_name='Último Recebimento')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Atualizado em')
+
+    class Meta:
+        verbose_name = 'Contador da Caixa Postal'
+        verbose_name_plural = 'Contadores das Caixas Postais'
+
+    def __str__(self):
+        return f"Contador {self.caixa_postal_id} - {self.total} total ({self.pendentes} pendentes)"
+
+
+class SequenciaNumeracao(models.Model):
+    """
+    Alocador de números sequenciais usado quando o banco não oferece sequences
+    (no PostgreSQL a numeração usa ``core_caixapostal_numero_seq``).
+    """
+    nome = models.CharField(max_length=50, primary_key=True, verbose_name='Nome')
+    ultimo_valor = models.BigIntegerField(default=0, verbose_name='Último Valor')
+
+    class Meta:
+        verbose_name = 'Sequência de Numeração'
+        verbose_name_plural = 'Sequências de Numeração'
+
+    def __str__(self):
+        return f"{self.nome}: {self.ultimo_valor}"
+
+
 class Correspondencia(models.Model):
     TIPO_CHOICES = [
         ('CARTA', 'Carta'),
@@ -184,24 +243,53 @@ class Correspondencia(models.Model):
         verbose_name = 'Correspondência'
         verbose_name_plural = 'Correspondências'
         ordering = ['-data_recebimento']
+        indexes = [
+            models.Index(fields=['-data_recebimento', 'id'], name='corresp_data_id_idx'),
+            models.Index(fields=['status', 'data_recebimento'], name='corresp_status_data_idx'),
+            models.Index(
+                fields=['caixa_postal', 'status', 'data_recebimento'],
+                name='corresp_caixa_status_data_idx'
+            ),
+            models.Index(
+                fields=['caixa_postal', '-data_recebimento', 'id'],
+                name='corresp_caixa_data_id_idx'
+            ),
+            models.Index(fields=['tipo', 'data_recebimento'], name='corresp_tipo_data_idx'),
+            models.Index(
+                fields=['-data_recebimento'],
+                name='corresp_pendentes_idx',
+                condition=models.Q(status='RECEBIDA')
+            ),
+            models.Index(fields=['updated_at', 'id'], name='corresp_updated_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.tipo} - {self.caixa_postal.cliente.nome} - {self.data_recebimento.strftime('%d/%m/%Y')}"
 
-    def marcar_como_retirada(self, retirado_por=None, documento_retirada=None):
+    def marcar_como_retirada(self, retirado_por=None, documento_retirada=None, observacoes=None):
         self.status = 'RETIRADA'
         self.data_retirada = timezone.now()
+        campos = ['status', 'data_retirada', 'updated_at']
         if retirado_por:
             self.retirado_por = retirado_por
+            campos.append('retirado_por')
         if documento_retirada:
             self.documento_retirada = documento_retirada
-        self.save()
+            campos.append('documento_retirada')
+        if observacoes:
+            self.observacoes = observacoes
+            campos.append('observacoes')
+        self.save(update_fields=campos)
+
+    @staticmethod
+    def calcular_dias_na_caixa(status, data_recebimento, data_retirada, agora=None):
+        if status == 'RETIRADA':
+            return (data_retirada - data_recebimento).days
+        return ((agora or timezone.now()) - data_recebimento).days
 
     @property
     def dias_na_caixa(self):
-        if self.status == 'RETIRADA':
-            return (self.data_retirada - self.data_recebimento).days
-        return (timezone.now() - self.data_recebimento).days
+        return self.calcular_dias_na_caixa(self.status, self.data_recebimento, self.data_retirada)
 
     @property
     def cliente(self):
@@ -251,10 +339,13 @@ class Contrato(models.Model):
     def __str__(self):
         return f"{self.cliente.nome} - {self.plano} - {self.status}"
 
+    @staticmethod
+    def calcular_data_vencimento(data_inicio, duracao_meses):
+        return data_inicio + relativedelta(months=duracao_meses)
+
     @property
     def data_vencimento(self):
-        from dateutil.relativedelta import relativedelta
-        return self.data_inicio + relativedelta(months=self.duracao_meses)
+        return self.calcular_data_vencimento(self.data_inicio, self.duracao_meses)
 
     @property
     def esta_vencido(self):
@@ -262,4 +353,29 @@ class Contrato(models.Model):
 
     @property
     def valor_total(self):
-        return self.valor_mensal * self.duracao_meses
\ No newline at end of file
+        return self.valor_mensal * self.duracao_meses
+
+
+class Exclusao(models.Model):
+    """
+    Registro (tombstone) de um cliente ou correspondência removido, para que a
+    sincronização incremental também propague as exclusões.
+    """
+    MODELO_CHOICES = [
+        ('cliente', 'Cliente'),
+        ('correspondencia', 'Correspondência'),
+    ]
+
+    modelo = models.CharField(max_length=20, choices=MODELO_CHOICES, verbose_name='Modelo')
+    objeto_id = models.UUIDField(verbose_name='ID do Registro')
+    excluido_em = models.DateTimeField(default=timezone.now, verbose_name='Excluído em')
+
+    class Meta:
+        verbose_name = 'Exclusão'
+        verbose_name_plural = 'Exclusões'
+        indexes = [
+            models.Index(fields=['modelo', 'excluido_em', 'objeto_id'], name='exclusao_modelo_data_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo} {self.objeto_id} - {self.excluido_em:%d/%m/%Y %H:%M}"
@@ -0,0 +1,64 @@
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+SEQUENCIA_CAIXA_POSTAL = 'core_caixapostal_numero_seq'
+NOME_CAIXA_POSTAL = 'caixa_postal'
+
+
+def formatar_numero_caixa(numero):
+    return str(numero).zfill(4)
+
+
+def reservar_numeros_caixa(quantidade=1):
+    """
+    Reserva ``quantidade`` números de caixa postal e devolve a lista de inteiros.
+
+    No PostgreSQL usa uma sequence: ``nextval`` é atômico e não bloqueia outras
+    transações. Nos demais bancos incrementa a linha de ``SequenciaNumeracao``
+    com um único UPDATE, que serializa as reservas concorrentes.
+    """
+    if quantidade <= 0:
+        return []
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT nextval(%s) FROM generate_series(1, %s)',
+                [SEQUENCIA_CAIXA_POSTAL, quantidade]
+            )
+            return [numero for numero, in cursor.fetchall()]
+
+    from .models import SequenciaNumeracao
+
+    with transaction.atomic():
+        atualizadas = SequenciaNumeracao.objects.filter(nome=NOME_CAIXA_POSTAL).update(
+            ultimo_valor=F('ultimo_valor') + quantidade
+        )
+        if not atualizadas:
+            SequenciaNumeracao.objects.create(nome=NOME_CAIXA_POSTAL, ultimo_valor=quantidade)
+        ultimo = SequenciaNumeracao.objects.values_list('ultimo_valor', flat=True).get(nome=NOME_CAIXA_POSTAL)
+
+    return list(range(ultimo - quantidade + 1, ultimo + 1))
+
+
+def registrar_numero_caixa(numero):
+    """
+    Garante que a numeração automática continue depois de um número atribuído manualmente.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT setval(%s, GREATEST(%s, last_value)) FROM {SEQUENCIA_CAIXA_POSTAL}',
+                [SEQUENCIA_CAIXA_POSTAL, numero]
+            )
+        return
+
+    from .models import SequenciaNumeracao
+
+    with transaction.atomic():
+        atualizadas = SequenciaNumeracao.objects.filter(nome=NOME_CAIXA_POSTAL).update(
+            ultimo_valor=Greatest(F('ultimo_valor'), numero)
+        )
+        if not atualizadas:
+            SequenciaNumeracao.objects.create(nome=NOME_CAIXA_POSTAL, ultimo_valor=numero)
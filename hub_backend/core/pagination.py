@@ -0,0 +1,197 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from urllib import parse
+import uuid
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PadraoPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Versão assíncrona de ``paginate_queryset``: o COUNT e a página são lidos
+        com o ORM assíncrono (``acount`` e iteração assíncrona).
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            numero = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        inicio = (numero - 1) * page_size
+        linhas = [linha async for linha in queryset[inicio:inicio + page_size]]
+        self.page = paginator._get_page(linhas, numero, paginator)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+
+class CorrespondenciaCursorPagination(BasePagination):
+    """
+    Paginação por keyset sobre (-data_recebimento, id).
+
+    Cada página é obtida com um filtro a partir da última linha da página
+    anterior, sem OFFSET e sem COUNT, de modo que páginas profundas custam o
+    mesmo que a primeira.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._filtrar(queryset, request)
+        return self._montar_pagina(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self._filtrar(queryset, request)
+        return self._montar_pagina([linha async for linha in queryset[:self.page_size + 1]])
+
+    def _filtrar(self, queryset, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor['r'])
+
+        if self.cursor:
+            data, pk = self.cursor['d'], self.cursor['i']
+            if self.reverse:
+                queryset = queryset.filter(
+                    Q(data_recebimento__gt=data) | Q(data_recebimento=data, id__lt=pk)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(data_recebimento__lt=data) | Q(data_recebimento=data, id__gt=pk)
+                )
+
+        if self.reverse:
+            return queryset.order_by('data_recebimento', '-id')
+        return queryset.order_by('-data_recebimento', 'id')
+
+    def _montar_pagina(self, results):
+        self.has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+
+        if self.reverse:
+            self.has_next = True
+            self.has_previous = self.has_more
+        else:
+            self.has_next = self.has_more
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            data = parse_datetime(tokens['d'][0])
+            pk = uuid.UUID(tokens['i'][0])
+            reverse = bool(int(tokens['r'][0]))
+        except (TypeError, ValueError, KeyError, IndexError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if data is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return {'d': data, 'i': pk, 'r': reverse}
+
+    def encode_cursor(self, obj, reverse):
+        # A página pode conter instâncias ou linhas de .values() (leitura rápida)
+        if isinstance(obj, dict):
+            data, pk = obj['data_recebimento'], obj['id']
+        else:
+            data, pk = obj.data_recebimento, obj.pk
+        querystring = parse.urlencode({
+            'd': data.isoformat(),
+            'i': str(pk),
+            'r': '1' if reverse else '0',
+        })
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor de paginação (modo keyset).',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Itens por página (máximo {self.max_page_size}).',
+                'schema': {'type': 'integer'},
+            },
+        ]
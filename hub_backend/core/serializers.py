@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_field
+from .documentos import somente_digitos
 from .models import Cliente, CaixaPostal, Correspondencia, Contrato
 
 
@@ -19,13 +20,19 @@ class ClienteSerializer(serializers.ModelSerializer):
         return obj.documento_formatado
 
     def validate_documento(self, value):
-        documento_limpo = ''.join(filter(str.isdigit, value))
+        documento_limpo = somente_digitos(value)
         tipo = self.initial_data.get('tipo')
         
         if tipo == 'PF' and len(documento_limpo) != 11:
             raise serializers.ValidationError('CPF deve ter 11 dígitos.')
         elif tipo == 'PJ' and len(documento_limpo) != 14:
             raise serializers.ValidationError('CNPJ deve ter 14 dígitos.')
+
+        existentes = Cliente.objects.filter(documento_digitos=documento_limpo)
+        if self.instance is not None:
+            existentes = existentes.exclude(pk=self.instance.pk)
+        if existentes.exists():
+            raise serializers.ValidationError('Já existe um cliente com este CPF/CNPJ.')
         
         return value
 
@@ -41,16 +48,20 @@ class CaixaPostalSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'numero', 'cliente', 'cliente_nome', 'cliente_documento',
             'observacoes', 'ativa', 'total_correspondencias', 
-            'correspondencias_pendentes', 'created_at'
+            'correspondencias_pendentes', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
 
     @extend_schema_field(serializers.IntegerField)
     def get_total_correspondencias(self, obj):
+        if hasattr(obj, 'total_correspondencias'):
+            return obj.total_correspondencias
         return obj.correspondencias.count()
 
     @extend_schema_field(serializers.IntegerField)
     def get_correspondencias_pendentes(self, obj):
+        if hasattr(obj, 'correspondencias_pendentes'):
+            return obj.correspondencias_pendentes
         return obj.correspondencias.filter(status='RECEBIDA').count()
 
 
@@ -74,6 +85,8 @@ class CorrespondenciaSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(serializers.IntegerField)
     def get_dias_na_caixa(self, obj):
+        if hasattr(obj, 'idade_dias'):
+            return obj.idade_dias
         return obj.dias_na_caixa
 
     def validate(self, data):
@@ -92,12 +105,36 @@ class CorrespondenciaCreateSerializer(serializers.ModelSerializer):
         ]
 
 
+class CorrespondenciaLoteSerializer(serializers.ModelSerializer):
+    caixa_postal = serializers.UUIDField()
+
+    class Meta:
+        model = Correspondencia
+        fields = CorrespondenciaCreateSerializer.Meta.fields
+
+    def validate_caixa_postal(self, value):
+        caixa = self.context['caixas'].get(value)
+        if caixa is None:
+            raise serializers.ValidationError('Caixa postal não encontrada.')
+        return caixa
+
+
 class CorrespondenciaRetiradaSerializer(serializers.Serializer):
     retirado_por = serializers.CharField(max_length=255, required=False)
     documento_retirada = serializers.CharField(max_length=18, required=False)
     observacoes = serializers.CharField(required=False, allow_blank=True, allow_null=True)
 
 
+class CorrespondenciaRetiradaLoteSerializer(CorrespondenciaRetiradaSerializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False)
+    caixa_postal = serializers.UUIDField(required=False)
+
+    def validate(self, data):
+        if not data.get('ids') and not data.get('caixa_postal'):
+            raise serializers.ValidationError('Informe os ids das correspondências ou a caixa postal.')
+        return data
+
+
 class ContratoSerializer(serializers.ModelSerializer):
     cliente_nome = serializers.CharField(source='cliente.nome', read_only=True)
     data_vencimento = serializers.SerializerMethodField()
@@ -118,10 +155,14 @@ class ContratoSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(serializers.DateField)
     def get_data_vencimento(self, obj):
+        if hasattr(obj, 'vencimento'):
+            return obj.vencimento
         return obj.data_vencimento
 
     @extend_schema_field(serializers.BooleanField)
     def get_esta_vencido(self, obj):
+        if hasattr(obj, 'vencido'):
+            return obj.vencido
         return obj.esta_vencido
 
     @extend_schema_field(serializers.DecimalField(max_digits=12, decimal_places=2))
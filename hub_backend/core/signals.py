@@ -1,6 +1,18 @@
-from django.db.models.signals import post_save
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
-from .models import Cliente, CaixaPostal
+from django.utils import timezone
+from .contadores import registrar_alteracao, registrar_recebimento, registrar_remocao
+from .dashboard import invalidar_estatisticas
+from .models import Cliente, CaixaPostal, ContadorCaixaPostal, Correspondencia, Contrato, Exclusao
+
+CAMPOS_CONTADOS = {'caixa_postal', 'caixa_postal_id', 'status', 'data_recebimento'}
+
+# Campos repetidos nas linhas de correspondência (CorrespondenciaLeitor)
+CAMPOS_EXIBIDOS = {
+    Cliente: {'nome': 'caixa_postal__cliente'},
+    CaixaPostal: {'numero': 'caixa_postal'},
+}
 
 
 @receiver(post_save, sender=Cliente)
@@ -12,4 +24,127 @@ def create_caixa_postal(sender, instance, created, **kwargs):
         CaixaPostal.objects.create(
             cliente=instance,
             observacoes=f"Caixa criada automaticamente para {instance.nome}"
-        )
\ No newline at end of file
+        )
+
+
+@receiver(post_save, sender=CaixaPostal)
+def create_contador_caixa_postal(sender, instance, created, **kwargs):
+    """
+    Cria os contadores materializados junto com a CaixaPostal.
+    """
+    if created:
+        ContadorCaixaPostal.objects.create(caixa_postal=instance)
+
+
+@receiver(pre_save, sender=Correspondencia)
+def guardar_valores_contados(sender, instance, update_fields=None, **kwargs):
+    """
+    Guarda a caixa, o status e a data de recebimento da correspondência antes de
+    ser salva, para que os contadores sejam ajustados apenas pela diferença.
+    """
+    instance._valores_contados = None
+    if instance._state.adding:
+        return
+    if update_fields is None or CAMPOS_CONTADOS & set(update_fields):
+        instance._valores_contados = Correspondencia.objects.filter(pk=instance.pk).values(
+            'caixa_postal_id', 'status', 'data_recebimento'
+        ).first()
+
+
+@receiver(post_save, sender=Correspondencia)
+def atualizar_contador_caixa_postal(sender, instance, created, **kwargs):
+    """
+    Mantém os contadores da caixa em dia quando uma correspondência é criada ou alterada.
+    """
+    if created:
+        registrar_recebimento(instance)
+        return
+    anterior = getattr(instance, '_valores_contados', None)
+    if anterior is not None:
+        registrar_alteracao(instance, anterior)
+
+
+@receiver(pre_save, sender=Cliente)
+@receiver(pre_save, sender=CaixaPostal)
+def guardar_campos_exibidos(sender, instance, update_fields=None, **kwargs):
+    """
+    Guarda os valores que as correspondências exibem (nome do cliente, número da
+    caixa) antes de salvar, para saber depois se mudaram.
+    """
+    instance._campos_exibidos = None
+    campos = CAMPOS_EXIBIDOS[sender]
+    if instance._state.adding or (update_fields is not None and not campos.keys() & set(update_fields)):
+        return
+    instance._campos_exibidos = sender.objects.filter(pk=instance.pk).values(*campos).first()
+
+
+@receiver(post_save, sender=Cliente)
+@receiver(post_save, sender=CaixaPostal)
+def marcar_correspondencias_alteradas(sender, instance, created, **kwargs):
+    """
+    Atualiza o ``updated_at`` das correspondências quando o nome do cliente ou o número
+    da caixa muda, para que a sincronização incremental também as devolva.
+    """
+    anteriores = getattr(instance, '_campos_exibidos', None)
+    if created or anteriores is None:
+        return
+    for campo, relacao in CAMPOS_EXIBIDOS[sender].items():
+        if anteriores[campo] != getattr(instance, campo):
+            Correspondencia.objects.filter(**{relacao: instance}).update(updated_at=timezone.now())
+            return
+
+
+def _removida_com_a_caixa(origin):
+    """
+    Indica se a exclusão começou pela caixa ou pelo cliente (em cascata), e não
+    pela própria correspondência.
+    """
+    modelo = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return origin is not None and modelo is not Correspondencia
+
+
+@receiver(post_delete, sender=Correspondencia)
+def decrementar_contador_caixa_postal(sender, instance, origin=None, **kwargs):
+    """
+    Desconta a correspondência removida dos contadores da caixa. Na exclusão em
+    cascata o contador é removido junto com a caixa.
+    """
+    if not _removida_com_a_caixa(origin):
+        registrar_remocao(instance)
+
+
+@receiver(pre_delete, sender=CaixaPostal)
+def registrar_exclusao_das_correspondencias(sender, instance, **kwargs):
+    """
+    Guarda de uma vez os ids das correspondências removidas em cascata com a caixa.
+    """
+    Exclusao.objects.bulk_create([
+        Exclusao(modelo='correspondencia', objeto_id=pk)
+        for pk in instance.correspondencias.values_list('id', flat=True)
+    ])
+
+
+@receiver(post_delete, sender=Cliente)
+@receiver(post_delete, sender=Correspondencia)
+def registrar_exclusao(sender, instance, origin=None, **kwargs):
+    """
+    Guarda o id do registro removido para a sincronização incremental.
+    """
+    if sender is Correspondencia and _removida_com_a_caixa(origin):
+        return
+    Exclusao.objects.create(modelo=sender._meta.model_name, objeto_id=instance.pk)
+
+
+@receiver(post_save, sender=Cliente)
+@receiver(post_delete, sender=Cliente)
+@receiver(post_save, sender=CaixaPostal)
+@receiver(post_delete, sender=CaixaPostal)
+@receiver(post_save, sender=Correspondencia)
+@receiver(post_delete, sender=Correspondencia)
+@receiver(post_save, sender=Contrato)
+@receiver(post_delete, sender=Contrato)
+def invalidar_dashboard(sender, **kwargs):
+    """
+    Invalida as estatísticas do dashboard sempre que um registro é criado, alterado ou removido.
+    """
+    invalidar_estatisticas()
@@ -0,0 +1,168 @@
+"""
+Sincronização incremental: alterações desde uma marca d'água.
+
+As linhas alteradas (por ``updated_at``) e as exclusões (por ``excluido_em``) são
+percorridas juntas em ordem de (data, id), de modo que a marca devolvida em cada
+resposta é suficiente para continuar de onde o cliente parou.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+import binascii
+import uuid
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from .models import Exclusao
+
+LIMITE_PADRAO = 500
+LIMITE_MAXIMO = 5000
+
+# Transações ainda abertas podem gravar updated_at um pouco no passado; as
+# alterações mais recentes que isso ficam para a próxima chamada.
+MARGEM_CONSISTENCIA = timedelta(seconds=5)
+
+
+class RessincronizacaoNecessaria(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        'A marca é anterior à retenção das exclusões. Refaça a sincronização completa, sem desde.'
+    )
+    default_code = 'ressincronizacao_necessaria'
+
+
+def inicio_retencao(agora=None):
+    """
+    Data a partir da qual as exclusões ainda estão guardadas (``SINCRONIZACAO_RETENCAO_DIAS``).
+    """
+    return (agora or timezone.now()) - timedelta(days=settings.SINCRONIZACAO_RETENCAO_DIAS)
+
+
+def gerar_marca(data, pk=None):
+    valor = f"{data.isoformat()}|{pk or ''}"
+    return urlsafe_b64encode(valor.encode()).decode()
+
+
+def ler_marca(valor):
+    """
+    Lê a marca devolvida por uma sincronização anterior ou uma data ISO 8601.
+    Retorna ``(data, id)``, com ``id`` ``None`` quando só a data é conhecida.
+    """
+    data = parse_datetime(valor)
+    if data is not None:
+        return (data if timezone.is_aware(data) else timezone.make_aware(data)), None
+
+    try:
+        texto_data, _, texto_id = urlsafe_b64decode(valor.encode()).decode().partition('|')
+        data = parse_datetime(texto_data)
+        pk = uuid.UUID(texto_id) if texto_id else None
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        data = None
+    if data is None:
+        raise ValidationError({'desde': 'Marca de sincronização inválida.'})
+    return data, pk
+
+
+def ler_limite(valor):
+    if not valor:
+        return LIMITE_PADRAO
+    try:
+        limite = int(valor)
+    except ValueError:
+        limite = 0
+    if not 1 <= limite <= LIMITE_MAXIMO:
+        raise ValidationError({'limite': f'Informe um número entre 1 e {LIMITE_MAXIMO}.'})
+    return limite
+
+
+def _apos(marca, campo_data, campo_id):
+    data, pk = marca
+    if pk is None:
+        return Q(**{f'{campo_data}__gt': data})
+    return Q(**{f'{campo_data}__gt': data}) | Q(**{campo_data: data, f'{campo_id}__gt': pk})
+
+
+def sincronizar(queryset, leitor, desde=None, limite=LIMITE_PADRAO):
+    """
+    Retorna até ``limite`` alterações posteriores à marca ``desde``: as linhas criadas
+    ou alteradas (no formato do ``leitor``) e os ids excluídos.
+
+    Sem ``desde`` a sincronização começa do zero (carga inicial) e as exclusões
+    anteriores são ignoradas. ``mais`` indica que há outra página a buscar
+    imediatamente com a nova ``marca``. Marcas anteriores à retenção das exclusões
+    levantam ``RessincronizacaoNecessaria``: as exclusões desde então podem já ter
+    sido removidas por ``purgar_exclusoes``.
+    """
+    agora = timezone.now()
+    ate = agora - MARGEM_CONSISTENCIA
+    linhas = queryset.filter(updated_at__lte=ate)
+    exclusoes = Exclusao.objects.filter(modelo=queryset.model._meta.model_name, excluido_em__lte=ate)
+    if desde:
+        marca = ler_marca(desde)
+        if marca[0] < inicio_retencao(agora):
+            raise RessincronizacaoNecessaria()
+        linhas = linhas.filter(_apos(marca, 'updated_at', 'id'))
+        exclusoes = exclusoes.filter(_apos(marca, 'excluido_em', 'objeto_id'))
+    else:
+        exclusoes = exclusoes.none()
+
+    eventos = [
+        ((linha['updated_at'], linha['id']), linha)
+        for linha in leitor.valores(linhas.order_by('updated_at', 'id'))[:limite + 1]
+    ]
+    eventos += [
+        ((excluido_em, pk), None)
+        for excluido_em, pk in exclusoes.order_by('excluido_em', 'objeto_id').values_list(
+            'excluido_em', 'objeto_id'
+        )[:limite + 1]
+    ]
+    eventos.sort(key=lambda evento: evento[0])
+
+    mais = len(eventos) > limite
+    eventos = eventos[:limite]
+    return {
+        'alteracoes': leitor.ler([linha for _, linha in eventos if linha is not None]),
+        'exclusoes': [str(pk) for (_, pk), linha in eventos if linha is None],
+        'marca': gerar_marca(*eventos[-1][0]) if mais else gerar_marca(ate),
+        'mais': mais,
+    }
+
+
+class SincronizacaoMixin:
+    """
+    Acrescenta ao ViewSet a rota ``alteracoes/`` da sincronização incremental.
+    Usa o ``leitor`` da leitura rápida e o queryset de ``get_queryset_sincronizacao``,
+    sem os filtros da listagem (uma linha que deixa de atender a um filtro
+    precisa continuar aparecendo como alterada).
+    """
+
+    def get_queryset_sincronizacao(self):
+        return self.queryset.all()
+
+    @extend_schema(
+        summary="Alterações desde a última sincronização",
+        description="Retorna as linhas criadas ou alteradas e os ids excluídos desde a marca "
+                    "informada em desde, em ordem de alteração. Repita com a marca devolvida "
+                    "enquanto mais for verdadeiro. Marcas mais antigas que a retenção das exclusões "
+                    "recebem 410: refaça a carga completa, sem desde.",
+        parameters=[
+            OpenApiParameter('desde', str, description='Marca devolvida pela chamada anterior ou data ISO 8601'),
+            OpenApiParameter('limite', int, description=f'Máximo de itens por resposta (padrão: {LIMITE_PADRAO})'),
+        ],
+        responses={200: None, 400: None, 410: None}
+    )
+    @action(detail=False, methods=['get'])
+    def alteracoes(self, request):
+        return Response(sincronizar(
+            self.get_queryset_sincronizacao(),
+            self.leitor,
+            desde=request.query_params.get('desde'),
+            limite=ler_limite(request.query_params.get('limite')),
+        ))
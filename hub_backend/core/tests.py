@@ -1,3 +1,608 @@
-from django.test import TestCase
+import json
+from base64 import b64encode
+from datetime import timedelta
+from io import StringIO
+from itertools import count
+from unittest import mock
+from urllib.parse import urlencode
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .contadores import recalcular_contadores
+from .metricas import nome_endpoint, orcamento
+from .models import CaixaPostal, Cliente, Contrato, Correspondencia, Exclusao
+
+_documentos = count(10000000000)
+
+
+class ApiTestCase(TestCase):
+    """
+    Base dos testes da API: autentica o cliente com um token JWT obtido no login.
+    """
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user('operador', password='senha-de-teste')
+        self.client = APIClient()
+        response = self.client.post(
+            '/api/auth/login/', {'username': 'operador', 'password': 'senha-de-teste'}, format='json'
+        )
+        self.access = response.data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+
+    def criar_cliente(self, nome='Maria Silva', **campos):
+        return Cliente.objects.create(
+            tipo='PF', nome=nome, documento=str(next(_documentos)), email='cliente@exemplo.com', **campos
+        )
+
+    def criar_correspondencia(self, caixa, **campos):
+        campos.setdefault('descricao', 'Carta registrada')
+        campos.setdefault('tipo', 'CARTA')
+        return Correspondencia.objects.create(caixa_postal=caixa, **campos)
+
+
+class CursorPaginacaoTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cliente = self.criar_cliente()
+        agora = timezone.now()
+        # Datas repetidas para que o desempate pelo id também seja exercitado
+        for dias in (0, 1, 1, 1, 2, 3, 3, 5):
+            self.criar_correspondencia(self.cliente.caixa_postal, data_recebimento=agora - timedelta(days=dias))
+        self.esperado = [
+            str(pk) for pk in Correspondencia.objects.order_by('-data_recebimento', 'id').values_list('id', flat=True)
+        ]
+
+    def ler_pagina(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_percorre_todas_as_paginas_na_ordem(self):
+        url, ids, paginas = '/api/correspondencias/?paginacao=cursor&page_size=3', [], []
+        while url:
+            pagina = self.ler_pagina(url)
+            paginas.append([item['id'] for item in pagina['results']])
+            ids += paginas[-1]
+            url = pagina['next']
+        self.assertEqual(ids, self.esperado)
+
+        # Voltando pelo previous, as mesmas páginas aparecem na ordem inversa
+        url, anteriores = pagina['previous'], []
+        while url:
+            pagina = self.ler_pagina(url)
+            anteriores.append([item['id'] for item in pagina['results']])
+            url = pagina['previous']
+        self.assertEqual(anteriores, paginas[-2::-1])
+
+    def test_novas_correspondencias_nao_deslocam_as_paginas(self):
+        pagina = self.ler_pagina('/api/correspondencias/?paginacao=cursor&page_size=3')
+        ids = [item['id'] for item in pagina['results']]
+        self.criar_correspondencia(self.cliente.caixa_postal)
+
+        url = pagina['next']
+        while url:
+            pagina = self.ler_pagina(url)
+            ids += [item['id'] for item in pagina['results']]
+            url = pagina['next']
+        self.assertEqual(ids, self.esperado)
+
+    def test_correspondencias_do_cliente_por_cursor(self):
+        url, ids = f'/api/clientes/{self.cliente.id}/correspondencias/?page_size=3', []
+        while url:
+            pagina = self.ler_pagina(url)
+            ids += [item['id'] for item in pagina['results']]
+            url = pagina['next']
+        self.assertEqual(ids, self.esperado)
+
+    def test_cursor_invalido(self):
+        forjado = b64encode(urlencode({'d': timezone.now().isoformat(), 'i': 'xx', 'r': '0'}).encode()).decode()
+        for cursor in ('nao-e-um-cursor', forjado):
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/correspondencias/', {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+                response = self.client.get(f'/api/clientes/{self.cliente.id}/correspondencias/', {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+    def test_cursor_nao_aceita_ordenar(self):
+        response = self.client.get('/api/correspondencias/', {'paginacao': 'cursor', 'ordenar': '-idade'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordenar', response.data)
+
+
+class ContadoresTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.caixa = self.criar_cliente().caixa_postal
+        self.outra_caixa = self.criar_cliente(nome='João Souza').caixa_postal
+        agora = timezone.now()
+        self.correspondencias = [
+            self.criar_correspondencia(self.caixa, data_recebimento=agora - timedelta(days=dias))
+            for dias in (3, 2, 1)
+        ]
+
+    def assertContadores(self, caixa, total, pendentes, ultimo_recebimento):
+        caixa.contador.refresh_from_db()
+        self.assertEqual(
+            (caixa.contador.total, caixa.contador.pendentes, caixa.contador.ultimo_recebimento),
+            (total, pendentes, ultimo_recebimento),
+        )
+
+    def test_criacao(self):
+        self.assertEqual(recalcular_contadores(), [])
+        self.assertContadores(self.caixa, 3, 3, self.correspondencias[-1].data_recebimento)
+
+    def test_retirada(self):
+        self.correspondencias[0].marcar_como_retirada(retirado_por='Maria')
+        response = self.client.post('/api/correspondencias/marcar_retirada_lote/', {
+            'ids': [str(self.correspondencias[1].id)],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(recalcular_contadores(), [])
+        self.assertContadores(self.caixa, 3, 1, self.correspondencias[-1].data_recebimento)
+
+    def test_alteracao_de_status_e_data(self):
+        primeira, segunda, ultima = self.correspondencias
+        for correspondencia, dados in (
+            (primeira, {'status': 'DEVOLVIDA'}),
+            (segunda, {'status': 'RETIRADA'}),
+            (primeira, {'status': 'RECEBIDA'}),
+            (ultima, {'data_recebimento': (timezone.now() - timedelta(days=10)).isoformat()}),
+        ):
+            with self.subTest(dados=dados):
+                response = self.client.patch(f'/api/correspondencias/{correspondencia.id}/', dados, format='json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(recalcular_contadores(), [])
+        self.assertContadores(self.caixa, 3, 2, segunda.data_recebimento)
+
+    def test_alteracao_sem_campos_contados_nao_toca_os_contadores(self):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.patch(f'/api/correspondencias/{self.correspondencias[0].id}/', {
+                'observacoes': 'Entregar na portaria',
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([c for c in consultas if 'core_contadorcaixapostal' in c['sql']])
+
+    def test_troca_de_caixa(self):
+        movida = self.correspondencias[-1]
+        response = self.client.patch(f'/api/correspondencias/{movida.id}/', {
+            'caixa_postal': str(self.outra_caixa.id),
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(recalcular_contadores(), [])
+        self.assertContadores(self.caixa, 2, 2, self.correspondencias[1].data_recebimento)
+        self.assertContadores(self.outra_caixa, 1, 1, movida.data_recebimento)
+
+    def test_exclusao(self):
+        response = self.client.delete(f'/api/correspondencias/{self.correspondencias[-1].id}/')
+        self.assertEqual(response.status_code, 204)
+
+        self.assertEqual(recalcular_contadores(), [])
+        self.assertContadores(self.caixa, 2, 2, self.correspondencias[1].data_recebimento)
+
+
+class LoteTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.caixa = self.criar_cliente().caixa_postal
+
+    def item(self, **campos):
+        return {'caixa_postal': str(self.caixa.id), 'descricao': 'Boleto', 'tipo': 'CARTA', **campos}
+
+    def enviar_lote(self, itens):
+        return self.client.post('/api/correspondencias/lote/', itens, format='json')
+
+    def test_lote_valido(self):
+        response = self.enviar_lote([self.item(), self.item(tipo='SEDEX')])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['criadas'], response.data['erros']), (2, 0))
+        self.assertEqual(self.caixa.correspondencias.count(), 2)
+        self.assertEqual(recalcular_contadores(), [])
+
+    def test_lote_ajusta_contadores_sem_recontar(self):
+        outra_caixa = self.criar_cliente(nome='João Souza').caixa_postal
+        recente = self.criar_correspondencia(self.caixa)
+        antiga = (timezone.now() - timedelta(days=5)).isoformat()
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.enviar_lote([
+                self.item(data_recebimento=antiga),
+                self.item(caixa_postal=str(outra_caixa.id), data_recebimento=antiga),
+                self.item(caixa_postal=str(outra_caixa.id)),
+            ])
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse([c for c in consultas if 'COUNT(' in c['sql']])
+
+        self.assertEqual(recalcular_contadores(), [])
+        self.caixa.contador.refresh_from_db()
+        self.assertEqual((self.caixa.contador.total, self.caixa.contador.ultimo_recebimento), (2, recente.data_recebimento))
+        outra_caixa.contador.refresh_from_db()
+        self.assertEqual((outra_caixa.contador.total, outra_caixa.contador.pendentes), (2, 2))
+
+    def test_lote_parcial(self):
+        response = self.enviar_lote([self.item(), self.item(tipo='TELEGRAMA'), self.item(caixa_postal='xx')])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['criadas'], response.data['erros']), (1, 2))
+        resultados = response.data['resultados']
+        self.assertIn('id', resultados[0])
+        self.assertIn('tipo', resultados[1]['erros'])
+        self.assertIn('caixa_postal', resultados[2]['erros'])
+        self.assertEqual(self.caixa.correspondencias.count(), 1)
+
+    def test_lote_invalido(self):
+        response = self.enviar_lote([self.item(descricao=''), self.item(caixa_postal=str(self.caixa.cliente_id))])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['criadas'], 0)
+        self.assertFalse(self.caixa.correspondencias.exists())
+
+        response = self.enviar_lote(self.item())
+        self.assertEqual(response.status_code, 400)
+
+    def test_lote_ndjson(self):
+        corpo = '\n'.join(json.dumps(self.item(descricao=f'Carta {n}')) for n in range(3))
+        response = self.client.post('/api/correspondencias/lote/', corpo, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['criadas'], 3)
+
+    def test_retirada_em_lote(self):
+        pendentes = [self.criar_correspondencia(self.caixa) for _ in range(3)]
+        retirada = self.criar_correspondencia(self.caixa, status='RETIRADA', data_retirada=timezone.now())
+
+        response = self.client.post('/api/correspondencias/marcar_retirada_lote/', {
+            'ids': [str(pendentes[0].id), str(retirada.id)],
+            'retirado_por': 'Maria',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['retiradas'], 1)
+        self.assertEqual(response.data['correspondencias'][0]['retirado_por'], 'Maria')
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post('/api/correspondencias/marcar_retirada_lote/', {
+                'caixa_postal': str(self.caixa.id),
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['retiradas'], 2)
+        self.assertFalse([c for c in consultas if 'COUNT(' in c['sql']])
+        self.assertFalse(self.caixa.correspondencias.filter(status='RECEBIDA').exists())
+        self.assertEqual(recalcular_contadores(), [])
+
+    def test_retirada_em_lote_invalida(self):
+        for dados in ({}, {'ids': []}, {'ids': ['xx']}):
+            with self.subTest(dados=dados):
+                response = self.client.post('/api/correspondencias/marcar_retirada_lote/', dados, format='json')
+                self.assertEqual(response.status_code, 400)
+
+
+class EnvelhecimentoTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cliente = self.criar_cliente()
+        agora = timezone.now()
+        for dias in (1, 10, 40):
+            self.criar_correspondencia(self.cliente.caixa_postal, data_recebimento=agora - timedelta(days=dias))
+        self.criar_correspondencia(self.criar_cliente(nome='João Souza').caixa_postal)
+
+    def test_filtros_por_caixa_e_cliente(self):
+        for param, valor in (('caixa_id', self.cliente.caixa_postal.id), ('cliente_id', self.cliente.id)):
+            with self.subTest(param=param):
+                response = self.client.get('/api/correspondencias/envelhecimento/', {param: valor})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['total'], 3)
+                self.assertEqual(
+                    [faixa['quantidade'] for faixa in response.data['faixas']], [1, 1, 0, 1, 0]
+                )
+
+    def test_mais_de_dias(self):
+        for dias, total in ((0, 3), (5, 2), (40, 0)):
+            with self.subTest(dias=dias):
+                response = self.client.get('/api/correspondencias/envelhecimento/', {'mais_de_dias': dias})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['total'], total)
+
+        for valor in ('-1', 'xx'):
+            with self.subTest(valor=valor):
+                response = self.client.get('/api/correspondencias/envelhecimento/', {'mais_de_dias': valor})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('mais_de_dias', response.data)
+
+    def test_listagem_mais_de_dias(self):
+        # Retirada dois dias depois de chegar: a idade para de contar na retirada
+        recebida = timezone.now() - timedelta(days=20)
+        self.criar_correspondencia(
+            self.cliente.caixa_postal, data_recebimento=recebida,
+            status='RETIRADA', data_retirada=recebida + timedelta(days=2),
+        )
+        for dias, esperado in ((0, [40, 10, 2, 1]), (1, [40, 10, 2]), (2, [40, 10]), (39, [40])):
+            with self.subTest(dias=dias):
+                response = self.client.get('/api/correspondencias/', {'mais_de_dias': dias, 'ordenar': '-idade'})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([item['dias_na_caixa'] for item in response.data['results']], esperado)
+
+        # O filtro compara data_recebimento direto, sem calcular a idade de cada linha no WHERE
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.get('/api/correspondencias/', {'mais_de_dias': 5})
+        filtros = [c['sql'].partition(' WHERE ')[2] for c in consultas if 'core_correspondencia' in c['sql']]
+        self.assertTrue(filtros)
+        self.assertFalse([f for f in filtros if 'julianday' in f or 'EPOCH' in f])
+
+    def test_filtros_invalidos(self):
+        for param in ('caixa_id', 'cliente_id'):
+            for agrupar in ('', 'caixa'):
+                with self.subTest(param=param, agrupar=agrupar):
+                    response = self.client.get(
+                        '/api/correspondencias/envelhecimento/', {param: 'xx', 'agrupar': agrupar}
+                    )
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn(param, response.data)
+
+
+class ExportacaoTests(ApiTestCase):
+    url = '/api/relatorios/correspondencias/?formato=ndjson'
+
+    def setUp(self):
+        super().setUp()
+        caixa = self.criar_cliente().caixa_postal
+        self.esperado = {str(self.criar_correspondencia(caixa).id) for _ in range(3)}
+
+    def ler_ids(self, conteudo):
+        return {json.loads(linha)['id'] for linha in conteudo.decode().splitlines()}
+
+    def test_exportacao_sincrona(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.is_async)
+        self.assertEqual(self.ler_ids(b''.join(response.streaming_content)), self.esperado)
+
+    async def test_exportacao_sob_asgi_usa_gerador_assincrono(self):
+        response = await AsyncClient().get(self.url, headers={'Authorization': f'Bearer {self.access}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        conteudo = b''.join([parte async for parte in response.streaming_content])
+        self.assertEqual(self.ler_ids(conteudo), self.esperado)
+
+
+class ListagemCondicionalTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.caixa = self.criar_cliente().caixa_postal
+        self.correspondencia = self.criar_correspondencia(self.caixa)
+
+    def test_etag_responde_304_ate_a_listagem_mudar(self):
+        response = self.client.get('/api/correspondencias/')
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/correspondencias/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.correspondencia.marcar_como_retirada()
+        response = self.client.get('/api/correspondencias/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_muda_com_o_dia(self):
+        etag = self.client.get('/api/correspondencias/')['ETag']
+        with mock.patch('core.leitura.timezone.localdate', return_value=timezone.localdate() + timedelta(days=1)):
+            response = self.client.get('/api/correspondencias/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_cursor_nao_agrega_a_listagem(self):
+        self.client.get('/api/correspondencias/')
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/correspondencias/', {'paginacao': 'cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        self.assertEqual(len(consultas), 1)
+        self.assertNotIn('COUNT(', consultas[0]['sql'].upper())
+
+
+@mock.patch('core.sincronizacao.MARGEM_CONSISTENCIA', timedelta(0))
+class SincronizacaoTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cliente = self.criar_cliente()
+        self.correspondencias = [self.criar_correspondencia(self.cliente.caixa_postal) for _ in range(3)]
+
+    def sincronizar(self, rota, **params):
+        response = self.client.get(f'/api/{rota}/alteracoes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_marca_continua_de_onde_parou(self):
+        # Carga inicial em páginas de 2: a marca de cada página leva à seguinte sem repetir linhas
+        ids, marca, mais = [], None, True
+        while mais:
+            params = {'limite': 2, 'desde': marca} if marca else {'limite': 2}
+            dados = self.sincronizar('correspondencias', **params)
+            ids += [linha['id'] for linha in dados['alteracoes']]
+            marca, mais = dados['marca'], dados['mais']
+        self.assertCountEqual(ids, [str(c.id) for c in self.correspondencias])
+
+        self.assertEqual(self.sincronizar('correspondencias', desde=marca)['alteracoes'], [])
+
+        self.correspondencias[1].marcar_como_retirada()
+        dados = self.sincronizar('correspondencias', desde=marca)
+        self.assertEqual([linha['id'] for linha in dados['alteracoes']], [str(self.correspondencias[1].id)])
+        self.assertEqual(dados['alteracoes'][0]['status'], 'RETIRADA')
+        self.assertEqual(self.sincronizar('correspondencias', desde=dados['marca'])['alteracoes'], [])
+
+    def test_exclusao_em_cascata_gera_tombstones(self):
+        marca_clientes = self.sincronizar('clientes')['marca']
+        marca_correspondencias = self.sincronizar('correspondencias')['marca']
+
+        response = self.client.delete(f'/api/clientes/{self.cliente.id}/')
+        self.assertEqual(response.status_code, 204)
+
+        dados = self.sincronizar('clientes', desde=marca_clientes)
+        self.assertEqual(dados['exclusoes'], [str(self.cliente.id)])
+        dados = self.sincronizar('correspondencias', desde=marca_correspondencias)
+        self.assertEqual(dados['alteracoes'], [])
+        self.assertCountEqual(dados['exclusoes'], [str(c.id) for c in self.correspondencias])
+
+        # Sem marca (carga inicial) as exclusões anteriores não são enviadas
+        self.assertEqual(self.sincronizar('correspondencias')['exclusoes'], [])
+
+    @override_settings(SINCRONIZACAO_RETENCAO_DIAS=30)
+    def test_marca_anterior_a_retencao_exige_carga_completa(self):
+        marca = self.sincronizar('correspondencias')['marca']
+        antiga = (timezone.now() - timedelta(days=31)).isoformat()
+
+        response = self.client.get('/api/correspondencias/alteracoes/', {'desde': antiga})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(self.sincronizar('correspondencias', desde=marca)['alteracoes'], [])
+
+    @override_settings(SINCRONIZACAO_RETENCAO_DIAS=30)
+    def test_purgar_exclusoes_antigas(self):
+        antiga, recente = (c.id for c in self.correspondencias[:2])
+        Correspondencia.objects.filter(id__in=[antiga, recente]).delete()
+        Exclusao.objects.filter(objeto_id=antiga).update(excluido_em=timezone.now() - timedelta(days=31))
+
+        call_command('purgar_exclusoes', lote=1, stdout=StringIO())
+
+        self.assertEqual(list(Exclusao.objects.values_list('objeto_id', flat=True)), [recente])
+
+    def test_alteracao_do_cliente_reenvia_as_correspondencias(self):
+        marca = self.sincronizar('correspondencias')['marca']
+
+        response = self.client.patch(f'/api/clientes/{self.cliente.id}/', {'nome': 'Maria Souza'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        dados = self.sincronizar('correspondencias', desde=marca)
+        self.assertCountEqual([linha['id'] for linha in dados['alteracoes']], [str(c.id) for c in self.correspondencias])
+        self.assertEqual({linha['cliente_nome'] for linha in dados['alteracoes']}, {'Maria Souza'})
+
+        # Alterações que não aparecem nas correspondências não as reenviam
+        marca = dados['marca']
+        self.client.patch(f'/api/clientes/{self.cliente.id}/', {'telefone': '11999999999'}, format='json')
+        self.assertEqual(self.sincronizar('correspondencias', desde=marca)['alteracoes'], [])
+
+
+@override_settings(SERVIDOR='wsgi')
+class DashboardTests(ApiTestCase):
+    def test_agregacoes_na_conexao_da_requisicao(self):
+        caixa = self.criar_cliente().caixa_postal
+        self.criar_cliente(nome='João Souza', ativo=False)
+        self.criar_correspondencia(caixa)
+        self.criar_correspondencia(caixa, tipo='SEDEX', status='RETIRADA', data_retirada=timezone.now())
+        self.client.get('/api/clientes/')
+
+        # Sob WSGI as agregações usam a conexão persistente da thread da requisição
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(consultas), 4)
+        self.assertEqual(response.data['total_clientes'], 2)
+        self.assertEqual(response.data['clientes_ativos'], 1)
+        self.assertEqual(response.data['correspondencias_pendentes'], 1)
+        self.assertEqual(response.data['correspondencias_por_tipo'], {'CARTA': 1, 'SEDEX': 1})
+
+
+ROTAS_ORCAMENTO = [
+    '/api/clientes/',
+    '/api/clientes/{cliente}/',
+    '/api/clientes/{cliente}/correspondencias/',
+    '/api/clientes/alteracoes/',
+    '/api/caixas-postais/',
+    '/api/caixas-postais/{caixa}/',
+    '/api/correspondencias/',
+    '/api/correspondencias/?paginacao=cursor',
+    '/api/correspondencias/{correspondencia}/',
+    '/api/correspondencias/pendentes/',
+    '/api/correspondencias/hoje/',
+    '/api/correspondencias/envelhecimento/',
+    '/api/correspondencias/envelhecimento/?agrupar=caixa',
+    '/api/correspondencias/alteracoes/',
+    '/api/contratos/',
+    '/api/contratos/{contrato}/',
+    '/api/contratos/vencidos/',
+    '/api/dashboard/',
+]
+
+
+@override_settings(METRICAS_ATIVAS=True)
+class OrcamentoConsultasTests(ApiTestCase):
+    """
+    Falha quando alguma rota principal passa do seu orçamento em ``ORCAMENTO_CONSULTAS``.
+
+    O cache é limpo antes de cada requisição: a consulta do usuário do token JWT e
+    as rotas com resultado em cache (dashboard, envelhecimento) são contadas a frio.
+    """
+    def setUp(self):
+        super().setUp()
+        agora = timezone.now()
+        hoje = timezone.localdate()
+        for n in range(5):
+            cliente = self.criar_cliente(nome=f'Cliente {n}')
+            for dias in (0, 5, 20, 45):
+                self.criar_correspondencia(cliente.caixa_postal, data_recebimento=agora - timedelta(days=dias))
+            Contrato.objects.create(
+                cliente=cliente, plano='BASICO', valor_mensal='99.90',
+                data_inicio=hoje - timedelta(days=400 * (n % 2)), duracao_meses=12,
+            )
+
+        correspondencia = Correspondencia.objects.select_related('caixa_postal').first()
+        self.ids = {
+            'cliente': correspondencia.caixa_postal.cliente_id,
+            'caixa': correspondencia.caixa_postal_id,
+            'correspondencia': correspondencia.id,
+            'contrato': Contrato.objects.first().id,
+        }
+
+    def assertDentroDoOrcamento(self, response):
+        endpoint = nome_endpoint(response.wsgi_request)
+        consultas = response.wsgi_request.medicao.consultas
+        self.assertLessEqual(consultas, orcamento(endpoint), f'{endpoint} fez {consultas} consultas')
+
+    def test_rotas_dentro_do_orcamento(self):
+        for rota in ROTAS_ORCAMENTO:
+            rota = rota.format(**self.ids)
+            with self.subTest(rota=rota):
+                cache.clear()
+                response = self.client.get(rota)
+                self.assertEqual(response.status_code, 200)
+                self.assertDentroDoOrcamento(response)
+
+    def test_escritas_dentro_do_orcamento(self):
+        cliente, caixa, correspondencia, contrato = (
+            self.ids['cliente'], self.ids['caixa'], self.ids['correspondencia'], self.ids['contrato']
+        )
+        outra_caixa = CaixaPostal.objects.exclude(id=caixa).values_list('id', flat=True).first()
+        outra, pendente = (
+            Correspondencia.objects.filter(caixa_postal_id=caixa).exclude(id=correspondencia)
+            .values_list('id', flat=True)[:2]
+        )
+        item = {'caixa_postal': str(caixa), 'descricao': 'Boleto', 'tipo': 'CARTA'}
+        contrato_novo = {
+            'cliente': str(cliente), 'plano': 'BASICO', 'valor_mensal': '99.90',
+            'data_inicio': timezone.localdate().isoformat(), 'duracao_meses': 12,
+        }
+        escritas = [
+            ('post', '/api/clientes/', {
+                'tipo': 'PF', 'nome': 'Cliente Novo', 'documento': str(next(_documentos)),
+                'email': 'novo@exemplo.com',
+            }),
+            ('patch', f'/api/clientes/{cliente}/', {'nome': 'Cliente Renomeado'}),
+            ('post', '/api/correspondencias/', item),
+            ('patch', f'/api/correspondencias/{correspondencia}/', {'status': 'DEVOLVIDA'}),
+            ('patch', f'/api/correspondencias/{correspondencia}/', {'caixa_postal': str(outra_caixa)}),
+            ('post', f'/api/correspondencias/{outra}/marcar_retirada/', {'retirado_por': 'Maria'}),
+            ('post', f'/api/correspondencias/{pendente}/marcar-retirada/', {'retirado_por': 'Maria'}),
+            ('post', '/api/correspondencias/lote/', [item] * 3),
+            ('post', '/api/correspondencias/marcar_retirada_lote/', {'caixa_postal': str(caixa)}),
+            ('delete', f'/api/correspondencias/{outra}/', None),
+            ('post', '/api/contratos/', contrato_novo),
+            ('patch', f'/api/contratos/{contrato}/', {'valor_mensal': '109.90'}),
+            ('delete', f'/api/contratos/{contrato}/', None),
+            ('delete', f'/api/clientes/{cliente}/', None),
+        ]
+        for metodo, rota, dados in escritas:
+            with self.subTest(metodo=metodo, rota=rota):
+                cache.clear()
+                response = getattr(self.client, metodo)(rota, dados, format='json')
+                self.assertLess(response.status_code, 300)
+                self.assertDentroDoOrcamento(response)
@@ -1,25 +1,64 @@
-from rest_framework import viewsets, status
+import uuid
+
+from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.generics import GenericAPIView
+from adrf.generics import GenericAPIView as AsyncGenericAPIView
+from rest_framework.parsers import JSONParser
+from django.core.handlers.asgi import ASGIRequest
 from django.utils import timezone
-from django.db.models import Count, Q
-from datetime import timedelta
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from .models import Cliente, CaixaPostal, Correspondencia, Contrato
+from .anotacoes import anotar_dias_na_caixa, anotar_vencimento
+from .busca import buscar_clientes
+from .contadores import anotar_contadores
+from .dashboard import aobter_estatisticas
+from .envelhecimento import (
+    AGRUPAMENTOS, agrupar, calcular_resumo, ler_dias, ler_id, ler_limites, obter_resumo, pendentes, representar_grupo
+)
+from .documentos import somente_digitos
+from .exportacao import FORMATOS, exportar
+from .filters import (
+    IdadeCorrespondenciaFilter, PeriodoRecebimentoFilter, filtrar_correspondencias, intervalo_do_dia
+)
+from .leitura import (
+    CaixaPostalLeitor, ClienteLeitor, ContratoLeitor, CorrespondenciaLeitor, LeituraRapidaViewSet
+)
+from .lote import TAMANHO_MAXIMO_LOTE, criar_em_lote, marcar_retiradas_em_lote
+from .pagination import CorrespondenciaCursorPagination, PadraoPagination
+from .parsers import NDJSONParser
 from .serializers import (
     ClienteSerializer, CaixaPostalSerializer, CorrespondenciaSerializer,
-    CorrespondenciaCreateSerializer, CorrespondenciaRetiradaSerializer,
+    CorrespondenciaCreateSerializer, CorrespondenciaLoteSerializer, CorrespondenciaRetiradaSerializer,
+    CorrespondenciaRetiradaLoteSerializer,
     ContratoSerializer, DashboardSerializer
 )
+from .sincronizacao import SincronizacaoMixin
+
+FILTROS_CORRESPONDENCIAS_DO_CLIENTE = [PeriodoRecebimentoFilter, IdadeCorrespondenciaFilter]
+DESCRICAO_CORRESPONDENCIAS_DO_CLIENTE = (
+    "Retorna as correspondências da caixa postal do cliente, das mais recentes para as "
+    "mais antigas, com paginação por cursor"
+)
+PARAMETROS_CORRESPONDENCIAS_DO_CLIENTE = [
+    OpenApiParameter('status', str, enum=[s for s, _ in Correspondencia.STATUS_CHOICES]),
+    OpenApiParameter('tipo', str, enum=[t for t, _ in Correspondencia.TIPO_CHOICES]),
+    OpenApiParameter('data_inicio', OpenApiTypes.DATE, description='Data inicial de recebimento (inclusiva).'),
+    OpenApiParameter('data_fim', OpenApiTypes.DATE, description='Data final de recebimento (inclusiva).'),
+    OpenApiParameter('mais_de_dias', int, description='Somente correspondências há mais de N dias na caixa.'),
+]
 
 
-class ClienteViewSet(viewsets.ModelViewSet):
+class ClienteViewSet(SincronizacaoMixin, LeituraRapidaViewSet):
     queryset = Cliente.objects.all()
     serializer_class = ClienteSerializer
     permission_classes = [IsAuthenticated]
+    leitor = ClienteLeitor()
     
     def get_queryset(self):
         queryset = Cliente.objects.all()
@@ -32,26 +71,40 @@ class ClienteViewSet(viewsets.ModelViewSet):
         if tipo:
             queryset = queryset.filter(tipo=tipo)
         if search:
-            queryset = queryset.filter(
-                Q(nome__icontains=search) |
-                Q(documento__icontains=search) |
-                Q(email__icontains=search)
-            )
+            return buscar_clientes(queryset, search)
         
         return queryset.order_by('nome')
 
-    @action(detail=True, methods=['get'])
-    def correspondencias(self, request, pk=None):
-        cliente = self.get_object()
-        try:
-            caixa = cliente.caixa_postal
-            correspondencias = caixa.correspondencias.all()
-            serializer = CorrespondenciaSerializer(correspondencias, many=True)
-            return Response(serializer.data)
-        except CaixaPostal.DoesNotExist:
-            return Response({'detail': 'Cliente não possui caixa postal.'}, 
+    @extend_schema(
+        summary="Buscar cliente por CPF/CNPJ",
+        description="Busca exata pelo documento, com ou sem pontuação",
+        parameters=[OpenApiParameter('documento', str, required=True, description='CPF ou CNPJ')]
+    )
+    @action(detail=False, methods=['get'], url_path='por-documento')
+    def por_documento(self, request):
+        documento = somente_digitos(request.query_params.get('documento'))
+        if len(documento) not in (11, 14):
+            return Response({'detail': 'Informe um CPF (11 dígitos) ou CNPJ (14 dígitos).'},
+                          status=status.HTTP_400_BAD_REQUEST)
+
+        cliente = Cliente.objects.filter(documento_digitos=documento).first()
+        if cliente is None:
+            return Response({'detail': 'Cliente não encontrado.'},
                           status=status.HTTP_404_NOT_FOUND)
 
+        serializer = self.get_serializer(cliente)
+        return Response(serializer.data)
+
+    @extend_schema(
+        summary="Listar correspondências do cliente",
+        description=DESCRICAO_CORRESPONDENCIAS_DO_CLIENTE,
+        parameters=PARAMETROS_CORRESPONDENCIAS_DO_CLIENTE,
+        responses=CorrespondenciaSerializer(many=True)
+    )
+    @action(detail=True, methods=['get'], pagination_class=CorrespondenciaCursorPagination)
+    async def correspondencias(self, request, pk=None):
+        return await listar_correspondencias_do_cliente(self, pk)
+
     @action(detail=True, methods=['post'])
     def criar_caixa_postal(self, request, pk=None):
         cliente = self.get_object()
@@ -64,13 +117,16 @@ class ClienteViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class CaixaPostalViewSet(viewsets.ModelViewSet):
+class CaixaPostalViewSet(LeituraRapidaViewSet):
     queryset = CaixaPostal.objects.select_related('cliente').all()
     serializer_class = CaixaPostalSerializer
     permission_classes = [IsAuthenticated]
+    leitor = CaixaPostalLeitor()
     
     def get_queryset(self):
-        queryset = CaixaPostal.objects.select_related('cliente').all()
+        queryset = anotar_contadores(
+            CaixaPostal.objects.select_related('cliente')
+        )
         ativa = self.request.query_params.get('ativa')
         cliente_id = self.request.query_params.get('cliente_id')
         
@@ -82,35 +138,36 @@ class CaixaPostalViewSet(viewsets.ModelViewSet):
         return queryset.order_by('numero')
 
 
-class CorrespondenciaViewSet(viewsets.ModelViewSet):
+class CorrespondenciaViewSet(SincronizacaoMixin, LeituraRapidaViewSet):
     queryset = Correspondencia.objects.select_related('caixa_postal__cliente').all()
     serializer_class = CorrespondenciaSerializer
     permission_classes = [IsAuthenticated]
+    leitor = CorrespondenciaLeitor()
+    filter_backends = [PeriodoRecebimentoFilter, IdadeCorrespondenciaFilter]
     
     def get_queryset(self):
-        queryset = Correspondencia.objects.select_related('caixa_postal__cliente').all()
-        cliente_id = self.request.query_params.get('cliente_id')
-        caixa_id = self.request.query_params.get('caixa_id')
-        status_param = self.request.query_params.get('status')
-        tipo = self.request.query_params.get('tipo')
-        data_inicio = self.request.query_params.get('data_inicio')
-        data_fim = self.request.query_params.get('data_fim')
-        
-        if cliente_id:
-            queryset = queryset.filter(caixa_postal__cliente_id=cliente_id)
-        if caixa_id:
-            queryset = queryset.filter(caixa_postal_id=caixa_id)
-        if status_param:
-            queryset = queryset.filter(status=status_param)
-        if tipo:
-            queryset = queryset.filter(tipo=tipo)
-        if data_inicio:
-            queryset = queryset.filter(data_recebimento__date__gte=data_inicio)
-        if data_fim:
-            queryset = queryset.filter(data_recebimento__date__lte=data_fim)
-        
+        queryset = anotar_dias_na_caixa(
+            Correspondencia.objects.select_related('caixa_postal__cliente')
+        )
+        queryset = filtrar_correspondencias(queryset, self.request.query_params)
         return queryset.order_by('-data_recebimento')
 
+    def get_queryset_sincronizacao(self):
+        return anotar_dias_na_caixa(Correspondencia.objects.select_related('caixa_postal__cliente'))
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.request is not None:
+            params = self.request.query_params
+            if params.get('paginacao') == 'cursor' or 'cursor' in params:
+                if params.get(IdadeCorrespondenciaFilter.ordenar_param):
+                    raise ValidationError({
+                        IdadeCorrespondenciaFilter.ordenar_param:
+                            'A paginação por cursor é sempre ordenada pela data de recebimento.'
+                    })
+                self._paginator = CorrespondenciaCursorPagination()
+        return super().paginator
+
     def get_serializer_class(self):
         if self.action == 'create':
             return CorrespondenciaCreateSerializer
@@ -124,38 +181,137 @@ class CorrespondenciaViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             correspondencia.marcar_como_retirada(
                 retirado_por=serializer.validated_data.get('retirado_por'),
-                documento_retirada=serializer.validated_data.get('documento_retirada')
+                documento_retirada=serializer.validated_data.get('documento_retirada'),
+                observacoes=serializer.validated_data.get('observacoes')
             )
-            if serializer.validated_data.get('observacoes'):
-                correspondencia.observacoes = serializer.validated_data['observacoes']
-                correspondencia.save()
             
             response_serializer = CorrespondenciaSerializer(correspondencia)
             return Response(response_serializer.data)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @extend_schema(
+        summary="Criar correspondências em lote",
+        description="Recebe uma lista JSON ou um corpo NDJSON de correspondências, "
+                    f"com até {TAMANHO_MAXIMO_LOTE} itens, e retorna o resultado de cada linha.",
+        request=CorrespondenciaLoteSerializer(many=True),
+        responses={201: None, 207: None, 400: None}
+    )
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def lote(self, request):
+        itens = request.data
+        if not isinstance(itens, list):
+            return Response({'detail': 'Envie uma lista de correspondências.'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if len(itens) > TAMANHO_MAXIMO_LOTE:
+            return Response({'detail': f'O lote deve ter no máximo {TAMANHO_MAXIMO_LOTE} itens.'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        resultados, criadas = criar_em_lote(itens)
+        
+        if criadas == len(itens):
+            status_code = status.HTTP_201_CREATED
+        elif criadas:
+            status_code = status.HTTP_207_MULTI_STATUS
+        else:
+            status_code = status.HTTP_400_BAD_REQUEST
+        
+        return Response({
+            'criadas': criadas,
+            'erros': len(itens) - criadas,
+            'resultados': resultados,
+        }, status=status_code)
+
+    @extend_schema(
+        summary="Marcar correspondências como retiradas em lote",
+        description="Marca como retiradas, com um único UPDATE, as correspondências pendentes "
+                    "informadas em ids ou todas as pendentes de uma caixa postal.",
+        request=CorrespondenciaRetiradaLoteSerializer,
+        responses={200: None}
+    )
+    @action(detail=False, methods=['post'])
+    def marcar_retirada_lote(self, request):
+        serializer = CorrespondenciaRetiradaLoteSerializer(data=request.data)
+        
+        if serializer.is_valid():
+            ids = serializer.validated_data.get('ids')
+            if ids and len(ids) > TAMANHO_MAXIMO_LOTE:
+                return Response({'detail': f'O lote deve ter no máximo {TAMANHO_MAXIMO_LOTE} itens.'},
+                              status=status.HTTP_400_BAD_REQUEST)
+            
+            correspondencias = marcar_retiradas_em_lote(**serializer.validated_data)
+            response_serializer = CorrespondenciaSerializer(correspondencias, many=True)
+            return Response({
+                'retiradas': len(correspondencias),
+                'correspondencias': response_serializer.data,
+            })
+        
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
     @action(detail=False, methods=['get'])
-    def pendentes(self, request):
-        correspondencias = self.get_queryset().filter(status='RECEBIDA')
-        serializer = self.get_serializer(correspondencias, many=True)
-        return Response(serializer.data)
+    async def pendentes(self, request):
+        correspondencias = self.filter_queryset(self.get_queryset()).filter(status='RECEBIDA')
+        return await self.alistar_rapido(correspondencias, paginar=False)
 
+    @extend_schema(
+        summary="Envelhecimento das correspondências pendentes",
+        description="Conta as correspondências pendentes por faixa de dias na caixa. "
+                    "Sem agrupar, retorna o resumo geral (em cache quando não há filtros); "
+                    "com agrupar=caixa ou agrupar=cliente, retorna a contagem paginada por grupo, "
+                    "começando pelas pendências mais antigas.",
+        parameters=[
+            OpenApiParameter('agrupar', str, enum=list(AGRUPAMENTOS), description='Agrupamento por caixa ou cliente'),
+            OpenApiParameter('faixas', str, description='Limites das faixas em dias (padrão: 7,15,30,60)'),
+            OpenApiParameter('caixa_id', str, description='Somente uma caixa postal'),
+            OpenApiParameter('cliente_id', str, description='Somente um cliente'),
+            OpenApiParameter('mais_de_dias', int, description='Somente pendências há mais de N dias'),
+            OpenApiParameter('atualizar', bool, description='Ignora o resumo em cache'),
+        ],
+        responses={200: None, 400: None}
+    )
     @action(detail=False, methods=['get'])
-    def hoje(self, request):
-        hoje = timezone.now().date()
-        correspondencias = self.get_queryset().filter(data_recebimento__date=hoje)
-        serializer = self.get_serializer(correspondencias, many=True)
-        return Response(serializer.data)
+    def envelhecimento(self, request):
+        params = request.query_params
+        limites = ler_limites(params.get('faixas'))
+        agrupamento = params.get('agrupar')
+        if agrupamento and agrupamento not in AGRUPAMENTOS:
+            raise ValidationError({'agrupar': f"Use um destes valores: {', '.join(AGRUPAMENTOS)}."})
+
+        mais_de_dias = ler_dias(params.get('mais_de_dias'), 'mais_de_dias')
+        caixa_id = ler_id(params.get('caixa_id'), 'caixa_id')
+        cliente_id = ler_id(params.get('cliente_id'), 'cliente_id')
+        agora = timezone.now()
+        queryset = pendentes(caixa_id, cliente_id, mais_de_dias, agora)
 
+        if agrupamento:
+            paginator = PadraoPagination()
+            grupos = paginator.paginate_queryset(agrupar(queryset, agrupamento, limites, agora), request, view=self)
+            return paginator.get_paginated_response([representar_grupo(grupo, limites) for grupo in grupos])
 
-class ContratoViewSet(viewsets.ModelViewSet):
+        if caixa_id or cliente_id or mais_de_dias is not None:
+            resumo = calcular_resumo(queryset, limites, agora)
+        else:
+            resumo = obter_resumo(limites, atualizar=params.get('atualizar') in ('1', 'true'))
+        return Response(resumo)
+
+    @action(detail=False, methods=['get'])
+    async def hoje(self, request):
+        inicio, fim = intervalo_do_dia(timezone.localdate())
+        correspondencias = self.filter_queryset(self.get_queryset()).filter(
+            data_recebimento__gte=inicio,
+            data_recebimento__lt=fim
+        )
+        return await self.alistar_rapido(correspondencias, paginar=False)
+
+
+class ContratoViewSet(LeituraRapidaViewSet):
     queryset = Contrato.objects.select_related('cliente').all()
     serializer_class = ContratoSerializer
     permission_classes = [IsAuthenticated]
+    leitor = ContratoLeitor()
     
     def get_queryset(self):
-        queryset = Contrato.objects.select_related('cliente').all()
+        queryset = anotar_vencimento(Contrato.objects.select_related('cliente'))
         cliente_id = self.request.query_params.get('cliente_id')
         status_param = self.request.query_params.get('status')
         plano = self.request.query_params.get('plano')
@@ -170,17 +326,12 @@ class ContratoViewSet(viewsets.ModelViewSet):
         return queryset.order_by('-data_inicio')
 
     @action(detail=False, methods=['get'])
-    def vencidos(self, request):
-        contratos = self.get_queryset().filter(
-            data_inicio__lt=timezone.now().date(),
-            status='ATIVO'
-        )
-        vencidos = [c for c in contratos if c.esta_vencido]
-        serializer = self.get_serializer(vencidos, many=True)
-        return Response(serializer.data)
+    async def vencidos(self, request):
+        contratos = self.get_queryset().filter(status='ATIVO', vencido=True)
+        return await self.alistar_rapido(contratos)
 
 
-class DashboardView(GenericAPIView):
+class DashboardView(AsyncGenericAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = DashboardSerializer
     
@@ -188,75 +339,68 @@ class DashboardView(GenericAPIView):
         summary="Dashboard com estatísticas do sistema",
         description="Retorna estatísticas gerais do sistema incluindo totais de clientes, correspondências e contratos"
     )
-    def get(self, request):
-        hoje = timezone.now().date()
-        semana_passada = hoje - timedelta(days=7)
-        
-        total_clientes = Cliente.objects.count()
-        clientes_ativos = Cliente.objects.filter(ativo=True).count()
-        total_caixas_ativas = CaixaPostal.objects.filter(ativa=True).count()
-        correspondencias_pendentes = Correspondencia.objects.filter(status='RECEBIDA').count()
-        correspondencias_hoje = Correspondencia.objects.filter(
-            data_recebimento__date=hoje
-        ).count()
-        correspondencias_ultimos_7_dias = Correspondencia.objects.filter(
-            data_recebimento__date__gte=semana_passada
-        ).count()
-        contratos_ativos = Contrato.objects.filter(status='ATIVO').count()
-        correspondencias_por_tipo = dict(
-            Correspondencia.objects.values('tipo').annotate(
-                count=Count('tipo')
-            ).values_list('tipo', 'count')
-        )
-        
-        correspondencias_por_status = dict(
-            Correspondencia.objects.values('status').annotate(
-                count=Count('status')
-            ).values_list('status', 'count')
-        )
-        
-        data = {
-            'total_clientes': total_clientes,
-            'clientes_ativos': clientes_ativos,
-            'total_caixas_ativas': total_caixas_ativas,
-            'correspondencias_pendentes': correspondencias_pendentes,
-            'correspondencias_hoje': correspondencias_hoje,
-            'correspondencias_ultimos_7_dias': correspondencias_ultimos_7_dias,
-            'contratos_ativos': contratos_ativos,
-            'correspondencias_por_tipo': correspondencias_por_tipo,
-            'correspondencias_por_status': correspondencias_por_status,
-        }
+    async def get(self, request):
+        data = await aobter_estatisticas()
         
         serializer = DashboardSerializer(data)
         return Response(serializer.data)
 
 
-class CorrespondenciasPorClienteView(GenericAPIView):
+async def listar_correspondencias_do_cliente(view, cliente_id):
+    """
+    Lista as correspondências da caixa postal do cliente, com os filtros da listagem
+    principal e paginação por cursor.
+
+    Usada pela ação ``ClienteViewSet.correspondencias`` e por ``CorrespondenciasPorClienteView``.
+    O cliente é buscado sem os filtros de ``ClienteViewSet`` (``tipo`` aqui é o da correspondência).
+    """
+    request = view.request
+    if request.query_params.get(IdadeCorrespondenciaFilter.ordenar_param):
+        raise ValidationError({
+            IdadeCorrespondenciaFilter.ordenar_param: 'Esta listagem é sempre ordenada pela data de recebimento.'
+        })
+
+    try:
+        cliente_id = uuid.UUID(str(cliente_id))
+    except ValueError:
+        raise NotFound('Cliente não encontrado.')
+
+    caixa_id = await CaixaPostal.objects.filter(cliente_id=cliente_id).values_list('id', flat=True).afirst()
+    if caixa_id is None:
+        if not await Cliente.objects.filter(id=cliente_id).aexists():
+            raise NotFound('Cliente não encontrado.')
+        raise NotFound('Cliente não possui caixa postal.')
+
+    correspondencias = anotar_dias_na_caixa(
+        Correspondencia.objects.select_related('caixa_postal__cliente').filter(caixa_postal_id=caixa_id)
+    )
+    params = request.query_params.copy()
+    for ignorado in ('cliente_id', 'caixa_id'):
+        params.pop(ignorado, None)
+    correspondencias = filtrar_correspondencias(correspondencias, params)
+    # Aplicados aqui, e não por filter_backends, porque na ação do ClienteViewSet
+    # o get_object também passaria por eles
+    for backend in FILTROS_CORRESPONDENCIAS_DO_CLIENTE:
+        correspondencias = backend().filter_queryset(request, correspondencias, view)
+
+    leitor = CorrespondenciaLeitor()
+    page = await view.paginator.apaginate_queryset(leitor.valores(correspondencias), request, view=view)
+    return view.get_paginated_response(leitor.ler(page))
+
+
+class CorrespondenciasPorClienteView(AsyncGenericAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = CorrespondenciaSerializer
+    pagination_class = CorrespondenciaCursorPagination
     
     @extend_schema(
         summary="Listar correspondências de um cliente",
-        description="Retorna todas as correspondências de um cliente específico"
+        description=DESCRICAO_CORRESPONDENCIAS_DO_CLIENTE,
+        parameters=PARAMETROS_CORRESPONDENCIAS_DO_CLIENTE,
+        responses=CorrespondenciaSerializer(many=True)
     )
-    def get(self, request, cliente_id):
-        try:
-            cliente = Cliente.objects.get(id=cliente_id)
-            caixa = cliente.caixa_postal
-            correspondencias = caixa.correspondencias.all()
-            
-            status_param = request.query_params.get('status')
-            if status_param:
-                correspondencias = correspondencias.filter(status=status_param)
-            
-            serializer = CorrespondenciaSerializer(correspondencias, many=True)
-            return Response(serializer.data)
-        except Cliente.DoesNotExist:
-            return Response({'detail': 'Cliente não encontrado.'}, 
-                          status=status.HTTP_404_NOT_FOUND)
-        except CaixaPostal.DoesNotExist:
-            return Response({'detail': 'Cliente não possui caixa postal.'}, 
-                          status=status.HTTP_404_NOT_FOUND)
+    async def get(self, request, cliente_id):
+        return await listar_correspondencias_do_cliente(self, cliente_id)
 
 
 class MarcarCorrespondenciaRetiradaView(GenericAPIView):
@@ -271,13 +415,16 @@ class MarcarCorrespondenciaRetiradaView(GenericAPIView):
     )
     def post(self, request, correspondencia_id):
         try:
-            correspondencia = Correspondencia.objects.get(id=correspondencia_id)
+            correspondencia = Correspondencia.objects.select_related('caixa_postal__cliente').get(
+                id=correspondencia_id
+            )
             serializer = CorrespondenciaRetiradaSerializer(data=request.data)
             
             if serializer.is_valid():
                 correspondencia.marcar_como_retirada(
                     retirado_por=serializer.validated_data.get('retirado_por'),
-                    documento_retirada=serializer.validated_data.get('documento_retirada')
+                    documento_retirada=serializer.validated_data.get('documento_retirada'),
+                    observacoes=serializer.validated_data.get('observacoes')
                 )
                 
                 response_serializer = CorrespondenciaSerializer(correspondencia)
@@ -292,26 +439,26 @@ class MarcarCorrespondenciaRetiradaView(GenericAPIView):
 class RelatorioCorrespondenciasView(GenericAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = CorrespondenciaSerializer
+    filter_backends = [PeriodoRecebimentoFilter]
     
     @extend_schema(
         summary="Relatório de correspondências",
-        description="Gera relatório de correspondências com filtros por data"
+        description="Gera relatório de correspondências com filtros por data. "
+                    "Com formato=csv ou formato=ndjson o relatório é enviado em streaming.",
+        parameters=[
+            OpenApiParameter('formato', str, enum=['json', *FORMATOS], description='Formato de saída (padrão: json)')
+        ]
     )
     def get(self, request):
-        data_inicio = request.query_params.get('data_inicio')
-        data_fim = request.query_params.get('data_fim')
-        
-        correspondencias = Correspondencia.objects.select_related(
-            'caixa_postal__cliente'
-        ).all()
+        correspondencias = self.filter_queryset(
+            Correspondencia.objects.select_related('caixa_postal__cliente').all()
+        )
         
-        if data_inicio:
-            correspondencias = correspondencias.filter(
-                data_recebimento__date__gte=data_inicio
-            )
-        if data_fim:
-            correspondencias = correspondencias.filter(
-                data_recebimento__date__lte=data_fim
+        formato = request.query_params.get('formato')
+        if formato in FORMATOS:
+            return exportar(
+                correspondencias, CorrespondenciaSerializer, formato, 'relatorio_correspondencias',
+                assincrono=isinstance(request._request, ASGIRequest)
             )
         
         serializer = CorrespondenciaSerializer(correspondencias, many=True)
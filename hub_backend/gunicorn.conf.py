@@ -0,0 +1,36 @@
+"""
+Configuração do gunicorn para produção (``SERVIDOR=wsgi`` ou ``SERVIDOR=asgi``).
+
+    gunicorn -c gunicorn.conf.py hub_backend.wsgi:application
+    gunicorn -c gunicorn.conf.py hub_backend.asgi:application   (com SERVIDOR=asgi)
+"""
+import multiprocessing
+
+# Só o módulo é importado: um nome 'config' aqui seria lido pelo gunicorn como configuração
+import decouple
+
+SERVIDOR = decouple.config('SERVIDOR', default='wsgi')
+
+bind = decouple.config('GUNICORN_BIND', default='0.0.0.0:8000')
+
+# (2 x CPUs) + 1 processos, como recomenda a documentação do gunicorn
+workers = decouple.config('WEB_CONCURRENCY', default=multiprocessing.cpu_count() * 2 + 1, cast=int)
+
+if SERVIDOR == 'asgi':
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    # Threads atendem as requisições que esperam pelo banco sem ocupar um processo inteiro
+    worker_class = 'gthread'
+    threads = decouple.config('GUNICORN_THREADS', default=4, cast=int)
+
+timeout = decouple.config('GUNICORN_TIMEOUT', default=30, cast=int)
+graceful_timeout = 30
+keepalive = 5
+
+# Recicla os processos periodicamente para limitar o crescimento de memória
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=2000, cast=int)
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+loglevel = decouple.config('GUNICORN_LOG_LEVEL', default='info')
@@ -22,6 +22,8 @@ INSTALLED_APPS = [
     
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
+    'adrf',
     'corsheaders',
     'drf_spectacular',
     
@@ -30,7 +32,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricasMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'core.middleware.CompressaoMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,6 +64,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'hub_backend.wsgi.application'
 
+# Modo de execução escolhido no start.sh: dev (runserver), wsgi ou asgi (gunicorn)
+SERVIDOR = config('SERVIDOR', default='dev')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -71,6 +78,77 @@ DATABASES = {
     }
 }
 
+if config('DATABASE_URL', default=''):
+    DATABASES['default'] = dj_database_url.parse(config('DATABASE_URL'))
+
+# Conexões persistentes entre requisições, verificadas antes de serem reaproveitadas.
+# Sob ASGI cada requisição usa outra thread e a conexão não seria reaproveitada (use o pgbouncer).
+DATABASES['default']['CONN_MAX_AGE'] = config(
+    'DB_CONN_MAX_AGE', default=0 if SERVIDOR == 'asgi' else 60, cast=int
+)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Atrás do pgbouncer em modo transaction não há cursores nomeados nem prepared statements
+if config('DB_PGBOUNCER', default=False, cast=bool):
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='hub-cache'),
+    }
+}
+
+DASHBOARD_CACHE_TTL = config('DASHBOARD_CACHE_TTL', default=60, cast=int)
+ENVELHECIMENTO_CACHE_TTL = config('ENVELHECIMENTO_CACHE_TTL', default=300, cast=int)
+AUTENTICACAO_CACHE_TTL = config('AUTENTICACAO_CACHE_TTL', default=60, cast=int)
+
+# Dias em que as exclusões (core.Exclusao) ficam guardadas para a sincronização incremental;
+# marcas mais antigas exigem uma nova carga completa (ver o comando purgar_exclusoes)
+SINCRONIZACAO_RETENCAO_DIAS = config('SINCRONIZACAO_RETENCAO_DIAS', default=30, cast=int)
+
+# Métricas por endpoint (core.metricas) e orçamento de consultas SQL por requisição
+METRICAS_ATIVAS = config('METRICAS_ATIVAS', default=True, cast=bool)
+METRICAS_IPS_PERMITIDOS = config('METRICAS_IPS_PERMITIDOS', default='127.0.0.1,::1', cast=lambda v: [s.strip() for s in v.split(',')])
+ORCAMENTO_CONSULTAS_PADRAO = config('ORCAMENTO_CONSULTAS_PADRAO', default=10, cast=int)
+# Inclui a consulta do usuário da autenticação JWT (quando ele não está em cache); verificado em core.tests.OrcamentoConsultasTests
+ORCAMENTO_CONSULTAS = {
+    'ClienteViewSet.list': 4,
+    'ClienteViewSet.retrieve': 2,
+    'ClienteViewSet.correspondencias': 3,
+    'ClienteViewSet.alteracoes': 2,
+    'CaixaPostalViewSet.list': 4,
+    'CaixaPostalViewSet.retrieve': 2,
+    'CorrespondenciaViewSet.list': 4,
+    'CorrespondenciaViewSet.retrieve': 2,
+    'CorrespondenciaViewSet.pendentes': 2,
+    'CorrespondenciaViewSet.hoje': 2,
+    'CorrespondenciaViewSet.envelhecimento': 3,
+    'CorrespondenciaViewSet.alteracoes': 2,
+    'ContratoViewSet.list': 4,
+    'ContratoViewSet.retrieve': 2,
+    'ContratoViewSet.vencidos': 3,
+    'DashboardView': 5,
+    # Escritas (no PostgreSQL a numeração da caixa usa uma sequence e a criação de cliente faz 2 consultas a menos)
+    'ClienteViewSet.create': 10,
+    'ClienteViewSet.update': 5,
+    'ClienteViewSet.partial_update': 5,
+    'ClienteViewSet.destroy': 13,
+    'CorrespondenciaViewSet.create': 4,
+    # A troca de caixa recalcula os contadores das duas caixas
+    'CorrespondenciaViewSet.update': 11,
+    'CorrespondenciaViewSet.partial_update': 11,
+    'CorrespondenciaViewSet.destroy': 5,
+    'CorrespondenciaViewSet.marcar_retirada': 5,
+    'MarcarCorrespondenciaRetiradaView': 5,
+    'CorrespondenciaViewSet.lote': 6,
+    'CorrespondenciaViewSet.marcar_retirada_lote': 7,
+    'ContratoViewSet.create': 3,
+    'ContratoViewSet.update': 3,
+    'ContratoViewSet.partial_update': 3,
+    'ContratoViewSet.destroy': 3,
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -101,12 +179,12 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.JWTComCacheAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.PadraoPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
@@ -123,6 +201,8 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': True,
+    'TOKEN_REFRESH_SERIALIZER': 'authentication.serializers.TokenRefreshComBlacklistSerializer',
+    'TOKEN_VERIFY_SERIALIZER': 'authentication.serializers.TokenVerifyComBlacklistSerializer',
     
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
@@ -8,6 +8,7 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from core.metricas import metricas
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -24,6 +25,7 @@ urlpatterns = [
     ])),
     
     path('api/', include('core.urls')),
+    path('metrics/', metricas, name='metricas'),
     path('api/auth/', include('authentication.urls')),
 ]
 
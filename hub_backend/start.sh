@@ -0,0 +1,15 @@
+#!/bin/sh
+# Inicia o backend no modo escolhido por SERVIDOR: dev (runserver), wsgi ou asgi (gunicorn).
+set -e
+
+case "${SERVIDOR:-dev}" in
+  wsgi)
+    exec gunicorn -c gunicorn.conf.py hub_backend.wsgi:application
+    ;;
+  asgi)
+    exec gunicorn -c gunicorn.conf.py hub_backend.asgi:application
+    ;;
+  *)
+    exec python manage.py runserver 0.0.0.0:8000
+    ;;
+esac
@@ -70,6 +70,7 @@ export const clienteService = {
   create: (data) => api.post('/clientes/', data),
   update: (id, data) => api.put(`/clientes/${id}/`, data),
   delete: (id) => api.delete(`/clientes/${id}/`),
+  alteracoes: (desde, params = {}) => api.get('/clientes/alteracoes/', { params: { ...params, desde } }),
 };
 
 export const correspondenciaService = {
@@ -80,6 +81,7 @@ export const correspondenciaService = {
   delete: (id) => api.delete(`/correspondencias/${id}/`),
   marcarRetirada: (id, data) => api.post(`/correspondencias/${id}/marcar_retirada/`, data),
   pendentes: () => api.get('/correspondencias/pendentes/'),
+  alteracoes: (desde, params = {}) => api.get('/correspondencias/alteracoes/', { params: { ...params, desde } }),
 };
 
 export const caixaPostalService = {